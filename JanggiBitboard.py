@@ -0,0 +1,369 @@
+# bitboard representation of a Janggi position
+
+from JanggiBoard import (JanggiBoard, NUM_COLUMNS, NUM_ROWS, NUM_SQUARES, EMPTY, TYPE_MASK,
+    RED, BLUE, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER, PLAYER_COLORS)
+from JanggiTables import HORSE_MOVES, ELEPHANT_MOVES, PALACE_MOVES, SOLDIER_MOVES, SOLDIER_PALACE_MOVES, PALACE_LINES
+
+# A bitboard is a Python int used as a set of squares: bit (sq) is set
+# when square (sq) is in the set. Board squares are numbered as in
+# JanggiBoard (square = row * 9 + column), so each rank is 9 consecutive
+# bits. For extracting files, the occupancy is also kept "rotated",
+# in file-major order (bit column * 10 + row), so that each file is
+# 10 consecutive bits.
+FULL = (1 << NUM_SQUARES) - 1
+RANK_MASK = (1 << NUM_COLUMNS) - 1
+FILE_MASK = (1 << NUM_ROWS) - 1
+
+SQ_BITS = [1 << sq for sq in range(NUM_SQUARES)]
+ROTATED_BITS = [1 << ((sq % NUM_COLUMNS) * NUM_ROWS + sq // NUM_COLUMNS) for sq in range(NUM_SQUARES)]
+
+FILE_A = sum(SQ_BITS[row * NUM_COLUMNS] for row in range(NUM_ROWS))
+FILE_I = FILE_A << (NUM_COLUMNS - 1)
+
+def iter_squares(mask:int):
+    "Generator function that yields the squares in the bitboard (mask)."
+
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def squares_to_mask(squares) -> int:
+    "Returns the bitboard containing the given squares."
+
+    mask = 0
+    for sq in squares:
+        mask |= SQ_BITS[sq]
+
+    return mask
+
+def _line_targets(pos:int, occ:int, length:int) -> tuple:
+    """
+    For a piece at (pos) on a line of (length) points with occupancy
+    (occ), returns the Chariot targets on the line (up to and including
+    the first piece in each direction), and a tuple of (screen, beyond)
+    pairs for the Cannon, one per direction that has a screen: screen is
+    the bit of the first piece, and beyond the bits after the screen up
+    to and including the next piece.
+    """
+
+    chariot = 0
+    cannon = []
+
+    for direction in (1, -1):
+        i = pos + direction
+        while 0 <= i < length:
+            chariot |= 1 << i
+            if occ >> i & 1:
+                break
+            i += direction
+
+        # i is now the screen for the cannon (if it is on the line)
+        if not 0 <= i < length:
+            continue
+        screen = 1 << i
+        beyond = 0
+        i += direction
+        while 0 <= i < length:
+            beyond |= 1 << i
+            if occ >> i & 1:
+                break
+            i += direction
+        cannon.append((screen, beyond))
+
+    return chariot, tuple(cannon)
+
+def _spread_file(mask:int) -> int:
+    """
+    Converts a file-local mask (bit (row) for each row) into a
+    bitboard of the same points on the "a" file.
+    """
+
+    return squares_to_mask(row * NUM_COLUMNS for row in range(NUM_ROWS) if mask >> row & 1)
+
+def _line_tables(length:int, spread) -> tuple:
+    """
+    Builds the Chariot and Cannon lookup tables for a line of the given
+    length, indexed by [position on the line][line occupancy]. The
+    spread function converts line-local masks into bitboards.
+    """
+
+    chariot_table = []
+    cannon_table = []
+    for pos in range(length):
+        chariot_row = []
+        cannon_row = []
+        for occ in range(1 << length):
+            chariot, cannon = _line_targets(pos, occ, length)
+            chariot_row.append(spread(chariot))
+            cannon_row.append(tuple((spread(screen), spread(beyond)) for screen, beyond in cannon))
+        chariot_table.append(chariot_row)
+        cannon_table.append(cannon_row)
+
+    return chariot_table, cannon_table
+
+# rank tables are indexed by [column][rank occupancy] and give bits of
+# the first rank; file tables are indexed by [row][file occupancy] and
+# give bits of the "a" file. Both are shifted into place when used.
+RANK_CHARIOT, RANK_CANNON = _line_tables(NUM_COLUMNS, lambda mask: mask)
+FILE_CHARIOT, FILE_CANNON = _line_tables(NUM_ROWS, _spread_file)
+
+# step tables, converted from JanggiTables
+HORSE_BB = [
+    tuple((SQ_BITS[leg], squares_to_mask(dest for other_leg, dest in HORSE_MOVES[sq] if other_leg == leg))
+          for leg in dict.fromkeys(leg for leg, dest in HORSE_MOVES[sq]))
+    for sq in range(NUM_SQUARES)
+]
+ELEPHANT_BB = [
+    tuple((SQ_BITS[leg1] | SQ_BITS[leg2], SQ_BITS[dest]) for leg1, leg2, dest in ELEPHANT_MOVES[sq])
+    for sq in range(NUM_SQUARES)
+]
+PALACE_BB = [squares_to_mask(PALACE_MOVES[sq]) for sq in range(NUM_SQUARES)]
+SOLDIER_BB = {color: [squares_to_mask(SOLDIER_MOVES[color][sq]) for sq in range(NUM_SQUARES)] for color in (RED, BLUE)}
+SOLDIER_PALACE_BB = [squares_to_mask(SOLDIER_PALACE_MOVES[sq]) for sq in range(NUM_SQUARES)]
+SOLDIER_PALACE_SOURCES = squares_to_mask(sq for sq in range(NUM_SQUARES) if SOLDIER_PALACE_MOVES[sq])
+
+# palace diagonal lines as (first bit, second bit), second bit 0 if none
+PALACE_LINES_BB = [
+    tuple((SQ_BITS[line[0]], SQ_BITS[line[1]] if len(line) > 1 else 0) for line in PALACE_LINES[sq])
+    for sq in range(NUM_SQUARES)
+]
+
+class BitboardPosition:
+    """
+    A class to represent a Janggi position as a set of bitboards: one per
+    piece code (piece type and color), one per color, and the total
+    occupancy (in both normal and rotated order). A flat list of piece
+    codes is kept alongside, to find the piece on a given square.
+
+    A BitboardPosition has no Piece objects; it is meant for bulk
+    analysis, and can be converted from and to the piece codes of a
+    JanggiBoard with from_board, from_codes and to_codes. The moves it
+    generates are the same as those of the JanggiPieces classes.
+    """
+
+    def __init__(self):
+        "Initialize an empty position."
+
+        self._pieces = [0] * 16
+        self._colors = {RED: 0, BLUE: 0}
+        self._occupied = 0
+        self._rotated = 0
+        self._codes = [EMPTY] * NUM_SQUARES
+
+    def get_code(self, sq:int) -> int:
+        "Returns the piece code on the given square."
+
+        return self._codes[sq]
+
+    def get_codes(self) -> list:
+        "Returns a copy of the list of piece codes, indexed by square."
+
+        return list(self._codes)
+
+    def get_piece_mask(self, code:int) -> int:
+        "Returns the bitboard of the pieces with the given piece code."
+
+        return self._pieces[code]
+
+    def get_player_mask(self, player:str) -> int:
+        'Returns the bitboard of the pieces owned by (player) ("R" or "B").'
+
+        return self._colors[PLAYER_COLORS[player]]
+
+    def get_occupied(self) -> int:
+        "Returns the bitboard of all occupied squares."
+
+        return self._occupied
+
+    def set_piece(self, code:int, sq:int):
+        """
+        Puts a piece with the given code on the given square, replacing
+        any piece already there. A code of EMPTY clears the square.
+        """
+
+        self.clear_sq(sq)
+
+        if code == EMPTY:
+            return
+
+        bit = SQ_BITS[sq]
+        self._codes[sq] = code
+        self._pieces[code] |= bit
+        self._colors[code & BLUE] |= bit
+        self._occupied |= bit
+        self._rotated |= ROTATED_BITS[sq]
+
+    def clear_sq(self, sq:int):
+        "Removes the piece (if any) on the given square."
+
+        code = self._codes[sq]
+
+        if code == EMPTY:
+            return
+
+        bit = SQ_BITS[sq]
+        self._codes[sq] = EMPTY
+        self._pieces[code] ^= bit
+        self._colors[code & BLUE] ^= bit
+        self._occupied ^= bit
+        self._rotated ^= ROTATED_BITS[sq]
+
+    def get_cannons(self) -> int:
+        "Returns the bitboard of the cannons of both players."
+
+        return self._pieces[CANNON | RED] | self._pieces[CANNON | BLUE]
+
+    def chariot_attacks(self, sq:int) -> int:
+        """
+        Returns the bitboard of squares a Chariot on (sq) reaches,
+        including the first piece (of either color) in each direction.
+        """
+
+        row, col = divmod(sq, NUM_COLUMNS)
+        occ = self._occupied
+        rank_shift = row * NUM_COLUMNS
+
+        attacks = RANK_CHARIOT[col][(occ >> rank_shift) & RANK_MASK] << rank_shift
+        attacks |= FILE_CHARIOT[row][(self._rotated >> (col * NUM_ROWS)) & FILE_MASK] << col
+
+        for first, second in PALACE_LINES_BB[sq]:
+            attacks |= first
+            if not occ & first:
+                attacks |= second
+
+        return attacks
+
+    def cannon_attacks(self, sq:int) -> int:
+        """
+        Returns the bitboard of squares a Cannon on (sq) reaches: the
+        squares past a non-cannon screen, up to and including the next
+        piece if it is not a cannon.
+        """
+
+        row, col = divmod(sq, NUM_COLUMNS)
+        occ = self._occupied
+        cannons = self.get_cannons()
+        rank_shift = row * NUM_COLUMNS
+        attacks = 0
+
+        for screen, beyond in RANK_CANNON[col][(occ >> rank_shift) & RANK_MASK]:
+            if not (screen << rank_shift) & cannons:
+                attacks |= beyond << rank_shift
+        for screen, beyond in FILE_CANNON[row][(self._rotated >> (col * NUM_ROWS)) & FILE_MASK]:
+            if not (screen << col) & cannons:
+                attacks |= beyond << col
+        attacks &= ~cannons
+
+        # the palace diagonal jump only needs the center to be occupied
+        for first, second in PALACE_LINES_BB[sq]:
+            if second and occ & first:
+                attacks |= second
+
+        return attacks
+
+    def moves_from(self, sq:int) -> int:
+        """
+        Returns the bitboard of squares the piece on (sq) can move to
+        (ignoring whether the move would leave its general in check).
+        Returns 0 if the square is empty.
+        """
+
+        code = self._codes[sq]
+        piece_type = code & TYPE_MASK
+        occ = self._occupied
+
+        if piece_type == EMPTY:
+            return 0
+        elif piece_type == CHARIOT:
+            dests = self.chariot_attacks(sq)
+        elif piece_type == CANNON:
+            dests = self.cannon_attacks(sq)
+        elif piece_type == HORSE:
+            dests = 0
+            for leg, leg_dests in HORSE_BB[sq]:
+                if not occ & leg:
+                    dests |= leg_dests
+        elif piece_type == ELEPHANT:
+            dests = 0
+            for legs, dest in ELEPHANT_BB[sq]:
+                if not occ & legs:
+                    dests |= dest
+        elif piece_type == SOLDIER:
+            dests = SOLDIER_BB[code & BLUE][sq]
+        else:
+            dests = PALACE_BB[sq]
+
+        return dests & ~self._colors[code & BLUE]
+
+    def soldier_attacks(self, color:int) -> int:
+        """
+        Returns the bitboard of squares the soldiers of the given color
+        (RED or BLUE) can move to, computed for all soldiers at once.
+        """
+
+        soldiers = self._pieces[SOLDIER | color]
+
+        if color == RED:
+            attacks = soldiers << NUM_COLUMNS
+        else:
+            attacks = soldiers >> NUM_COLUMNS
+        attacks |= (soldiers & ~FILE_A) >> 1
+        attacks |= (soldiers & ~FILE_I) << 1
+
+        for sq in iter_squares(soldiers & SOLDIER_PALACE_SOURCES):
+            attacks |= SOLDIER_PALACE_BB[sq]
+
+        return attacks & FULL & ~self._colors[color]
+
+    def attacks(self, player:str) -> int:
+        """
+        Returns the bitboard of all squares that (player) ("R" or "B") can
+        move a piece to, i.e. the union of the moves of all of the
+        player's pieces.
+        """
+
+        color = PLAYER_COLORS[player]
+        attacks = self.soldier_attacks(color)
+
+        for sq in iter_squares(self._colors[color] & ~self._pieces[SOLDIER | color]):
+            attacks |= self.moves_from(sq)
+
+        return attacks
+
+    def moves(self, player:str) -> list:
+        """
+        Returns a list of (from square, to square) tuples for all of the
+        moves of (player)'s pieces (ignoring whether a move would leave
+        the player's general in check).
+        """
+
+        moves = []
+        for sq in iter_squares(self._colors[PLAYER_COLORS[player]]):
+            for dest in iter_squares(self.moves_from(sq)):
+                moves.append((sq, dest))
+
+        return moves
+
+def from_codes(codes:list) -> BitboardPosition:
+    "Returns a BitboardPosition built from a list of piece codes."
+
+    position = BitboardPosition()
+    for sq, code in enumerate(codes):
+        if code != EMPTY:
+            position.set_piece(code, sq)
+
+    return position
+
+def from_board(board:JanggiBoard) -> BitboardPosition:
+    "Returns a BitboardPosition for the pieces on the given JanggiBoard."
+
+    return from_codes(board.get_codes())
+
+def to_codes(position:BitboardPosition) -> list:
+    """
+    Returns the list of piece codes (indexed by square, as returned
+    by JanggiBoard.get_codes) for the given BitboardPosition.
+    """
+
+    return position.get_codes()
@@ -1,29 +1,90 @@
 # the Janggi Board
 
+# Board geometry. The 90 intersections are numbered 0-89 in row-major
+# order, starting from "a1" (square 0) and ending at "i10" (square 89),
+# so square = row * 9 + column. OFF_BOARD is the sentinel square used
+# for positions which are not on the board.
+NUM_COLUMNS = 9
+NUM_ROWS = 10
+NUM_SQUARES = NUM_COLUMNS * NUM_ROWS
+OFF_BOARD = -1
+
+COLUMN_NAMES = "abcdefghi"
+ROW_NAMES = [str(row) for row in range(1, NUM_ROWS + 1)]
+
+SQ_TO_LOC = [col + row for row in ROW_NAMES for col in COLUMN_NAMES]
+LOC_TO_SQ = {loc: sq for sq, loc in enumerate(SQ_TO_LOC)}
+SQ_TO_TUPLE = [(sq % NUM_COLUMNS, sq // NUM_COLUMNS) for sq in range(NUM_SQUARES)]
+
+PALACE_LOCS = [col + str(row) for row in [1,2,3,8,9,10] for col in ['d', 'e', 'f']]
+PALACE_SQUARES = frozenset(LOC_TO_SQ[loc] for loc in PALACE_LOCS)
+
+# Piece codes. Each square of the board array holds a small integer:
+# EMPTY, or a piece type combined with the color bit of its owner.
+# code & TYPE_MASK gives the piece type, code & BLUE gives the color.
+EMPTY = 0
+GENERAL = 1
+ADVISOR = 2
+ELEPHANT = 3
+HORSE = 4
+CHARIOT = 5
+CANNON = 6
+SOLDIER = 7
+TYPE_MASK = 7
+
+RED = 0
+BLUE = 8
+
+CHARACTER_TYPES = {"G": GENERAL, "A": ADVISOR, "E": ELEPHANT, "H": HORSE, "C": CHARIOT, "O": CANNON, "S": SOLDIER}
+TYPE_CHARACTERS = {code_type: character for character, code_type in CHARACTER_TYPES.items()}
+PLAYER_COLORS = {"R": RED, "B": BLUE}
+COLOR_PLAYERS = {RED: "R", BLUE: "B"}
+
+def piece_code(player:str, character:str) -> int:
+    """
+    Returns the piece code for a piece owned by (player) ("R" or "B")
+    with the given character (i.e. "H" for a Horse).
+    """
+
+    return PLAYER_COLORS[player] | CHARACTER_TYPES[character]
+
+def code_player(code:int):
+    """
+    Returns the player ("R" or "B") owning the piece with the given
+    code. Returns None for an empty square.
+    """
+
+    if code == EMPTY:
+        return None
+
+    return COLOR_PLAYERS[code & BLUE]
+
 class JanggiBoard:
     """
     A class to represent the Janggi game board. The board is 
     designed to store information about which pieces are where 
-    (via a dictionary). The board also contains methods which 
-    report information about which pieces are where on the board.
+    (via a flat list indexed by square number, holding the Piece
+    objects, and a parallel list holding their integer piece codes).
+    The board also contains methods which report information about
+    which pieces are where on the board, both by square number and
+    by location string ("b5").
     Each JanggiGame, Piece, and JanggiMechanic object has a 
     reference to a JanggiBoard object.
     """
 
     def __init__(self):
         """
-        Initialize the board as a blank dictionary. Also initialize 
+        Initialize the board as an empty list of squares. Also initialize
         dictionaries to convert from location notation (i.e. "b5") 
-        to tuple notation, and a list of locations in the palace.
+        to tuple notation.
         """
 
         self._columns = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7, 'i': 8}
         self._rev_columns = {val : key for key, val in self._columns.items()}
         self._rows = {'1': 0, '2': 1, '3': 2, '4': 3, '5': 4, '6': 5, '7': 6, '8': 7, '9': 8, '10': 9}
         self._rev_rows = {val : key for key, val in self._rows.items()}
-        self._board = {column + row: None for column in self._columns for row in self._rows}
-        self._palace = [col + str(row) for row in [1,2,3,8,9,10] for col in ['d', 'e', 'f']]
-        self._saved_board = None
+        self._board = [None] * NUM_SQUARES
+        self._codes = [EMPTY] * NUM_SQUARES
 
     def get_pieces(self):
         """
@@ -37,32 +98,38 @@ class JanggiBoard:
         Returns a list containing all pieces in both palaces.
         """
 
-        palace_spots = [self._board[i] for i in self._palace]
+        palace_spots = [self._board[sq] for sq in PALACE_SQUARES]
         palace_pieces = [piece for piece in palace_spots if piece is not None]
 
         return palace_pieces
 
-    def save_board(self):
+    def get_codes(self) -> list:
         """
-        Saves the current state of the board. 
-        Can be recovered with the recover_board method.
-        Only one state is saved.
+        Returns the list of piece codes, indexed by square.
+        The list is the board's own storage, so it always reflects
+        the current board, and must not be modified by the caller.
         """
-        
-        self._saved_board = dict(self._board)
 
-    def recover_board(self):
+        return self._codes
+
+    def sq_to_loc(self, sq:int):
         """
-        Recovers the previous state of the board, as 
-        stored in _saved_board. Updates the position of 
-        each piece accordingly.
+        Converts the square number 13, for example, to the location
+        string "e2". Returns None if the square is not on the board.
         """
 
-        self._board = dict(self._saved_board)
-        for loc in self._board:
-            piece = self._board[loc]
-            if piece is not None:
-                piece.set_pos(loc)
+        if sq is None or not 0 <= sq < NUM_SQUARES:
+            return None
+
+        return SQ_TO_LOC[sq]
+
+    def loc_to_sq(self, loc:str) -> int:
+        """
+        Converts the location string "e2", for example, to the square
+        number 13. Returns OFF_BOARD if the location is invalid.
+        """
+
+        return LOC_TO_SQ.get(loc, OFF_BOARD)
 
     def loc_on_board(self, loc:str) -> bool:
         """
@@ -70,19 +137,14 @@ class JanggiBoard:
         otherwise.
         """
 
-        if loc in self._board:
-            return True
-
-        return False
+        return loc in LOC_TO_SQ
 
     def tuple_on_board(self, tup:tuple) -> bool:
         """
         Returns True if the tuple is on the board. Returns False otherwise.
         """
 
-        loc = self.tuple_to_loc(tup)
-
-        return self.loc_on_board(loc)
+        return self.tuple_to_sq(tup) != OFF_BOARD
 
     def loc_to_tuple(self, loc:str):
         """
@@ -90,12 +152,24 @@ class JanggiBoard:
         (1,4) (column, row). Returns None if the location is invalid.
         """
 
-        if loc is None or len(loc) < 2:
-            return None
-        if loc[0] not in self._columns or loc[1:] not in self._rows:
+        if loc not in LOC_TO_SQ:
             return None
 
-        return (self._columns[loc[0]], self._rows[loc[1:]])
+        return SQ_TO_TUPLE[LOC_TO_SQ[loc]]
+
+    def tuple_to_sq(self, tup:tuple) -> int:
+        """
+        Converts the tuple (1,4), for example, to the square number 37.
+        Returns OFF_BOARD if the tuple is not on the board.
+        """
+
+        if tup is None or len(tup) < 2:
+            return OFF_BOARD
+
+        if tup[0] not in self._rev_columns or tup[1] not in self._rev_rows:
+            return OFF_BOARD
+
+        return tup[1] * NUM_COLUMNS + tup[0]
 
     def tuple_to_loc(self, tup:tuple):
         """
@@ -103,17 +177,46 @@ class JanggiBoard:
         string "b5". If the tuple is not on the board, returns None.
         """
 
-        if tup is None or len(tup) < 2:
-            return None
+        return self.sq_to_loc(self.tuple_to_sq(tup))
 
-        if tup[0] not in self._rev_columns:
-            return None
-        if tup[1] not in self._rev_rows:
-            return None
+    def get_piece_sq(self, sq:int):
+        """
+        Returns the piece on the given square. Returns None if
+        there is no piece on the square. Does not check that
+        the square is on the board.
+        """
+
+        return self._board[sq]
+
+    def get_code_sq(self, sq:int) -> int:
+        """
+        Returns the piece code on the given square (EMPTY if
+        there is no piece there). Does not check that the
+        square is on the board.
+        """
+
+        return self._codes[sq]
 
-        loc = self._rev_columns[tup[0]] + self._rev_rows[tup[1]]
+    def set_piece_sq(self, piece, sq:int):
+        """
+        Puts (piece) on the given square, or empties the square if
+        piece is None. Does not check legality of the move, and
+        does not clear the piece's old square.
+        """
+
+        self._board[sq] = piece
+        if piece is None:
+            self._codes[sq] = EMPTY
+        else:
+            self._codes[sq] = piece.get_code()
+
+    def clear_sq(self, sq:int):
+        """
+        Clears the given square (sets it to empty).
+        """
 
-        return loc
+        self._board[sq] = None
+        self._codes[sq] = EMPTY
 
     def get_piece(self, loc:str):
         """
@@ -122,10 +225,12 @@ class JanggiBoard:
         piece at that location, or if the location is invalid.
         """
 
-        if loc not in self._board:
+        sq = LOC_TO_SQ.get(loc)
+
+        if sq is None:
             return None
 
-        return self._board[loc]
+        return self._board[sq]
 
     def clear_loc(self, loc:str):
         """
@@ -142,10 +247,12 @@ class JanggiBoard:
         Does not clear the piece's old location.
         """
 
-        if loc not in self._board:
+        sq = LOC_TO_SQ.get(loc)
+
+        if sq is None:
             return None
 
-        self._board[loc] = piece
+        self.set_piece_sq(piece, sq)
 
     def get_player(self, loc:str):
         """
@@ -153,15 +260,12 @@ class JanggiBoard:
         Returns None if there is no piece there.
         """
 
-        if loc is None:
-            return None
-
-        piece = self.get_piece(loc)
+        sq = LOC_TO_SQ.get(loc)
 
-        if piece is None:
+        if sq is None:
             return None
 
-        return piece.get_player()
+        return code_player(self._codes[sq])
 
     def in_palace(self, loc:str) -> bool:
         """
@@ -169,9 +273,7 @@ class JanggiBoard:
         is in the palace. Returns False otherwise.
         """
 
-        if loc in self._palace:
-            return True
-        return False
+        return LOC_TO_SQ.get(loc) in PALACE_SQUARES
 
     def print_piece(self, location:str):
         """
@@ -182,9 +284,9 @@ class JanggiBoard:
 
         # print "." when there is no piece in a position.
         # also, print a border around the palace
-        space_type = {loc:" " for loc in self._board}
-        pre_space_type = {loc:" " for loc in self._board}
-        dot_type = {loc:"." for loc in self._board}
+        space_type = {loc:" " for loc in SQ_TO_LOC}
+        pre_space_type = {loc:" " for loc in SQ_TO_LOC}
+        dot_type = {loc:"." for loc in SQ_TO_LOC}
         palace_border_right_upper = ["d1", "e1", "d8", "e8"]
         palace_border_right_lower = ["d3", "e3", "d10", "e10"]
         palace_border_left_upper = ["e1", "f1", "e8", "f8"]
@@ -202,7 +304,7 @@ class JanggiBoard:
             dot_type[border_piece] = "!"
 
         # define the display components for the location
-        piece = self._board[location]
+        piece = self.get_piece(location)
         space = space_type[location]
         pre_space = pre_space_type[location]
         dot = dot_type[location]
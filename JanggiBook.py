@@ -0,0 +1,247 @@
+# opening book for the Janggi game
+
+import argparse
+import mmap
+import random
+import struct
+
+from JanggiGame import JanggiGame
+from JanggiBoard import SQ_TO_LOC, LOC_TO_SQ
+from JanggiRecord import read_records, parse_move, format_move
+
+# A book file is MAGIC followed by RECORD entries of (position key,
+# move, weight, count), sorted by position key and then move. The key is
+# JanggiGame.position_key, and the move is (from square << 8) | to square.
+MAGIC = b"JANGGIBK"
+RECORD = struct.Struct("<QHHI")
+
+MAX_WEIGHT = 0xFFFF
+MAX_COUNT = 0xFFFFFFFF
+
+# number of moves from the start of each game that go into the book
+DEFAULT_PLIES = 20
+
+def encode_move(move:tuple) -> int:
+    "Encodes a (move_from, move_to) location string tuple as a book move."
+
+    return (LOC_TO_SQ[move[0]] << 8) | LOC_TO_SQ[move[1]]
+
+def decode_move(move:int) -> tuple:
+    "Decodes a book move into a (move_from, move_to) location string tuple."
+
+    return (SQ_TO_LOC[move >> 8], SQ_TO_LOC[move & 0xFF])
+
+def collect_entries(games, plies:int=DEFAULT_PLIES) -> dict:
+    """
+    Replays each game (a list of (move_from, move_to) tuples) from the
+    starting position, and returns a dictionary of [weight, count] lists
+    keyed by (position key, book move), for the first (plies) moves of
+    each game. A game stops at its first illegal move.
+
+    Each time a move is played it adds 1 to its count, and to its weight
+    2 if the player who made it went on to win the game, 1 if the game
+    is unfinished, and 0 if the player lost.
+    """
+
+    entries = {}
+
+    for moves in games:
+        game = JanggiGame()
+        played = []
+        # play the whole game, to find out who won
+        for ply, move in enumerate(moves):
+            key = game.position_key()
+            player = game.get_player()
+            if not game.make_move(*move):
+                break
+            if ply < plies:
+                played.append((key, encode_move(move), player))
+        state = game.get_game_state()
+
+        for key, move, player in played:
+            if state == "UNFINISHED":
+                points = 1
+            elif state[0] == player:
+                points = 2
+            else:
+                points = 0
+            entry = entries.setdefault((key, move), [0, 0])
+            entry[0] += points
+            entry[1] += 1
+
+    return entries
+
+def write_book(path:str, entries:dict):
+    """
+    Writes the entries (as returned by collect_entries) to a book file,
+    sorted by position key and move.
+    """
+
+    with open(path, "wb") as book_file:
+        book_file.write(MAGIC)
+        for (key, move), (weight, count) in sorted(entries.items()):
+            book_file.write(RECORD.pack(key, move, min(weight, MAX_WEIGHT), min(count, MAX_COUNT)))
+
+def build_book(record_paths:list, path:str, plies:int=DEFAULT_PLIES, min_count:int=1) -> int:
+    """
+    Builds a book file at (path) from the text game record files (see
+    JanggiRecord). Moves played fewer than min_count times are left out.
+    Returns the number of entries written.
+    """
+
+    entries = {}
+    for record_path in record_paths:
+        for (key, move), (weight, count) in collect_entries(read_records(record_path), plies).items():
+            entry = entries.setdefault((key, move), [0, 0])
+            entry[0] += weight
+            entry[1] += count
+
+    entries = {item: entry for item, entry in entries.items() if entry[1] >= min_count}
+    write_book(path, entries)
+
+    return len(entries)
+
+class OpeningBook:
+    """
+    A class to represent an opening book file. The file is memory-mapped
+    rather than read, so opening a book is cheap whatever its size, and
+    the entries for a position are found by binary search on the key.
+    """
+
+    def __init__(self, path:str):
+        "Open the book file at (path)."
+
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(path + " is not a Janggi opening book")
+        self._size = (len(self._map) - len(MAGIC)) // RECORD.size
+
+    def __enter__(self):
+        "Use the book in a with block."
+
+        return self
+
+    def __exit__(self, *args):
+        "Close the book at the end of the with block."
+
+        self.close()
+
+    def __len__(self):
+        "Return the number of entries in the book."
+
+        return self._size
+
+    def close(self):
+        "Closes the book file."
+
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+    def get_entry(self, index:int) -> tuple:
+        "Returns the entry at (index) as a tuple of (key, move, weight, count)."
+
+        return RECORD.unpack_from(self._map, len(MAGIC) + index * RECORD.size)
+
+    def find(self, key:int) -> list:
+        """
+        Returns a list of (move, weight, count) tuples for the position
+        with the given key, where each move is a (move_from, move_to)
+        location string tuple. Returns an empty list if the position is
+        not in the book.
+        """
+
+        # find the first entry with the key
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        moves = []
+        for index in range(low, self._size):
+            entry_key, move, weight, count = self.get_entry(index)
+            if entry_key != key:
+                break
+            moves.append((decode_move(move), weight, count))
+
+        return moves
+
+    def probe(self, game:JanggiGame) -> list:
+        "Returns the book moves for the game's current position (see find)."
+
+        if game.get_game_state() != "UNFINISHED":
+            return []
+
+        return self.find(game.position_key())
+
+    def choose_move(self, game:JanggiGame, rng:random.Random=None, best:bool=False):
+        """
+        Returns a book move for the game's current position, chosen at
+        random in proportion to the weights (or the highest weighted move,
+        if best is True), or None if the position is not in the book.
+        """
+
+        moves = [(move, weight) for move, weight, count in self.probe(game) if weight > 0]
+        if not moves:
+            return None
+
+        if best:
+            return max(moves, key=lambda item: item[1])[0]
+
+        rng = rng or random
+        return rng.choices([move for move, weight in moves], [weight for move, weight in moves])[0]
+
+def main(argv=None):
+    "Builds or probes an opening book from the command line."
+
+    parser = argparse.ArgumentParser(description="Build or probe a Janggi opening book.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="build a book from text game records")
+    build.add_argument("records", nargs="+", help="text game record files")
+    build.add_argument("-o", "--output", required=True, help="book file to write")
+    build.add_argument("--plies", type=int, default=DEFAULT_PLIES, help="moves from each game to add")
+    build.add_argument("--min-count", type=int, default=1, help="leave out moves played fewer times")
+
+    probe = commands.add_parser("probe", help="list the book moves of a position")
+    probe.add_argument("book", help="book file")
+    probe.add_argument("--position", help="position string to start from (default: the starting position)")
+    probe.add_argument("--moves", nargs="*", default=[], metavar="FROM-TO",
+                       help="moves to play from the position first (i.e. b10-d7)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        try:
+            count = build_book(args.records, args.output, args.plies, args.min_count)
+        except ValueError as error:
+            parser.error(str(error))
+        print("entries: " + str(count))
+        return 0
+
+    try:
+        game = JanggiGame.from_position(args.position) if args.position else JanggiGame()
+    except ValueError as error:
+        parser.error(str(error))
+    for text in args.moves:
+        try:
+            move_from, move_to = parse_move(text)
+        except ValueError as error:
+            parser.error(str(error))
+        if not game.make_move(move_from, move_to):
+            parser.error("illegal move: " + text)
+
+    with OpeningBook(args.book) as book:
+        for move, weight, count in sorted(book.probe(game), key=lambda item: -item[1]):
+            print(format_move(move) + " weight " + str(weight) + " count " + str(count))
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,261 @@
+# binary game record corpus for the Janggi game
+
+import argparse
+import mmap
+import os
+import struct
+
+from JanggiBoard import SQ_TO_LOC, LOC_TO_SQ
+from JanggiRecord import read_records, write_records, format_record
+
+# A corpus file is HEADER (MAGIC, number of games, offset of the index),
+# then the games, then the index: one OFFSET per game, giving the file
+# offset of the game. Each game is its number of moves as a LENGTH,
+# followed by two bytes for each move: the from square and the to square
+# (square = row * 9 + column, see JanggiBoard). A pass is written as the
+# general's square followed by PASS.
+MAGIC = b"JANGGIGR"
+HEADER = struct.Struct("<8sQQ")
+LENGTH = struct.Struct("<H")
+OFFSET = struct.Struct("<Q")
+PASS = 0xFF
+
+MAX_MOVES = 0xFFFF
+
+def encode_game(moves:list) -> bytes:
+    """
+    Encodes a game, a list of (move_from, move_to) location string
+    tuples, as a length-prefixed corpus game.
+    """
+
+    if len(moves) > MAX_MOVES:
+        raise ValueError("a game can't have more than %d moves" % MAX_MOVES)
+
+    data = bytearray(LENGTH.pack(len(moves)))
+    for move_from, move_to in moves:
+        if move_from not in LOC_TO_SQ or move_to not in LOC_TO_SQ:
+            raise ValueError("not a move: " + str(move_from) + "-" + str(move_to))
+        from_sq = LOC_TO_SQ[move_from]
+        to_sq = LOC_TO_SQ[move_to]
+        data.append(from_sq)
+        data.append(PASS if to_sq == from_sq else to_sq)
+
+    return bytes(data)
+
+def decode_moves_sq(data, offset:int=0) -> list:
+    "Decodes the corpus game at (offset) in (data) into a list of (from square, to square) moves."
+
+    length = LENGTH.unpack_from(data, offset)[0]
+    start = offset + LENGTH.size
+    moves = data[start:start + 2 * length]
+
+    return [(from_sq, from_sq if to_sq == PASS else to_sq) for from_sq, to_sq in zip(moves[0::2], moves[1::2])]
+
+def decode_game(data, offset:int=0) -> list:
+    "Decodes the corpus game at (offset) in (data) into a list of (move_from, move_to) location string tuples."
+
+    return [(SQ_TO_LOC[from_sq], SQ_TO_LOC[to_sq]) for from_sq, to_sq in decode_moves_sq(data, offset)]
+
+class CorpusWriter:
+    """
+    A class to write a corpus file one game at a time. The games are
+    written as they are added, and only their offsets are kept, so the
+    corpus can be larger than memory. The index and header are written
+    by close; until then the header has no MAGIC, so an unfinished file
+    isn't taken for a corpus. If the with block raises an exception, the
+    file is removed instead (see abort).
+    """
+
+    def __init__(self, path:str):
+        "Create the corpus file at (path)."
+
+        self._path = path
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(bytes(len(MAGIC)), 0, 0))
+        self._offsets = []
+        self._position = HEADER.size
+
+    def __enter__(self):
+        "Use the writer in a with block."
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        "Close the writer at the end of the with block, or abort it if there was an exception."
+
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __len__(self):
+        "Return the number of games written so far."
+
+        return len(self._offsets)
+
+    def add_game(self, moves:list):
+        "Writes a game, a list of (move_from, move_to) location string tuples."
+
+        data = encode_game(moves)
+        self._offsets.append(self._position)
+        self._file.write(data)
+        self._position += len(data)
+
+    def close(self):
+        "Writes the index and header, and closes the file."
+
+        if self._file is None:
+            return
+
+        self._file.write(b"".join(OFFSET.pack(offset) for offset in self._offsets))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, len(self._offsets), self._position))
+        self._file.close()
+        self._file = None
+
+    def abort(self):
+        "Closes the file without finishing it, and removes it."
+
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+        os.remove(self._path)
+
+def write_corpus(path:str, games) -> int:
+    """
+    Writes an iterable of games (lists of (move_from, move_to) tuples) to
+    a corpus file, and returns the number of games written. If a game
+    can't be written (or read), no corpus file is left behind.
+    """
+
+    with CorpusWriter(path) as writer:
+        for moves in games:
+            writer.add_game(moves)
+
+    return len(writer)
+
+class Corpus:
+    """
+    A class to represent a corpus file. The file is memory-mapped rather
+    than read, so opening a corpus is cheap whatever its size, and any
+    game is found through the index without reading the games before it.
+    """
+
+    def __init__(self, path:str):
+        "Open the corpus file at (path)."
+
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._size, self._index = HEADER.unpack_from(self._map) if len(self._map) >= HEADER.size else (b"", 0, 0)
+        if magic != MAGIC or self._index + self._size * OFFSET.size != len(self._map):
+            self.close()
+            raise ValueError(path + " is not a Janggi game corpus")
+
+    def __enter__(self):
+        "Use the corpus in a with block."
+
+        return self
+
+    def __exit__(self, *args):
+        "Close the corpus at the end of the with block."
+
+        self.close()
+
+    def __len__(self):
+        "Return the number of games in the corpus."
+
+        return self._size
+
+    def __getitem__(self, number:int) -> list:
+        "Return game (number) (see get_game)."
+
+        return self.get_game(number)
+
+    def __iter__(self):
+        "Iterate over the games in order."
+
+        for number in range(self._size):
+            yield self.get_game(number)
+
+    def close(self):
+        "Closes the corpus file."
+
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+    def get_offset(self, number:int) -> int:
+        "Returns the file offset of game (number), counting from 0."
+
+        if not 0 <= number < self._size:
+            raise IndexError("no game " + str(number) + " in the corpus")
+
+        return OFFSET.unpack_from(self._map, self._index + number * OFFSET.size)[0]
+
+    def get_length(self, number:int) -> int:
+        "Returns the number of moves in game (number)."
+
+        return LENGTH.unpack_from(self._map, self.get_offset(number))[0]
+
+    def get_game(self, number:int) -> list:
+        "Returns game (number) as a list of (move_from, move_to) location string tuples."
+
+        return decode_game(self._map, self.get_offset(number))
+
+    def get_game_sq(self, number:int) -> list:
+        """
+        Returns game (number) as a list of (from square, to square) moves,
+        as played by JanggiGame.push_move.
+        """
+
+        return decode_moves_sq(self._map, self.get_offset(number))
+
+def main(argv=None):
+    "Converts between text game records and corpus files, or prints games, from the command line."
+
+    parser = argparse.ArgumentParser(description="Convert or read Janggi game corpus files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack = commands.add_parser("pack", help="write text game records to a corpus file")
+    pack.add_argument("records", nargs="+", help="text game record files")
+    pack.add_argument("-o", "--output", required=True, help="corpus file to write")
+
+    unpack = commands.add_parser("unpack", help="write a corpus file as a text game record")
+    unpack.add_argument("corpus", help="corpus file")
+    unpack.add_argument("-o", "--output", required=True, help="text game record file to write")
+
+    show = commands.add_parser("show", help="print games of a corpus file")
+    show.add_argument("corpus", help="corpus file")
+    show.add_argument("numbers", nargs="*", type=int, help="game numbers, counting from 0 (default: the number of games)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        games = (moves for path in args.records for moves in read_records(path))
+        try:
+            count = write_corpus(args.output, games)
+        except ValueError as error:
+            parser.error(str(error))
+        print("games: " + str(count))
+        return 0
+
+    with Corpus(args.corpus) as corpus:
+        if args.command == "unpack":
+            write_records(args.output, corpus)
+            return 0
+
+        if not args.numbers:
+            print("games: " + str(len(corpus)))
+        for number in args.numbers:
+            try:
+                print(format_record(corpus.get_game(number)))
+            except IndexError as error:
+                parser.error(str(error))
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
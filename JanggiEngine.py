@@ -0,0 +1,500 @@
+# search engine for the Janggi game
+
+import threading
+import time
+
+from JanggiGame import JanggiGame
+from JanggiBoard import TYPE_MASK, SQ_TO_LOC, LOC_TO_SQ
+from JanggiTables import PIECE_VALUES
+from JanggiTransposition import TranspositionTable, EXACT, LOWER, UPPER
+from JanggiOrdering import MoveOrderer
+
+# Scores are in hundredths of a point, from the point of view of the
+# player to move. A checkmate (n) moves from the root scores
+# MATE_SCORE - n for the winner, so that shorter mates score higher.
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+
+MAX_DEPTH = 64
+DEFAULT_DEPTH = 4
+
+# number of nodes searched between looks at the clock
+CHECK_INTERVAL = 1024
+
+# In the quiescence search, a capture is skipped if winning the captured
+# piece plus this margin still couldn't raise the score to alpha.
+DELTA_MARGIN = 200
+
+# default size of the transposition table, in megabytes
+DEFAULT_HASH_MB = 16
+
+class SearchAborted(Exception):
+    "Raised inside the search when the time or node budget runs out."
+
+class SearchControl:
+    """
+    A class to control a search running in another thread. The search
+    stops soon after stop is called, or after its deadline passes; the
+    deadline can be set or moved while the search is running (for
+    example, to give a search started without a time limit a limit).
+    """
+
+    def __init__(self):
+        "Initialize the control with no deadline."
+
+        self._stopped = threading.Event()
+        self._deadline = None
+
+    def stop(self):
+        "Asks the search to stop."
+
+        self._stopped.set()
+
+    def is_stopped(self) -> bool:
+        "Returns True if stop has been called."
+
+        return self._stopped.is_set()
+
+    def set_time(self, max_time):
+        """
+        Sets the deadline to (max_time) seconds from now,
+        or removes it if max_time is None.
+        """
+
+        self._deadline = None if max_time is None else time.monotonic() + max_time
+
+    def get_deadline(self):
+        "Returns the deadline (in time.monotonic seconds), or None."
+
+        return self._deadline
+
+    def should_stop(self) -> bool:
+        "Returns True if the search should stop now."
+
+        if self._stopped.is_set():
+            return True
+
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+class SearchResult:
+    """
+    A class to represent the result of a search: the best move, its
+    score, the principal variation (the line of best play that the
+    search expects), and statistics about the search. Moves are
+    (move_from, move_to) location string tuples, which can be passed
+    to JanggiGame.make_move.
+    """
+
+    def __init__(self, best_move, score:int, pv:list, depth:int, nodes:int, elapsed:float, iterations:list=None):
+        "Initialize the result."
+
+        self._best_move = best_move
+        self._score = score
+        self._pv = pv
+        self._depth = depth
+        self._nodes = nodes
+        self._elapsed = elapsed
+        self._iterations = iterations if iterations is not None else []
+
+    def __repr__(self):
+        "Return a short summary of the result."
+
+        pv = " ".join(move_from + "-" + move_to for move_from, move_to in self._pv)
+
+        return "depth %d score %d nodes %d time %.2fs pv %s" % (self._depth, self._score, self._nodes, self._elapsed, pv)
+
+    def get_best_move(self):
+        "Returns the best move found, or None if there are no legal moves."
+
+        return self._best_move
+
+    def get_score(self) -> int:
+        "Returns the score of the best move, for the player to move."
+
+        return self._score
+
+    def get_pv(self) -> list:
+        "Returns the principal variation, starting with the best move."
+
+        return self._pv
+
+    def get_depth(self) -> int:
+        "Returns the depth of the last completed iteration."
+
+        return self._depth
+
+    def get_nodes(self) -> int:
+        "Returns the number of nodes searched."
+
+        return self._nodes
+
+    def get_time(self) -> float:
+        "Returns the time taken by the search, in seconds."
+
+        return self._elapsed
+
+    def get_iterations(self) -> list:
+        """
+        Returns a list of (depth, score, pv) tuples, one for each 
+        completed iteration of the search, in order of depth.
+        """
+
+        return self._iterations
+
+def evaluate(game:JanggiGame) -> int:
+    """
+    Returns the static evaluation of the game's current position, from
+    the point of view of the player to move (see JanggiGame.evaluate).
+    """
+
+    return game.evaluate()
+
+def score_to_table(score:int, ply:int) -> int:
+    """
+    Converts a score at the given ply into a score to store in the
+    transposition table: mate scores are stored as distances from the
+    stored position instead of from the root.
+    """
+
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+
+    return score
+
+def score_from_table(score:int, ply:int) -> int:
+    "Converts a score from the transposition table into a score at the given ply."
+
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+
+    return score
+
+def move_to_locs(move:tuple) -> tuple:
+    "Converts a (from square, to square) move into location strings."
+
+    return (SQ_TO_LOC[move[0]], SQ_TO_LOC[move[1]])
+
+class JanggiEngine:
+    """
+    A class to search for the best move in a JanggiGame position, using
+    alpha-beta negamax with iterative deepening. The search makes and
+    takes back moves on the game itself (with push_move and pop_move),
+    so the game is left as it was when the search returns.
+
+    At the end of the main search, a quiescence search plays out the
+    captures (or all moves, when in check) until the position is quiet,
+    so that the evaluation isn't taken in the middle of an exchange.
+
+    The search can be limited by depth, wall-clock time, and number of
+    nodes. When the time or node budget runs out, the result of the
+    last completed iteration is returned.
+
+    Search results are cached in a TranspositionTable of hash_mb
+    megabytes, which is kept between searches. A table can also be
+    passed in to share it between engines. Moves are searched in the
+    order given by a MoveOrderer.
+    """
+
+    def __init__(self, hash_mb:float=DEFAULT_HASH_MB, table:TranspositionTable=None):
+        "Initialize the engine."
+
+        self._table = table if table is not None else TranspositionTable(hash_mb)
+        self._orderer = MoveOrderer(MAX_DEPTH)
+        self._nodes = 0
+        self._max_nodes = None
+        self._deadline = None
+        self._control = None
+        self._pushed = 0
+        self._pv = [[] for ply in range(MAX_DEPTH + 1)]
+
+    def get_table(self) -> TranspositionTable:
+        "Returns the engine's transposition table."
+
+        return self._table
+
+    def get_orderer(self) -> MoveOrderer:
+        "Returns the engine's move orderer."
+
+        return self._orderer
+
+    def clear(self):
+        """
+        Empties the transposition table and the move orderer, so that the
+        engine searches as a new one would.
+        """
+
+        self._table.clear()
+        self._orderer.clear()
+
+    def search(self, game:JanggiGame, max_time=None, max_depth=None, max_nodes=None, moves=None,
+               control:SearchControl=None) -> SearchResult:
+        """
+        Searches the game's current position and returns a SearchResult.
+        max_time is in seconds. If no limit is given, the search goes
+        to DEFAULT_DEPTH. If moves (a list of (move_from, move_to)
+        location string tuples) is given, only those root moves are
+        searched, and if none of them is legal the result has no best
+        move and a score of -INFINITY. A SearchControl can be given to
+        stop the search from another thread.
+        """
+
+        start = time.monotonic()
+
+        if max_depth is None:
+            if max_time is None and max_nodes is None:
+                max_depth = DEFAULT_DEPTH
+            else:
+                max_depth = MAX_DEPTH
+        max_depth = min(max_depth, MAX_DEPTH)
+
+        self._nodes = 0
+        self._max_nodes = max_nodes
+        self._deadline = None if max_time is None else start + max_time
+        self._control = control
+        self._pushed = 0
+        self._table.new_search()
+        self._orderer.new_search()
+
+        if game.get_game_state() != "UNFINISHED":
+            return SearchResult(None, 0, [], 0, 0, 0.0)
+
+        root_moves = game.legal_moves_sq()
+        if not root_moves:
+            return SearchResult(None, -MATE_SCORE, [], 0, 0, 0.0)
+
+        if moves is not None:
+            allowed = {(LOC_TO_SQ[move_from], LOC_TO_SQ[move_to]) for move_from, move_to in moves}
+            root_moves = [move for move in root_moves if move in allowed]
+            if not root_moves:
+                return SearchResult(None, -INFINITY, [], 0, 0, 0.0)
+
+        entry = self._table.probe(game.position_key())
+        table_move = entry[3] if entry is not None else None
+        root_moves = self._orderer.order_moves(game.get_board().get_codes(), root_moves, 0, table_move)
+
+        best_pv = [root_moves[0]]
+        best_score = 0
+        completed = 0
+        iterations = []
+
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self.search_root(game, root_moves, depth)
+            except SearchAborted:
+                # take back the moves of the unfinished iteration
+                while self._pushed:
+                    self.pop(game)
+                break
+
+            completed = depth
+            best_score = score
+            best_pv = self._pv[0]
+            iterations.append((depth, score, best_pv))
+
+            # search the best move first in the next iteration
+            root_moves.remove(best_pv[0])
+            root_moves.insert(0, best_pv[0])
+
+            # stop when a mate has been found within the full-width depth
+            # (a mate found by quiescence further out may not be the shortest);
+            # a single legal move is still searched, so that its score is right
+            if abs(score) >= MATE_THRESHOLD and MATE_SCORE - abs(score) <= depth:
+                break
+
+        elapsed = time.monotonic() - start
+        pv = [move_to_locs(move) for move in best_pv]
+        iterations = [(depth, score, [move_to_locs(move) for move in line]) for depth, score, line in iterations]
+
+        return SearchResult(pv[0], best_score, pv, completed, self._nodes, elapsed, iterations)
+
+    def count_node(self):
+        """
+        Counts a searched node, and raises SearchAborted if the
+        node budget or the time budget has run out, or the search's
+        SearchControl says to stop.
+        """
+
+        self._nodes += 1
+
+        if self._max_nodes is not None and self._nodes >= self._max_nodes:
+            raise SearchAborted()
+
+        if self._nodes % CHECK_INTERVAL == 0:
+            if self._deadline is not None and time.monotonic() >= self._deadline:
+                raise SearchAborted()
+            if self._control is not None and self._control.should_stop():
+                raise SearchAborted()
+
+    def push(self, game:JanggiGame, move:tuple):
+        "Makes a move in the search."
+
+        game.push_move(move)
+        self._pushed += 1
+
+    def pop(self, game:JanggiGame):
+        "Takes back a move in the search."
+
+        game.pop_move()
+        self._pushed -= 1
+
+    def search_root(self, game:JanggiGame, moves:list, depth:int) -> int:
+        """
+        Searches each of the root moves to the given depth, and
+        returns the best score. The principal variation is left
+        in self._pv[0].
+        """
+
+        alpha = -INFINITY
+        best_score = -INFINITY
+
+        for move in moves:
+            self.push(game, move)
+            score = -self.negamax(game, depth - 1, -INFINITY, -alpha, 1)
+            self.pop(game)
+
+            if score > best_score:
+                best_score = score
+                self._pv[0] = [move] + self._pv[1]
+            if score > alpha:
+                alpha = score
+
+        return best_score
+
+    def negamax(self, game:JanggiGame, depth:int, alpha:int, beta:int, ply:int) -> int:
+        """
+        Returns the score of the game's current position searched to the
+        given depth, within the (alpha, beta) window. The principal
+        variation from this position is left in self._pv[ply].
+        """
+
+        if depth <= 0:
+            return self.quiesce(game, alpha, beta, ply)
+
+        self.count_node()
+        self._pv[ply] = []
+
+        if ply >= MAX_DEPTH:
+            return evaluate(game)
+
+        # use the stored result if it was searched deep enough,
+        # and otherwise search its best move first
+        key = game.position_key()
+        entry = self._table.probe(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, bound, score, table_move = entry
+            if entry_depth >= depth:
+                score = score_from_table(score, ply)
+                if (bound == EXACT
+                        or (bound == LOWER and score >= beta)
+                        or (bound == UPPER and score <= alpha)):
+                    if table_move is not None:
+                        self._pv[ply] = [table_move]
+                    return score
+
+        moves = game.legal_moves_sq()
+
+        # no legal moves (not even a pass) means checkmate
+        if not moves:
+            return -MATE_SCORE + ply
+
+        codes = game.get_board().get_codes()
+        moves = self._orderer.order_moves(codes, moves, ply, table_move)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+
+        for move_number, move in enumerate(moves):
+            self.push(game, move)
+            score = -self.negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            self.pop(game)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    self._pv[ply] = [move] + self._pv[ply + 1]
+                    if alpha >= beta:
+                        self._orderer.record_cutoff(codes, move, ply, depth, move_number)
+                        break
+
+        if best_score >= beta:
+            bound = LOWER
+        elif best_score > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER
+            best_move = None
+        self._table.store(key, depth, bound, score_to_table(best_score, ply), best_move)
+
+        return best_score
+
+    def quiesce(self, game:JanggiGame, alpha:int, beta:int, ply:int) -> int:
+        """
+        Returns the score of the game's current position, searching only 
+        captures, within the (alpha, beta) window. The player to move can 
+        stand pat (take the static evaluation) instead of capturing, 
+        unless in check, in which case all moves are searched.
+        """
+
+        self.count_node()
+        self._pv[ply] = []
+
+        if ply >= MAX_DEPTH:
+            return evaluate(game)
+
+        codes = game.get_board().get_codes()
+
+        if game.is_in_check(game.get_player()):
+            moves = game.legal_moves_sq()
+            if not moves:
+                return -MATE_SCORE + ply
+            stand_pat = None
+            best_score = -INFINITY
+        else:
+            stand_pat = evaluate(game)
+            if stand_pat >= beta:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+            moves = game.legal_captures_sq()
+            best_score = stand_pat
+
+        for move in self._orderer.order_moves(codes, moves, ply):
+            # delta pruning: skip captures that can't raise the score to alpha
+            if stand_pat is not None and stand_pat + PIECE_VALUES[codes[move[1]] & TYPE_MASK] + DELTA_MARGIN <= alpha:
+                continue
+
+            self.push(game, move)
+            score = -self.quiesce(game, -beta, -alpha, ply + 1)
+            self.pop(game)
+
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    self._pv[ply] = [move] + self._pv[ply + 1]
+                    if alpha >= beta:
+                        break
+
+        return best_score
+
+def search(game:JanggiGame, max_time=None, max_depth=None, max_nodes=None, hash_mb:float=DEFAULT_HASH_MB) -> SearchResult:
+    """
+    Searches the game's current position with a new JanggiEngine, and
+    returns a SearchResult. See JanggiEngine.search.
+    """
+
+    return JanggiEngine(hash_mb).search(game, max_time=max_time, max_depth=max_depth, max_nodes=max_nodes)
+
+if __name__ == "__main__":
+    g = JanggiGame()
+    g.get_board().print_board()
+    print(search(g, max_time=5))
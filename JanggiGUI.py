@@ -65,11 +65,9 @@ def select_move(selection):
     if move_from:
         move_from = False
         from_loc = selection
-        piece = g.get_board().get_piece(from_loc)
-        if piece is not None:
-            for move in piece.get_moves():
-                buttons[move].configure(bg="light green")
-                buttons[move].configure(activebackground="light green")
+        for move in g.legal_moves_from(from_loc):
+            buttons[move].configure(bg="light green")
+            buttons[move].configure(activebackground="light green")
     else:
         move_from = True
         g.make_move(from_loc, selection)
@@ -2,8 +2,100 @@
 # Date: 2/19/2021
 # Description: A Python implementation of Janggi.
 from JanggiPieces import Elephant, Advisor, Chariot, Cannon, Horse, General, Soldier
-from JanggiBoard import JanggiBoard
+from JanggiBoard import (JanggiBoard, EMPTY, TYPE_MASK, BLUE, RED, PLAYER_COLORS, SQ_TO_LOC,
+    NUM_SQUARES, NUM_ROWS, NUM_COLUMNS, PALACE_SQUARES, TYPE_CHARACTERS, CHARACTER_TYPES, code_player,
+    GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER)
 from JanggiMechanic import JanggiMechanic
+from JanggiTables import (RAYS, PALACE_LINES, HORSE_ATTACKERS, ELEPHANT_ATTACKERS,
+    SOLDIER_ATTACKERS, PALACE_ATTACKERS, ATTACK_PATHS, CHECK_SQUARES)
+
+# the piece class for each character
+PIECE_CLASSES = {"G": General, "A": Advisor, "E": Elephant, "H": Horse, "C": Chariot, "O": Cannon, "S": Soldier}
+
+# After its general, each player's pieces are listed by number, and then 
+# in this order, followed by the soldiers.
+PIECE_ORDER = "EACOH"
+
+# A position string is three fields separated by spaces:
+#   - the pieces, rank by rank from rank 10 down to rank 1 (separated by 
+#     "/"), each rank from column a to column i. A piece is its character 
+#     (G, A, E, H, C for chariot, O for cannon, S), upper case for Blue 
+#     and lower case for Red, and a digit is that many empty squares.
+#   - the player to move, "B" or "R".
+#   - the game state: "-" if the game is unfinished, otherwise the 
+#     winner, "B" or "R". It can be left out if the game is unfinished.
+START_POSITION = "CEHA1AEHC/4G4/1O5O1/S1S1S1S1S/9/9/s1s1s1s1s/1o5o1/4g4/ceha1aehc B -"
+POSITION_STATES = {"-": "UNFINISHED", "R": "RED_WON", "B": "BLUE_WON"}
+STATE_POSITIONS = {game_state: text for text, game_state in POSITION_STATES.items()}
+
+def parse_position(position:str) -> tuple:
+    """
+    Converts a position string into a tuple of (piece codes of the 
+    board's squares as a list, in square order, player to move, game 
+    state). Raises ValueError if the string is not a position, or 
+    doesn't have one general for each player in its palace.
+    """
+
+    fields = position.split()
+    if len(fields) not in (2, 3):
+        raise ValueError("a position needs pieces, a player to move and a game state: " + position)
+    if fields[1] not in PLAYER_COLORS or len(fields) == 3 and fields[2] not in POSITION_STATES:
+        raise ValueError("bad player or game state in position: " + position)
+
+    ranks = fields[0].split("/")
+    if len(ranks) != NUM_ROWS:
+        raise ValueError("a position needs %d ranks: %s" % (NUM_ROWS, position))
+
+    codes = [EMPTY] * NUM_SQUARES
+    for index, rank in enumerate(ranks):
+        row = NUM_ROWS - 1 - index
+        col = 0
+        for character in rank:
+            if character.isdigit():
+                col += int(character)
+                continue
+            if character.upper() not in CHARACTER_TYPES or col >= NUM_COLUMNS:
+                raise ValueError("bad rank %s in position: %s" % (rank, position))
+            color = BLUE if character.isupper() else RED
+            codes[row * NUM_COLUMNS + col] = color | CHARACTER_TYPES[character.upper()]
+            col += 1
+        if col != NUM_COLUMNS:
+            raise ValueError("bad rank %s in position: %s" % (rank, position))
+
+    # each general must be in its own palace (Red's is in rows 1 to 3)
+    for color in (RED, BLUE):
+        squares = [sq for sq in range(NUM_SQUARES) if codes[sq] == color | GENERAL]
+        if len(squares) != 1 or squares[0] not in PALACE_SQUARES or (squares[0] < NUM_SQUARES // 2) != (color == RED):
+            raise ValueError("a position needs one general for each player, in its palace: " + position)
+
+    return codes, fields[1], POSITION_STATES[fields[2] if len(fields) == 3 else "-"]
+
+def format_position(codes, player:str, game_state:str) -> str:
+    """
+    Converts the piece codes of the board's squares (in square order), 
+    the player to move and the game state into a position string.
+    """
+
+    ranks = []
+    for row in range(NUM_ROWS - 1, -1, -1):
+        rank = ""
+        empty = 0
+        for code in codes[row * NUM_COLUMNS:(row + 1) * NUM_COLUMNS]:
+            if code == EMPTY:
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            character = TYPE_CHARACTERS[code & TYPE_MASK]
+            rank += character if code & BLUE else character.lower()
+        if empty:
+            rank += str(empty)
+        ranks.append(rank)
+
+    return "/".join(ranks) + " " + player + " " + STATE_POSITIONS[game_state]
+
+START_CODES = parse_position(START_POSITION)[0]
 
 class JanggiGame:
     "A class to represent the Janggi game."
@@ -22,16 +114,214 @@ class JanggiGame:
         self._in_check = {"R": "", "B": ""}
 
         # place pieces on the board
+        self._place_pieces(START_CODES)
+
+        # remember the starting squares, so that reset can reuse the pieces
+        self._start_squares = [(piece, piece.get_sq()) for player in ["R", "B"] for piece in self._pieces[player]]
+
+    def export_state(self) -> tuple:
+        """
+        Returns a compact, picklable description of the game: a tuple 
+        of the piece codes of the board's squares (as bytes, in square 
+        order), the current player, the game state, and the in-check 
+        status of Red and Blue. JanggiGame.from_state rebuilds the game 
+        from it. Moves made with push_move are not recorded, so the 
+        rebuilt game can't pop them.
+        """
+
+        return (bytes(self._board.get_codes()), self._player, self._state,
+                self._in_check["R"], self._in_check["B"])
+
+    @classmethod
+    def from_state(cls, state:tuple, layout:tuple=None):
+        """
+        Returns a new game rebuilt from a description returned by 
+        export_state. The pieces are numbered in square order, unless 
+        a piece layout (see _piece_layout) is given.
+        """
+
+        codes, player, game_state, red_check, blue_check = state
+
+        game = cls.__new__(cls)
+        game._board = JanggiBoard()
+        game._player = "B"
+        game._mechanic = JanggiMechanic(game._board)
+        game._state = game_state
+        game._pieces = {"R": [], "B": []}
+        game._in_check = {"R": red_check, "B": blue_check}
+        game._start_squares = None
+        if layout is None:
+            game._place_pieces(codes)
+        else:
+            game._place_layout(layout)
+
+        if player != game._player:
+            game.update_turn()
+
+        return game
+
+    def clone(self):
+        """
+        Returns an independent copy of the game. The copy gets a new 
+        board with a copy of each piece (so piece names and the order 
+        of the legal moves are kept), and the mechanic's hash and 
+        evaluation are copied rather than recomputed. Moves made with 
+        push_move are not copied, so the copy can't pop them.
+        """
+
+        game = self.__class__.__new__(self.__class__)
+        board = JanggiBoard()
+        game._board = board
+        game._player = self._player
+        game._mechanic = self._mechanic.copy(board)
+        game._state = self._state
+        game._pieces = {"R": [], "B": []}
+        game._in_check = dict(self._in_check)
+        game._start_squares = None
+
+        for player in ["R", "B"]:
+            for piece in self._pieces[player]:
+                # skip pieces captured by moves made with push_move
+                if self._board.get_piece_sq(piece.get_sq()) is not piece:
+                    continue
+                copy = piece.copy(board)
+                board.set_piece_sq(copy, copy.get_sq())
+                game._pieces[player].append(copy)
+
+        return game
+
+    def __copy__(self):
+        "Return a copy of the game (see clone)."
+
+        return self.clone()
+
+    def __deepcopy__(self, memo):
+        "Return a copy of the game (see clone)."
+
+        return self.clone()
+
+    def __reduce__(self):
+        """
+        Pickle the game as its compact state (see export_state) and its 
+        piece layout, so the unpickled game has the same piece names and 
+        order of legal moves.
+        """
+
+        return (self.__class__.from_state, (self.export_state(), self._piece_layout()))
+
+    def _piece_layout(self) -> tuple:
+        """
+        Returns the pieces on the board as a tuple of Red's and Blue's 
+        pieces, each a tuple of (square, name) pairs in the order of the 
+        player's piece list.
+        """
+
+        return tuple(tuple((piece.get_sq(), piece.get_name()) for piece in self._pieces[player]
+                           if self._board.get_piece_sq(piece.get_sq()) is piece)
+                     for player in ["R", "B"])
+
+    @classmethod
+    def from_position(cls, position:str):
+        """
+        Returns a new game set up from a position string (see 
+        START_POSITION). Raises ValueError if the string is not a 
+        position. The pieces are numbered in square order.
+        """
+
+        codes, player, game_state = parse_position(position)
+        game = cls.from_state((codes, player, game_state, "", ""))
+
         for player in ["R", "B"]:
-            general = General(player, self._board)
-            self._pieces[player].append(general)
-            for number in [1, 2]:
-                for piece_type in [Elephant, Advisor, Chariot, Cannon, Horse]:
-                    piece = piece_type(player, number, self._board)
-                    self._pieces[player].append(piece)
-            for number in [1,2,3,4,5]:
-                soldier = Soldier(player, number, self._board)
-                self._pieces[player].append(soldier)
+            game._in_check[player] = "Yes" if game.is_in_check(player) else "No"
+
+        return game
+
+    def to_position(self) -> str:
+        "Returns the position string of the game (see START_POSITION)."
+
+        return format_position(self._board.get_codes(), self._player, self._state)
+
+    def _place_pieces(self, codes):
+        """
+        Creates a piece for each square of (codes), a sequence of the 
+        board's piece codes in square order, and places it on the board. 
+        Pieces of each kind are numbered in square order, and each player's 
+        pieces are listed as in the starting position (see PIECE_ORDER).
+        """
+
+        pieces = {"R": [], "B": []}
+        counts = {}
+        for sq in range(NUM_SQUARES):
+            code = codes[sq]
+            if code == EMPTY:
+                continue
+            player = code_player(code)
+            character = TYPE_CHARACTERS[code & TYPE_MASK]
+            number = counts.get((player, character), 0) + 1
+            counts[(player, character)] = number
+            if character == "G":
+                order = (0, 0, 0)
+            elif character == "S":
+                order = (2, number, 0)
+            else:
+                order = (1, number, PIECE_ORDER.index(character))
+            pieces[player].append((order, self._make_piece(player, character, number, sq)))
+
+        for player in ["R", "B"]:
+            for order, piece in sorted(pieces[player], key=lambda item: item[0]):
+                self._pieces[player].append(piece)
+                self._mechanic.place_piece(piece)
+
+    def _place_layout(self, layout:tuple):
+        """
+        Creates the pieces of a piece layout (see _piece_layout), in its 
+        order, and places them on the board.
+        """
+
+        for player, pieces in zip(["R", "B"], layout):
+            for sq, name in pieces:
+                piece = self._make_piece(player, name[1], int(name[2:] or 1), sq)
+                self._pieces[player].append(piece)
+                self._mechanic.place_piece(piece)
+
+    def _make_piece(self, player:str, character:str, number:int, sq:int):
+        "Returns a new piece of the board, numbered (number), set on (sq) but not placed."
+
+        if character == "G":
+            piece = General(player, self._board)
+        elif character == "S":
+            piece = Soldier(player, number, self._board)
+        else:
+            piece = PIECE_CLASSES[character](player, number, self._board)
+        piece.set_sq(sq)
+
+        return piece
+
+    def reset(self):
+        """
+        Puts the game back to the starting position, with Blue to move, 
+        reusing the game's board and pieces instead of creating new ones. 
+        Moves made with push_move can't be popped afterwards.
+        """
+
+        # a game rebuilt with from_state has no starting pieces to reuse
+        if self._start_squares is None:
+            self.__init__()
+            return
+
+        board = self._board
+        for sq in range(NUM_SQUARES):
+            board.clear_sq(sq)
+        for piece, sq in self._start_squares:
+            piece.set_sq(sq)
+            board.set_piece_sq(piece, sq)
+
+        self._pieces = {player: [piece for piece, sq in self._start_squares if piece.get_player() == player]
+                        for player in ["R", "B"]}
+        self._player = "B"
+        self._state = "UNFINISHED"
+        self._in_check = {"R": "", "B": ""}
+        self._mechanic.reset()
 
     def get_player(self) -> str:
         "Returns the current player."
@@ -62,7 +352,6 @@ class JanggiGame:
         #     if type(piece) == General and piece.get_player() == player:
         #         return piece
 
-    # the exclude excludes the piece that was optionally captured
     def is_in_check(self, player:str, exclude=None) -> bool:
         """
         Returns True if the player is in check. 
@@ -70,23 +359,90 @@ class JanggiGame:
         first letter of the given string (player) to identify the player 
         (i.e. "B", "b", and "Blue" are all interpreted as the blue player.)
 
-        The optional exclude parameter is for a piece that was captured when 
-        trying out a move. If this parameter is passed, the given piece will 
-        be ignored. The try_move method does not remove the captured 
-        piece, in case the move will put the player's general in check.
+        The optional exclude parameter is accepted for compatibility only. 
+        Check is found by looking outward from the general's square, so 
+        a piece captured by a trial move (which is no longer on the board) 
+        is never counted.
         """
 
         player = player[0].upper()
 
-        general_loc = self.get_general(player).get_loc()
+        general_sq = self.get_general(player).get_sq()
 
-        opponent = self.get_opponent(player)
+        return self.is_attacked_sq(general_sq, self.get_opponent(player))
 
-        opponent_pieces = [piece for piece in self._pieces[opponent] if piece is not exclude]
+    def is_attacked_sq(self, sq:int, attacker:str) -> bool:
+        """
+        Returns True if one of the (attacker)'s pieces could move to the 
+        given square (ignoring whether the move would leave the attacker 
+        in check). Returns False otherwise.
+
+        Instead of generating the attacker's moves, is_attacked_sq 
+        looks outward from the square along the lines, palace diagonals, 
+        and Horse, Elephant, Soldier and palace patterns that could reach 
+        it, and checks whether the right kind of piece is there.
+        """
 
-        # for piece in self._pieces[opponent]:
-        for piece in opponent_pieces:
-            if general_loc in piece.get_moves():
+        codes = self._board.get_codes()
+        color = PLAYER_COLORS[attacker]
+        chariot = CHARIOT | color
+        cannon = CANNON | color
+        target = codes[sq]
+
+        # a piece can't capture a piece of its own color,
+        # and cannons can't capture cannons along the lines
+        if target != EMPTY and target & BLUE == color:
+            return False
+        cannon_target = target & TYPE_MASK == CANNON
+
+        # chariots (first piece along a line) and cannons
+        # (second piece along a line, if the first piece is not a cannon)
+        for ray in RAYS[sq]:
+            screen = False
+            for step in ray:
+                code = codes[step]
+                if code == EMPTY:
+                    continue
+                if screen:
+                    if code == cannon and not cannon_target:
+                        return True
+                    break
+                if code == chariot:
+                    return True
+                if code & TYPE_MASK == CANNON:
+                    break
+                screen = True
+
+        # palace diagonals
+        for line in PALACE_LINES[sq]:
+            first = codes[line[0]]
+            if first == chariot:
+                return True
+            if len(line) > 1:
+                if first == EMPTY and codes[line[1]] == chariot:
+                    return True
+                if first != EMPTY and codes[line[1]] == cannon:
+                    return True
+
+        horse = HORSE | color
+        for from_sq, leg in HORSE_ATTACKERS[sq]:
+            if codes[from_sq] == horse and codes[leg] == EMPTY:
+                return True
+
+        elephant = ELEPHANT | color
+        for from_sq, leg1, leg2 in ELEPHANT_ATTACKERS[sq]:
+            if codes[from_sq] == elephant and codes[leg1] == EMPTY and codes[leg2] == EMPTY:
+                return True
+
+        soldier = SOLDIER | color
+        for from_sq in SOLDIER_ATTACKERS[color][sq]:
+            if codes[from_sq] == soldier:
+                return True
+
+        general = GENERAL | color
+        advisor = ADVISOR | color
+        for from_sq in PALACE_ATTACKERS[sq]:
+            if codes[from_sq] == general or codes[from_sq] == advisor:
                 return True
 
         return False
@@ -109,6 +465,30 @@ class JanggiGame:
         """
 
         self._player = self.get_opponent(self._player)
+        self._mechanic.toggle_player()
+
+    def position_key(self) -> int:
+        """
+        Returns a 64-bit Zobrist hash of the current position (the 
+        pieces on the board and the player to move). The hash is kept 
+        up to date as moves are made, so this is a cheap lookup, and 
+        the same position always has the same key.
+        """
+
+        return self._mechanic.get_hash()
+
+    def evaluate(self) -> int:
+        """
+        Returns the static evaluation of the current position (piece 
+        values plus piece-square bonuses, in hundredths of a point) 
+        from the point of view of the player to move. The evaluation 
+        is kept up to date as moves are made, so this is a cheap lookup.
+        """
+
+        if self._player == 'R':
+            return self._mechanic.get_eval()
+
+        return -self._mechanic.get_eval()
 
     def get_board(self) -> JanggiBoard:
         """
@@ -119,16 +499,17 @@ class JanggiGame:
 
     def try_move(self, piece, move_to):
         """
-        Saves the board, then makes the given move (if valid).
+        Makes the given move (if valid) with the mechanic.
         If the move puts the current player in check, try_move 
-        restores the board and returns False.
+        takes the move back and returns False. Otherwise the move 
+        is committed, and can't be taken back with pop_move.
         """
 
-        self._board.save_board()
-        captured_piece = self._mechanic.move_piece(piece, move_to)
-        if self.is_in_check(self._player, exclude=captured_piece):
-            self._board.recover_board()
+        self._mechanic.make_move(piece, self._board.loc_to_sq(move_to))
+        if self.is_in_check(self._player):
+            self._mechanic.unmake_move()
             return False
+        self._mechanic.commit_move()
         return True
 
     def check_if_player_won(self, player:str) -> bool:
@@ -142,18 +523,174 @@ class JanggiGame:
         if not self.is_in_check(opponent):
             return False
 
-        for piece in self._pieces[opponent]:
-            for move in piece.get_moves():
-                # old_loc = piece.get_loc() # debug
-                self._board.save_board()
-                self._mechanic.move_piece(piece, move)
-                if not self.is_in_check(opponent):
-                    # print("check win: found move " + old_loc + " to " + move) # debug
-                    self._board.recover_board()
-                    return False
-                self._board.recover_board()
+        return next(iter(self.generate_legal_moves(opponent)), None) is None
 
-        return True
+    def generate_legal_moves(self, player:str, captures:bool=False):
+        """
+        Generator function that yields each fully legal move of the 
+        given player as a (from square, to square) tuple. A pass is 
+        yielded last, as the general's square twice, if the player 
+        is not in check. If captures is True, only the captures are 
+        yielded (using each piece's get_captures_sq, so quiet moves 
+        are never generated), and no pass.
+
+        Rather than trying every move, only the moves that could 
+        possibly leave the general in check are tried out: all moves 
+        when the player is already in check, moves of the general, and 
+        moves starting or ending on one of the general's ATTACK_PATHS 
+        (which is how a pinned piece, or a piece becoming a cannon's 
+        screen, would expose the general).
+        """
+
+        board = self._board
+        opponent = self.get_opponent(player)
+        general = self.get_general(player)
+        general_sq = general.get_sq()
+        in_check = self.is_attacked_sq(general_sq, opponent)
+        paths = ATTACK_PATHS[general_sq]
+
+        for piece in self._pieces[player]:
+            from_sq = piece.get_sq()
+
+            # skip pieces captured by moves that are still on the undo stack
+            if board.get_piece_sq(from_sq) is not piece:
+                continue
+
+            try_all = in_check or piece is general or from_sq in paths
+            for to_sq in self._legal_targets_sq(piece, player, try_all, paths, captures):
+                yield (from_sq, to_sq)
+
+        if not in_check and not captures:
+            yield (general_sq, general_sq)
+
+    def _legal_targets_sq(self, piece, player:str, try_all:bool, paths, captures:bool=False):
+        """
+        Generator function that yields each square the (player)'s piece 
+        can legally move to (or capture on, if captures is True). If 
+        try_all is False, only the moves ending on one of the general's 
+        attack (paths) are tried out for leaving the general in check 
+        (see generate_legal_moves).
+        """
+
+        targets = piece.get_captures_sq() if captures else piece.get_moves_sq()
+        for to_sq in targets:
+            if try_all or to_sq in paths:
+                self._mechanic.make_move(piece, to_sq)
+                exposed = self.is_in_check(player)
+                self._mechanic.unmake_move()
+                if exposed:
+                    continue
+            yield to_sq
+
+    def legal_moves_sq(self, player=None) -> list:
+        """
+        Returns a list of all of the legal moves of the given player 
+        (by default the current player) as (from square, to square) 
+        tuples, including a pass (the general's square twice) when 
+        passing is allowed. Does not look at the game state.
+        """
+
+        if player is None:
+            player = self._player
+
+        return list(self.generate_legal_moves(player))
+
+    def legal_captures_sq(self, player=None) -> list:
+        """
+        Returns a list of all of the legal captures of the given player 
+        (by default the current player) as (from square, to square) 
+        tuples. Does not look at the game state.
+        """
+
+        if player is None:
+            player = self._player
+
+        return list(self.generate_legal_moves(player, captures=True))
+
+    def legal_checks_sq(self, player=None) -> list:
+        """
+        Returns a list of all of the legal moves of the given player 
+        (by default the current player) which put the opponent in check, 
+        as (from square, to square) tuples. Only the moves starting or 
+        ending on one of the CHECK_SQUARES of the opponent's general 
+        are tried out. Does not look at the game state.
+        """
+
+        if player is None:
+            player = self._player
+
+        board = self._board
+        general_sq = self.get_general(self.get_opponent(player)).get_sq()
+        squares = CHECK_SQUARES[general_sq]
+        checks = []
+
+        for from_sq, to_sq in self.generate_legal_moves(player):
+            if from_sq != to_sq and (from_sq in squares or to_sq in squares):
+                self._mechanic.make_move(board.get_piece_sq(from_sq), to_sq)
+                check = self.is_attacked_sq(general_sq, player)
+                self._mechanic.unmake_move()
+                if check:
+                    checks.append((from_sq, to_sq))
+
+        return checks
+
+    def legal_moves(self, player=None) -> list:
+        """
+        Returns a list of all of the legal moves of the given player 
+        (by default the current player) as (move_from, move_to) location 
+        string tuples, which can be passed to make_move. A pass is 
+        included (the general's location twice) when passing is allowed. 
+        Returns an empty list if the game is finished.
+        """
+
+        if self._state != 'UNFINISHED':
+            return []
+
+        return [(SQ_TO_LOC[from_sq], SQ_TO_LOC[to_sq]) for from_sq, to_sq in self.legal_moves_sq(player)]
+
+    def legal_moves_from(self, loc:str) -> list:
+        """
+        Returns a list of the locations the current player's piece at 
+        (loc) can legally move to (not including a pass). Returns an 
+        empty list if there is no such piece, or if the game is finished.
+        """
+
+        piece = self._board.get_piece(loc)
+
+        if self._state != 'UNFINISHED' or piece is None or piece.get_player() != self._player:
+            return []
+
+        # only this piece's moves are generated (see generate_legal_moves)
+        general = self.get_general(self._player)
+        general_sq = general.get_sq()
+        paths = ATTACK_PATHS[general_sq]
+        try_all = (piece is general or piece.get_sq() in paths
+                   or self.is_attacked_sq(general_sq, self.get_opponent(self._player)))
+
+        return [SQ_TO_LOC[to_sq] for to_sq in self._legal_targets_sq(piece, self._player, try_all, paths)]
+
+    def push_move(self, move:tuple):
+        """
+        Makes the given (from square, to square) move for the current 
+        player and changes the turn, without checking that the move is 
+        legal, and without updating the game state or check status. 
+        Meant for looking ahead from a position (i.e. with moves from 
+        legal_moves_sq); each push_move must be undone with pop_move.
+        """
+
+        from_sq, to_sq = move
+        piece = self._board.get_piece_sq(from_sq)
+        self._mechanic.make_move(piece, to_sq, self._player)
+        self._player = self.get_opponent(self._player)
+        self._mechanic.toggle_player()
+
+    def pop_move(self):
+        """
+        Takes back the most recent move made with push_move, 
+        and gives the turn back to the player who made it.
+        """
+
+        self._player = self._mechanic.unmake_move()
 
     def declare_winner(self, player:str):
         """
@@ -0,0 +1,281 @@
+# checkmate solver for the Janggi game
+
+import sys
+import time
+
+from JanggiGame import JanggiGame
+from JanggiBoard import SQ_TO_LOC
+
+# proof and disproof numbers of a solved node
+INFINITY = 10 ** 9
+
+DEFAULT_MAX_NODES = 1000000
+
+class MateNode:
+    """
+    A class to represent a node of the proof-number search tree. OR nodes
+    have the attacker to move, and are proven if any of their children is;
+    AND nodes have the defender to move, and are proven if all of their
+    children are. The proof number (pn) is the least number of leaves
+    that need to be proven to prove the node, and the disproof number
+    (dn) the least number that need to be disproven to disprove it.
+    """
+
+    __slots__ = ("move", "parent", "is_or", "remaining", "pn", "dn", "moves", "children")
+
+    def __init__(self, move, parent, is_or:bool, remaining:int):
+        "Initialize an unevaluated node."
+
+        self.move = move
+        self.parent = parent
+        self.is_or = is_or
+        self.remaining = remaining
+        self.pn = 1
+        self.dn = 1
+        self.moves = None
+        self.children = None
+
+class MateResult:
+    """
+    A class to represent the result of a mate search: whether the player
+    to move can force checkmate with a sequence of checks, and if so the
+    forcing line (the attacker's moves and the defender's best replies
+    found, ending in checkmate), as (move_from, move_to) location string
+    tuples.
+    """
+
+    def __init__(self, status:str, line:list, moves:int, nodes:int, elapsed:float):
+        "Initialize the result."
+
+        self._status = status
+        self._line = line
+        self._moves = moves
+        self._nodes = nodes
+        self._elapsed = elapsed
+
+    def __repr__(self):
+        "Return a short summary of the result."
+
+        line = " ".join(move_from + "-" + move_to for move_from, move_to in self._line)
+
+        return "%s in %d nodes %d time %.3fs line %s" % (self._status, self._moves, self._nodes, self._elapsed, line)
+
+    def get_status(self) -> str:
+        """
+        Returns 'MATE' if the player to move can force checkmate,
+        'NO_CHECKING_MATE' if they can't force it within the number of
+        moves searched by giving check on every move (a mate with quiet
+        moves may still exist), or 'UNKNOWN' if the node budget ran out
+        first.
+        """
+
+        return self._status
+
+    def is_mate(self) -> bool:
+        "Returns True if the player to move can force checkmate (see get_status)."
+
+        return self._status == "MATE"
+
+    def get_line(self) -> list:
+        "Returns the forcing line, or an empty list if there is no mate."
+
+        return self._line
+
+    def get_moves(self) -> int:
+        "Returns the number of the attacker's moves in the mate (or searched)."
+
+        return self._moves
+
+    def get_nodes(self) -> int:
+        "Returns the number of nodes created."
+
+        return self._nodes
+
+    def get_time(self) -> float:
+        "Returns the time taken by the search, in seconds."
+
+        return self._elapsed
+
+class MateSolver:
+    """
+    A class to decide whether the player to move in a JanggiGame position
+    can force checkmate within a number of moves, using proof-number
+    search. The attacker only tries moves which give check (see
+    JanggiGame.legal_checks_sq), which keeps the tree narrow, and the
+    defender tries every legal move. A position is checkmate when the
+    player to move has no legal moves at all (a player in check can't pass).
+    So only mates where every attacking move is a check are found, and
+    a position without one may still have a mate with quiet moves.
+
+    Mates in 1, 2, ... moves are searched for in turn, so the mate found
+    is the shortest checking mate. The search makes and takes back moves on the
+    game itself, so the game is left as it was.
+    """
+
+    def __init__(self, max_nodes:int=DEFAULT_MAX_NODES):
+        "Initialize the solver with a budget of tree nodes for each search."
+
+        self._max_nodes = max_nodes
+        self._nodes = 0
+
+    def solve(self, game:JanggiGame, moves:int) -> MateResult:
+        """
+        Searches for a checkmate by the player to move within (moves) of
+        their moves, all of them checks, and returns a MateResult.
+        """
+
+        start = time.monotonic()
+        self._nodes = 0
+        status = "NO_CHECKING_MATE"
+
+        if game.get_game_state() == "UNFINISHED":
+            for limit in range(1, moves + 1):
+                root = MateNode(None, None, True, limit)
+                self.evaluate(game, root)
+                status = self.prove(game, root)
+                if status != "NO_CHECKING_MATE":
+                    break
+
+        elapsed = time.monotonic() - start
+        if status != "MATE":
+            return MateResult(status, [], moves, self._nodes, elapsed)
+
+        line = [(SQ_TO_LOC[from_sq], SQ_TO_LOC[to_sq]) for from_sq, to_sq in self.proof_line(root)]
+
+        return MateResult(status, line, limit, self._nodes, elapsed)
+
+    def prove(self, game:JanggiGame, root:MateNode) -> str:
+        """
+        Runs proof-number search from the root until it is proven or
+        disproven, or the node budget runs out. Returns 'MATE',
+        'NO_CHECKING_MATE' or 'UNKNOWN'.
+        """
+
+        while root.pn != 0 and root.dn != 0:
+            if self._nodes >= self._max_nodes:
+                return "UNKNOWN"
+
+            # go down to the most-proving node
+            node = root
+            while node.children is not None:
+                if node.is_or:
+                    node = min(node.children, key=lambda child: child.pn)
+                else:
+                    node = min(node.children, key=lambda child: child.dn)
+                game.push_move(node.move)
+
+            self.expand(game, node)
+
+            # update the proof and disproof numbers back up to the root
+            while node is not None:
+                self.update(node)
+                if node.parent is not None:
+                    game.pop_move()
+                node = node.parent
+
+        return "MATE" if root.pn == 0 else "NO_CHECKING_MATE"
+
+    def evaluate(self, game:JanggiGame, node:MateNode):
+        """
+        Generates the moves of a new node, and sets its proof and
+        disproof numbers: solved if it is a checkmate or out of moves,
+        and otherwise from the number of moves.
+        """
+
+        self._nodes += 1
+
+        if node.is_or:
+            node.moves = game.legal_checks_sq() if node.remaining > 0 else []
+            if not node.moves:
+                node.pn, node.dn = INFINITY, 0
+            else:
+                node.pn, node.dn = 1, len(node.moves)
+            return
+
+        node.moves = game.legal_moves_sq()
+        if not node.moves:
+            node.pn, node.dn = 0, INFINITY
+        elif node.remaining == 0:
+            node.pn, node.dn = INFINITY, 0
+        else:
+            node.pn, node.dn = len(node.moves), 1
+
+    def expand(self, game:JanggiGame, node:MateNode):
+        "Creates and evaluates the children of a node."
+
+        remaining = node.remaining - 1 if node.is_or else node.remaining
+        node.children = []
+
+        for move in node.moves:
+            child = MateNode(move, node, not node.is_or, remaining)
+            game.push_move(move)
+            self.evaluate(game, child)
+            game.pop_move()
+            node.children.append(child)
+
+            # stop as soon as the node is solved
+            if node.is_or and child.pn == 0 or not node.is_or and child.dn == 0:
+                break
+
+        node.moves = None
+
+    def update(self, node:MateNode):
+        "Recomputes the proof and disproof numbers of a node from its children."
+
+        if node.children is None:
+            return
+
+        if node.is_or:
+            node.pn = min(child.pn for child in node.children)
+            node.dn = min(INFINITY, sum(child.dn for child in node.children))
+        else:
+            node.pn = min(INFINITY, sum(child.pn for child in node.children))
+            node.dn = min(child.dn for child in node.children)
+
+    def mate_length(self, node:MateNode) -> int:
+        """
+        Returns the number of half-moves to checkmate in the proof
+        tree below a proven node, with the defender delaying it as
+        long as possible.
+        """
+
+        if node.children is None:
+            return 0
+        if node.is_or:
+            return 1 + min(self.mate_length(child) for child in node.children if child.pn == 0)
+
+        return 1 + max(self.mate_length(child) for child in node.children)
+
+    def proof_line(self, node:MateNode) -> list:
+        """
+        Returns the forcing line from a proven node as (from square, to
+        square) moves: the attacker's quickest mate, against the
+        defender's longest resistance.
+        """
+
+        line = []
+        while node.children is not None:
+            proven = [child for child in node.children if child.pn == 0]
+            if node.is_or:
+                node = min(proven, key=self.mate_length)
+            else:
+                node = max(proven, key=self.mate_length)
+            line.append(node.move)
+
+        return line
+
+def find_mate(game:JanggiGame, moves:int, max_nodes:int=DEFAULT_MAX_NODES) -> MateResult:
+    """
+    Searches for a checkmate by the player to move within (moves) of
+    their moves, all of them checks, with a new MateSolver, and returns
+    a MateResult.
+    """
+
+    return MateSolver(max_nodes).solve(game, moves)
+
+if __name__ == "__main__":
+    g = JanggiGame()
+    for text in sys.argv[2:]:
+        g.make_move(*text.split("-"))
+    g.get_board().print_board()
+    print(find_mate(g, int(sys.argv[1]) if len(sys.argv) > 1 else 3))
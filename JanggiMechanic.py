@@ -1,16 +1,85 @@
-from JanggiBoard import JanggiBoard
+from JanggiBoard import JanggiBoard, LOC_TO_SQ, EMPTY
+from JanggiTables import ZOBRIST_PIECES, ZOBRIST_RED_TO_MOVE, EVAL_TABLE
 
 class JanggiMechanic:
     """
     A class to update the Janggi game board. 
     Used by the JanggiGame class to move pieces on the board,
     and to initially place pieces on the board.
+
+    Moves made with make_move are recorded on an undo stack, so that 
+    any number of them can be taken back (most recent first) with 
+    unmake_move.
+
+    The mechanic also keeps the Zobrist hash of the position up to date 
+    as pieces are placed and moved (see JanggiTables), and likewise the 
+    static evaluation: the sum of EVAL_TABLE (piece values plus 
+    piece-square bonuses) over the pieces on the board.
     """
 
     def __init__(self, board:JanggiBoard):
-        "Initialize the mechanic with a JanggiBoard object."
+        """
+        Initialize the mechanic with a JanggiBoard object, 
+        an empty undo stack, and the hash and evaluation of the board.
+        """
 
         self._board = board
+        self._undo_stack = []
+        self._hash = 0
+        self._eval = 0
+        self.refresh_hash()
+        self.refresh_eval()
+
+    def copy(self, board:JanggiBoard):
+        """
+        Returns a mechanic for (board), a copy of this mechanic's board, 
+        with the same hash and evaluation (which are copied rather than 
+        recomputed) and an empty undo stack.
+        """
+
+        mechanic = JanggiMechanic.__new__(JanggiMechanic)
+        mechanic._board = board
+        mechanic._undo_stack = []
+        mechanic._hash = self._hash
+        mechanic._eval = self._eval
+
+        return mechanic
+
+    def get_hash(self) -> int:
+        "Returns the 64-bit Zobrist hash of the current position."
+
+        return self._hash
+
+    def refresh_hash(self):
+        """
+        Recomputes the hash from the pieces on the board, 
+        with Blue to move.
+        """
+
+        self._hash = 0
+        for sq, code in enumerate(self._board.get_codes()):
+            if code != EMPTY:
+                self._hash ^= ZOBRIST_PIECES[code][sq]
+
+    def get_eval(self) -> int:
+        """
+        Returns the static evaluation of the current position, in 
+        hundredths of a point, from Red's point of view.
+        """
+
+        return self._eval
+
+    def refresh_eval(self):
+        "Recomputes the evaluation from the pieces on the board."
+
+        self._eval = 0
+        for sq, code in enumerate(self._board.get_codes()):
+            self._eval += EVAL_TABLE[code][sq]
+
+    def toggle_player(self):
+        "Updates the hash for a change of the player to move."
+
+        self._hash ^= ZOBRIST_RED_TO_MOVE
 
     def place_piece(self, piece):
         """
@@ -30,6 +99,8 @@ class JanggiMechanic:
             return False
 
         self._board.set_piece(piece, loc)
+        self._hash ^= ZOBRIST_PIECES[piece.get_code()][LOC_TO_SQ[loc]]
+        self._eval += EVAL_TABLE[piece.get_code()][LOC_TO_SQ[loc]]
         return True
 
     def move_piece(self, piece, loc:str):
@@ -42,6 +113,16 @@ class JanggiMechanic:
         # save the captured piece
         captured_piece = self._board.get_piece(loc)
 
+        # update the hash and evaluation
+        to_sq = LOC_TO_SQ[loc]
+        from_sq = LOC_TO_SQ[piece.get_loc()]
+        self._hash ^= ZOBRIST_PIECES[piece.get_code()][from_sq]
+        self._hash ^= ZOBRIST_PIECES[piece.get_code()][to_sq]
+        self._eval += EVAL_TABLE[piece.get_code()][to_sq] - EVAL_TABLE[piece.get_code()][from_sq]
+        if captured_piece is not None:
+            self._hash ^= ZOBRIST_PIECES[captured_piece.get_code()][to_sq]
+            self._eval -= EVAL_TABLE[captured_piece.get_code()][to_sq]
+
         # clear the old location
         self._board.clear_loc(piece.get_loc())
 
@@ -52,3 +133,81 @@ class JanggiMechanic:
         piece.set_pos(loc)
 
         return captured_piece
+
+    def make_move(self, piece, to_sq:int, flags=None):
+        """
+        Moves the (piece) to the given square (to_sq), and pushes an 
+        undo record onto the undo stack. If to_sq is the piece's own 
+        square, the move is a pass and the board is not changed.
+        The optional flags (for example the game's turn and state) are 
+        stored in the undo record, and handed back by unmake_move.
+        Returns the piece which was captured, or None 
+        if no piece was captured.
+        """
+
+        board = self._board
+        from_sq = piece.get_sq()
+
+        # a pass leaves the board alone
+        if from_sq == to_sq:
+            self._undo_stack.append((piece, from_sq, to_sq, None, flags, self._hash, self._eval))
+            return None
+
+        captured_piece = board.get_piece_sq(to_sq)
+        self._undo_stack.append((piece, from_sq, to_sq, captured_piece, flags, self._hash, self._eval))
+
+        code = piece.get_code()
+        keys = ZOBRIST_PIECES[code]
+        values = EVAL_TABLE[code]
+        self._hash ^= keys[from_sq] ^ keys[to_sq]
+        self._eval += values[to_sq] - values[from_sq]
+        if captured_piece is not None:
+            self._hash ^= ZOBRIST_PIECES[captured_piece.get_code()][to_sq]
+            self._eval -= EVAL_TABLE[captured_piece.get_code()][to_sq]
+
+        board.clear_sq(from_sq)
+        board.set_piece_sq(piece, to_sq)
+        piece.set_sq(to_sq)
+
+        return captured_piece
+
+    def unmake_move(self):
+        """
+        Takes back the most recent move made with make_move, putting 
+        the moved piece (and the captured piece, if any) back where 
+        they were. Returns the flags stored with the move.
+        """
+
+        piece, from_sq, to_sq, captured_piece, flags, self._hash, self._eval = self._undo_stack.pop()
+
+        if from_sq != to_sq:
+            self._board.set_piece_sq(piece, from_sq)
+            self._board.set_piece_sq(captured_piece, to_sq)
+            piece.set_sq(from_sq)
+
+        return flags
+
+    def commit_move(self):
+        """
+        Drops the undo record of the most recent move made with 
+        make_move, so the move can no longer be taken back (and the 
+        record doesn't keep the captured piece alive).
+        """
+
+        self._undo_stack.pop()
+
+    def reset(self):
+        """
+        Empties the undo stack, and recomputes the hash and evaluation 
+        from the pieces on the board (with Blue to move). Used after 
+        the board has been set up again.
+        """
+
+        self._undo_stack = []
+        self.refresh_hash()
+        self.refresh_eval()
+
+    def get_undo_depth(self) -> int:
+        "Returns the number of moves on the undo stack."
+
+        return len(self._undo_stack)
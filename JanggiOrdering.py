@@ -0,0 +1,159 @@
+# move ordering for searching Janggi positions
+
+from JanggiBoard import EMPTY, TYPE_MASK, GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER, NUM_SQUARES
+
+# ranks of the pieces for ordering captures, from least to most valuable
+# (the general can't actually be captured, but ranks highest as a victim)
+ORDER_RANKS = {
+    SOLDIER: 1,
+    ADVISOR: 2,
+    ELEPHANT: 3,
+    HORSE: 4,
+    CANNON: 5,
+    CHARIOT: 6,
+    GENERAL: 7
+}
+
+# Moves are ordered by score: the table move first, then captures
+# (most valuable victim, then least valuable attacker), then the
+# killer moves, then the quiet moves by their history scores.
+TABLE_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORE = 1 << 26
+
+# history scores are halved when one of them reaches this limit
+HISTORY_LIMIT = KILLER_SCORE // 2
+
+def is_capture(codes:list, move:tuple) -> bool:
+    "Returns True if the (from square, to square) move captures a piece."
+
+    return move[0] != move[1] and codes[move[1]] != EMPTY
+
+def mvv_lva(codes:list, move:tuple) -> int:
+    """
+    Returns the MVV-LVA (most valuable victim, least valuable
+    attacker) score of a capture.
+    """
+
+    return ORDER_RANKS[codes[move[1]] & TYPE_MASK] * 16 - ORDER_RANKS[codes[move[0]] & TYPE_MASK]
+
+class MoveOrderer:
+    """
+    A class to order the moves in a search so that the moves most
+    likely to cause a beta cutoff are searched first. It uses the move
+    from the transposition table, MVV-LVA ordering of captures, two
+    killer moves per ply (quiet moves which recently caused a cutoff
+    at the same ply), and a history table of cutoffs by from and to
+    square.
+
+    It also counts the cutoffs, and how many of them were caused by the
+    first move searched, which measures how good the ordering is.
+    """
+
+    def __init__(self, max_ply:int=64):
+        "Initialize the orderer for searches up to max_ply deep."
+
+        self._max_ply = max_ply
+        self._killers = [[None, None] for ply in range(max_ply + 1)]
+        self._history = [0] * (NUM_SQUARES * NUM_SQUARES)
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+
+    def get_killers(self, ply:int) -> list:
+        "Returns the two killer moves at the given ply (either can be None)."
+
+        return self._killers[ply]
+
+    def get_history(self, move:tuple) -> int:
+        "Returns the history score of the move."
+
+        return self._history[move[0] * NUM_SQUARES + move[1]]
+
+    def get_cutoffs(self) -> int:
+        "Returns the number of cutoffs recorded."
+
+        return self._cutoffs
+
+    def get_first_move_cutoffs(self) -> int:
+        "Returns the number of cutoffs caused by the first move searched."
+
+        return self._first_move_cutoffs
+
+    def get_first_move_rate(self) -> float:
+        "Returns the fraction of cutoffs caused by the first move searched."
+
+        if self._cutoffs == 0:
+            return 0.0
+
+        return self._first_move_cutoffs / self._cutoffs
+
+    def clear(self):
+        "Forgets all killer moves, history scores and counts."
+
+        self._history = [0] * (NUM_SQUARES * NUM_SQUARES)
+        self.new_search()
+
+    def new_search(self):
+        """
+        Prepares for a new search: the killer moves and counts are
+        cleared, and the history scores are halved, so that they favor
+        the moves which were good in recent positions.
+        """
+
+        self._killers = [[None, None] for ply in range(self._max_ply + 1)]
+        self._history = [score >> 1 for score in self._history]
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+
+    def score_move(self, codes:list, move:tuple, ply:int, table_move=None) -> int:
+        "Returns the ordering score of a move (higher scores are searched first)."
+
+        if move == table_move:
+            return TABLE_MOVE_SCORE
+        if is_capture(codes, move):
+            return CAPTURE_SCORE + mvv_lva(codes, move)
+
+        killers = self._killers[ply]
+        if move == killers[0]:
+            return KILLER_SCORE + 1
+        if move == killers[1]:
+            return KILLER_SCORE
+
+        return self._history[move[0] * NUM_SQUARES + move[1]]
+
+    def order_moves(self, codes:list, moves:list, ply:int, table_move=None) -> list:
+        """
+        Returns a new list of the (from square, to square) moves, in
+        the order they should be searched. codes is the board's list of
+        piece codes (JanggiBoard.get_codes) in the position being searched.
+        """
+
+        # equal scores keep their generation order
+        scored = [(self.score_move(codes, move, ply, table_move), -index) for index, move in enumerate(moves)]
+        scored.sort(reverse=True)
+
+        return [moves[-index] for score, index in scored]
+
+    def record_cutoff(self, codes:list, move:tuple, ply:int, depth:int, move_number:int):
+        """
+        Records that the move caused a beta cutoff at the given ply and
+        remaining depth, after move_number moves were searched before it.
+        Quiet moves become killer moves and gain history score.
+        """
+
+        self._cutoffs += 1
+        if move_number == 0:
+            self._first_move_cutoffs += 1
+
+        if is_capture(codes, move):
+            return
+
+        killers = self._killers[ply]
+        if move != killers[0]:
+            killers[1] = killers[0]
+            killers[0] = move
+
+        index = move[0] * NUM_SQUARES + move[1]
+        self._history[index] += depth * depth
+        if self._history[index] >= HISTORY_LIMIT:
+            self._history = [score >> 1 for score in self._history]
@@ -0,0 +1,156 @@
+# parallel search for the Janggi game, using multiple processes
+
+import multiprocessing
+import sys
+import time
+
+from JanggiGame import JanggiGame
+from JanggiEngine import JanggiEngine, SearchResult, INFINITY, DEFAULT_HASH_MB, move_to_locs
+from JanggiOrdering import MoveOrderer
+
+def _search_moves(task:tuple) -> tuple:
+    """
+    Runs in a worker process: rebuilds the game from its exported state,
+    searches the given root moves, and returns the result as a tuple of
+    (task index, iterations, pv, nodes), where iterations is the
+    search's list of (depth, score, pv) tuples (see
+    SearchResult.get_iterations) and pv is its final principal variation.
+    """
+
+    index, state, moves, max_time, max_depth, max_nodes, hash_mb = task
+
+    game = JanggiGame.from_state(state)
+    result = JanggiEngine(hash_mb).search(game, max_time=max_time, max_depth=max_depth,
+                                          max_nodes=max_nodes, moves=moves)
+
+    return index, result.get_iterations(), result.get_pv(), result.get_nodes()
+
+def merge_results(results:list) -> tuple:
+    """
+    Merges the results of searches of different root moves of a position,
+    a list of (iterations, pv) tuples (see _search_moves) in the order of
+    the moves' shares. Returns a tuple of (best move, score, pv, depth).
+
+    With a time or node limit the searches may finish different depths,
+    and scores from different depths can't be compared, so the best move
+    is the one with the highest score at the deepest depth that every
+    search finished. If a search didn't finish any depth, the first
+    move of the first share is taken, with a score of 0 (as
+    JanggiEngine.search does).
+    """
+
+    depth = min(len(iterations) for iterations, pv in results)
+    if depth == 0:
+        pv = results[0][1]
+        return pv[0], 0, pv, 0
+
+    best_move = None
+    best_score = -INFINITY
+    best_pv = []
+    for iterations, pv in results:
+        completed, score, line = iterations[depth - 1]
+        if best_move is None or score > best_score:
+            best_move, best_score, best_pv = line[0], score, line
+
+    return best_move, best_score, best_pv, depth
+
+def split_moves(game:JanggiGame, parts:int) -> list:
+    """
+    Splits the legal moves of the game's current player into (parts)
+    lists of (move_from, move_to) location string tuples. The moves are
+    ordered first (captures first), then dealt out in turn, so that
+    each list gets a share of the most promising moves.
+    """
+
+    moves = game.legal_moves_sq()
+    moves = MoveOrderer().order_moves(game.get_board().get_codes(), moves, 0)
+    shares = [moves[part::parts] for part in range(parts)]
+
+    return [[move_to_locs(move) for move in share] for share in shares if share]
+
+class ParallelSearch:
+    """
+    A class to search a JanggiGame position on several processes at once.
+    The root moves are split between the processes of a multiprocessing
+    pool, each of which rebuilds the position from the game's compact
+    state (JanggiGame.export_state) and searches its share of the moves
+    with its own JanggiEngine. The results are merged into a single best
+    move and principal variation.
+
+    The pool is started when the ParallelSearch is created, and is kept
+    until close is called (or the with block ends), so that it can be
+    used for many searches.
+    """
+
+    def __init__(self, processes:int=None, hash_mb:float=DEFAULT_HASH_MB):
+        """
+        Initialize the search with a pool of (processes) workers (by default,
+        one per CPU), each with a transposition table of hash_mb megabytes.
+        """
+
+        self._processes = processes or multiprocessing.cpu_count()
+        self._hash_mb = hash_mb
+        self._pool = multiprocessing.Pool(self._processes)
+
+    def __enter__(self):
+        "Use the search in a with block."
+
+        return self
+
+    def __exit__(self, *args):
+        "Stop the worker processes at the end of the with block."
+
+        self.close()
+
+    def get_processes(self) -> int:
+        "Returns the number of worker processes."
+
+        return self._processes
+
+    def close(self):
+        "Stops the worker processes."
+
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def search(self, game:JanggiGame, max_time=None, max_depth=None, max_nodes=None) -> SearchResult:
+        """
+        Searches the game's current position and returns a SearchResult,
+        with the same limits as JanggiEngine.search (max_nodes applies to
+        each worker). The reported depth is the depth that all of the
+        root moves were searched to, and the result is the best one at
+        that depth (see merge_results). The nodes are the total over
+        all of the workers.
+        """
+
+        start = time.monotonic()
+
+        if game.get_game_state() != "UNFINISHED" or not game.legal_moves_sq():
+            return JanggiEngine(0).search(game)
+
+        state = game.export_state()
+        tasks = [(index, state, moves, max_time, max_depth, max_nodes, self._hash_mb)
+                 for index, moves in enumerate(split_moves(game, self._processes))]
+
+        results = sorted(self._pool.imap_unordered(_search_moves, tasks))
+        nodes = sum(searched for index, iterations, pv, searched in results)
+        best_move, best_score, best_pv, depth = merge_results([(iterations, pv) for index, iterations, pv, searched in results])
+
+        return SearchResult(best_move, best_score, best_pv, depth, nodes, time.monotonic() - start)
+
+def parallel_search(game:JanggiGame, processes:int=None, max_time=None, max_depth=None, max_nodes=None,
+                    hash_mb:float=DEFAULT_HASH_MB) -> SearchResult:
+    """
+    Searches the game's current position with a new ParallelSearch, and
+    returns a SearchResult. See ParallelSearch.search.
+    """
+
+    with ParallelSearch(processes, hash_mb) as searcher:
+        return searcher.search(game, max_time=max_time, max_depth=max_depth, max_nodes=max_nodes)
+
+if __name__ == "__main__":
+    g = JanggiGame()
+    g.get_board().print_board()
+    print(parallel_search(g, max_time=float(sys.argv[1]) if len(sys.argv) > 1 else 5))
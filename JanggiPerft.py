@@ -0,0 +1,113 @@
+# perft (performance test) for the Janggi move generator
+
+import argparse
+import time
+
+from JanggiGame import JanggiGame
+from JanggiRecord import parse_move
+
+# Leaf node counts of the legal move tree from the starting position,
+# by depth. Passes are counted as moves.
+REFERENCE_COUNTS = {
+    1: 32,
+    2: 1024,
+    3: 33506,
+    4: 1095844,
+}
+
+def perft(game:JanggiGame, depth:int) -> int:
+    """
+    Returns the number of leaf nodes of the legal move tree of the 
+    given depth, starting from the game's current position.
+    """
+
+    if depth == 0:
+        return 1
+
+    moves = game.legal_moves_sq()
+
+    # at the last level the moves don't need to be made
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        game.push_move(move)
+        nodes += perft(game, depth - 1)
+        game.pop_move()
+
+    return nodes
+
+def divide(game:JanggiGame, depth:int) -> list:
+    """
+    Returns a list of (move, nodes) tuples giving the perft count of 
+    (depth - 1) below each legal move of the current position. Moves 
+    are (move_from, move_to) location string tuples.
+    """
+
+    board = game.get_board()
+    counts = []
+
+    for move in game.legal_moves_sq():
+        game.push_move(move)
+        nodes = perft(game, depth - 1)
+        game.pop_move()
+        counts.append(((board.sq_to_loc(move[0]), board.sq_to_loc(move[1])), nodes))
+
+    return counts
+
+def main(argv=None):
+    "Runs perft from the command line."
+
+    parser = argparse.ArgumentParser(description="Count the leaf nodes of the Janggi legal move tree.")
+    parser.add_argument("depth", type=int, help="depth of the move tree")
+    parser.add_argument("--position", help="position string to start from (default: the starting position)")
+    parser.add_argument("--moves", nargs="*", default=[], metavar="FROM-TO",
+                        help="moves to play from the position first (i.e. b10-d7)")
+    parser.add_argument("--divide", action="store_true", help="print the count below each root move")
+    parser.add_argument("--check", action="store_true",
+                        help="compare the count with the reference count for the starting position")
+    args = parser.parse_args(argv)
+
+    try:
+        game = JanggiGame.from_position(args.position) if args.position else JanggiGame()
+    except ValueError as error:
+        parser.error(str(error))
+    for text in args.moves:
+        try:
+            move_from, move_to = parse_move(text)
+        except ValueError as error:
+            parser.error(str(error))
+        if not game.make_move(move_from, move_to):
+            parser.error("illegal move: " + text)
+
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(game, args.depth)
+        for (move_from, move_to), nodes in counts:
+            print(move_from + "-" + move_to + ": " + str(nodes))
+        total = sum(nodes for move, nodes in counts)
+        print()
+        print("moves: " + str(len(counts)))
+    else:
+        total = perft(game, args.depth)
+    elapsed = time.perf_counter() - start
+
+    print("nodes: " + str(total))
+    print("time: %.3f s" % elapsed)
+    if elapsed > 0:
+        print("nps: %d" % (total / elapsed))
+
+    if args.check:
+        if args.moves or args.position or args.depth not in REFERENCE_COUNTS:
+            print("no reference count for this position and depth")
+            return 2
+        if total != REFERENCE_COUNTS[args.depth]:
+            print("MISMATCH: expected " + str(REFERENCE_COUNTS[args.depth]))
+            return 1
+        print("ok")
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
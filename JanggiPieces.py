@@ -1,27 +1,33 @@
 # pieces for the Janggi game
 
-from JanggiBoard import JanggiBoard
-from JanggiPosition import JanggiPosition
-from JanggiMechanic import JanggiMechanic
+from JanggiBoard import JanggiBoard, piece_code, EMPTY, BLUE, TYPE_MASK, CANNON, SQ_TO_LOC
+from JanggiPosition import JanggiPosition, POSITIONS, OFF_BOARD_POSITION, get_position
+from JanggiTables import HORSE_MOVES, ELEPHANT_MOVES, GENERAL_MOVES, ADVISOR_MOVES, SOLDIER_MOVES, RAYS, PALACE_LINES
 
 class Piece:
     """
     A class to represent a generic Janggi Piece. The generic Janggi 
     Piece has attributes for its current position (a JanggiPosition object), 
-    name, and the JanggiBoard it belongs to. The JanggiBoard _board dictionary
+    name, and the JanggiBoard it belongs to. The JanggiBoard _board list
     contains the locations of each Piece as well.
 
     Methods for the generic Janggi Piece are for reporting information about 
     the Piece (i.e. name, owner of the piece), or for helping the Pieces themselves
     calculate potential moves.
+
+    Pieces use __slots__ (each subclass adds no attributes of its own), 
+    and their positions are the interned JanggiPosition objects, so moving 
+    a piece allocates nothing. All static movement data is shared: the 
+    move tables are in JanggiTables.
     """
 
-    def __init__(self, player:str, number:int, character:str, location:dict, board:JanggiBoard):
-        """
-        Place the piece on the board, and keep track of this piece's location. 
+    __slots__ = ("_name", "_code", "_pos", "_board")
 
-        Each child class of Piece will give the superclass a location dictionary 
-        which contains information about where to initially place the piece.
+    def __init__(self, player:str, number:int, character:str, board:JanggiBoard):
+        """
+        Keep track of this piece's location. A new piece is off the board: 
+        the game sets its square, and its JanggiMechanic places it on the 
+        board (see JanggiMechanic.place_piece).
         """
 
         # construct the piece's name
@@ -29,17 +35,25 @@ class Piece:
             self._name = player + character
         else:
             self._name = player + character + str(number)
+        self._code = piece_code(player, character)
 
-        # get the piece's starting location
-        if player in location and number in location[player]:
-            self._pos = JanggiPosition(location[player][number], board)
-        else:
-            self._pos = JanggiPosition("invalid location", board)
+        self._pos = OFF_BOARD_POSITION
 
-        # place the piece on the board
         self._board = board
-        mechanic = JanggiMechanic(self._board)
-        mechanic.place_piece(self)
+
+    def copy(self, board:JanggiBoard):
+        """
+        Returns a copy of this piece (with the same name and position) 
+        belonging to (board). The copy is not placed on the board.
+        """
+
+        piece = self.__class__.__new__(self.__class__)
+        piece._name = self._name
+        piece._code = self._code
+        piece._pos = self._pos
+        piece._board = board
+
+        return piece
 
     def get_name(self) -> str:
         "Returns the piece's name."
@@ -50,6 +64,11 @@ class Piece:
         "Returns the player that owns this piece."
 
         return self._name[0]
+
+    def get_code(self) -> int:
+        "Returns the piece's integer code (see JanggiBoard)."
+
+        return self._code
     
     def get_pos(self) -> JanggiPosition:
         "Returns the piece's current position."
@@ -61,12 +80,23 @@ class Piece:
 
         return self._pos.get_loc()
     
+    def get_sq(self) -> int:
+        """
+        Returns the piece's current square number, 
+        or OFF_BOARD if the piece is not on the board.
+        """
+
+        return self._pos.get_sq()
+    
     def set_pos(self, loc:str):
         "Sets the current position of the piece."
 
-        pos = JanggiPosition(loc, self._board)
+        self._pos = get_position(loc)
+
+    def set_sq(self, sq:int):
+        "Sets the current position of the piece to the given square."
 
-        self._pos = pos
+        self._pos = POSITIONS[sq]
 
     def pos_on_board(self, pos:JanggiPosition) -> bool:
         """
@@ -164,436 +194,310 @@ class Piece:
         """
 
         if type(pos) == str:
-            pos = JanggiPosition(pos, self._board)
+            pos = get_position(pos)
 
         return self.pos_on_board(pos) and self.is_not_us(pos)
 
-class Elephant(Piece):
-    """
-    A class to represent the Elephant piece.
-    """
-
-    def __init__(self, player, number, board):
-        "Initialize the elephant."
-
-        location = {"R": {1: "b1", 2: "g1"}, "B": {1: "b10", 2: "g10"}}
-
-        self._movement = {
-            (0,1): [(1,1), (-1,1)], 
-            (0,-1): [(1,-1), (-1,-1)], 
-            (1,0): [(1,1), (1,-1)],
-            (-1,0): [(-1,1), (-1,-1)]
-        }
+    def get_table_moves(self, dests) -> list:
+        """
+        Takes an iterable of squares (usually an entry of one of the 
+        JanggiTables move tables) as input. Returns a list of the 
+        squares which don't contain a piece owned by the current player.
+        """
 
-        super().__init__(player, number, "E", location, board)
+        codes = self._board.get_codes()
+        color = self._code & BLUE
 
-    def get_moves(self) -> list:
-        "Returns a list of valid moves for this Elephant."
+        return [dest for dest in dests if codes[dest] == EMPTY or codes[dest] & BLUE != color]
 
-        valid_moves = []
+    def get_table_captures(self, dests) -> list:
+        """
+        Takes an iterable of squares (usually an entry of one of the 
+        JanggiTables move tables) as input. Returns a list of the 
+        squares which contain a piece owned by the opposite player.
+        """
 
-        # try the first move in each direction
-        for first_move in self._movement:
-            first_pos = self._pos.shift(first_move)
-            # if the first position is open, check the next moves
-            if self.is_open(first_pos):
-                # there are two options for second move: diagonal right or diagonal left
-                for second_move in self._movement[first_move]:
-                    second_pos = first_pos.shift(second_move)
-                    # if the second position is open, repeat the second move
-                    if self.is_open(second_pos):
-                        third_pos = second_pos.shift(second_move)
-                        # add the move if it is valid
-                        if self.ok_to_move_here(third_pos):
-                            valid_moves.append(third_pos.get_loc())
+        codes = self._board.get_codes()
+        color = self._code & BLUE
 
-        return valid_moves
+        return [dest for dest in dests if codes[dest] != EMPTY and codes[dest] & BLUE != color]
 
-class General(Piece):
-    " A class to represent the General piece."
+    def get_moves(self) -> list:
+        "Returns a list of valid moves (as location strings) for this piece."
 
-    def __init__(self, player, board):
-        "Initialize the general."
+        return [SQ_TO_LOC[sq] for sq in self.get_moves_sq()]
 
-        location = {"R": {1: "e2"}, "B": {1: "e9"}}
-
-        self._moves = {
-            "d8": ["e8", "d9", "e9"],
-            "e8": ["d8", "f8", "e9"],
-            "f8": ["e8", "e9", "f9"],
-            "d9": ["d8", "e9", "d10"],
-            "e9": ["d8", "e8", "f8", "d9", "f9", "d10", "e10", "f10"],
-            "f9": ["f8", "e9", "f10"],
-            "d10": ["d9", "e9", "e10"],
-            "e10": ["e9", "d10", "f10"],
-            "f10": ["e9", "f9", "e10"],
-            "d3": ["e3", "d2", "e2"],
-            "e3": ["d3", "f3", "e2"],
-            "f3": ["e3", "e2", "f2"],
-            "d2": ["d3", "e2", "d1"],
-            "e2": ["d3", "e3", "f3", "d2", "f2", "d1", "e1", "f1"],
-            "f2": ["f3", "e2", "f1"],
-            "d1": ["d2", "e2", "e1"],
-            "e1": ["e2", "d1", "f1"],
-            "f1": ["e2", "f2", "e1"],
-        }
-
-        super().__init__(player, 1, "G", location, board)
-
-    def get_moves(self):
-        "Returns a list of valid moves for the General."
+    def get_captures(self) -> list:
+        "Returns a list of valid captures (as location strings) for this piece."
 
-        valid_moves = []
+        return [SQ_TO_LOC[sq] for sq in self.get_captures_sq()]
 
-        if self.get_loc() in self._moves:
-            for move in self._moves[self.get_loc()]:
-                # add the move if valid
-                if self.ok_to_move_here(move):
-                    valid_moves.append(move)
-        
-        return valid_moves
+class Elephant(Piece):
+    """
+    A class to represent the Elephant piece.
+    """
 
-class Advisor(Piece):
-    "A class to represent the Advisor piece."
+    __slots__ = ()
 
     def __init__(self, player, number, board):
-        "Initialize the advisor."
+        "Initialize the elephant."
+
+        super().__init__(player, number, "E", board)
 
-        location = {"R": {1: "d1", 2: "f1"}, "B": {1: "d10", 2: "f10"}}
-
-        self._moves = {
-            "d8": ["e8", "d9", "e9"],
-            "e8": ["d8", "f8", "e9"],
-            "f8": ["e8", "e9", "f9"],
-            "d9": ["d8", "e9", "d10"],
-            "e9": ["d8", "e8", "f8", "d9", "f9", "d10", "e10", "f10"],
-            "f9": ["f8", "e9", "f10"],
-            "d10": ["d9", "e9", "e10"],
-            "e10": ["e9", "d10", "f10"],
-            "f10": ["e9", "f9", "e10"],
-            "d3": ["e3", "d2", "e2"],
-            "e3": ["d3", "f3", "e2"],
-            "f3": ["e3", "e2", "f2"],
-            "d2": ["d3", "e2", "d1"],
-            "e2": ["d3", "e3", "f3", "d2", "f2", "d1", "e1", "f1"],
-            "f2": ["f3", "e2", "f1"],
-            "d1": ["d2", "e2", "e1"],
-            "e1": ["e2", "d1", "f1"],
-            "f1": ["e2", "f2", "e1"],
-        }
-
-        super().__init__(player, number, "A", location, board)
-
-    def get_moves(self):
-        "Returns a list of valid moves for the Advisor."
+    def get_moves_sq(self) -> list:
+        "Returns a list of squares this Elephant can move to."
 
+        codes = self._board.get_codes()
+        color = self._code & BLUE
         valid_moves = []
 
-        if self.get_loc() in self._moves:
-            for move in self._moves[self.get_loc()]:
-                # add the move if valid
-                if self.ok_to_move_here(move):
-                    valid_moves.append(move)
-        
+        # the elephant is blocked if either of the first two steps is occupied
+        for leg1, leg2, dest in ELEPHANT_MOVES[self.get_sq()]:
+            if codes[leg1] == EMPTY and codes[leg2] == EMPTY:
+                if codes[dest] == EMPTY or codes[dest] & BLUE != color:
+                    valid_moves.append(dest)
+
         return valid_moves
 
-class Chariot(Piece):
-    "A class to represent a Chariot piece."
+    def get_captures_sq(self) -> list:
+        "Returns a list of squares this Elephant can capture on."
 
-    def __init__(self, player, number, board):
-        "Initialize the Chariot."
+        codes = self._board.get_codes()
+        color = self._code & BLUE
+        captures = []
 
-        location = {"R": {1: "a1", 2: "i1"}, "B": {1: "a10", 2: "i10"}}
-
-        # movement direction vectors
-        self._directions = [(1,0), (-1,0), (0,1), (0,-1)]
-
-        # palace movement dictionary
-        # format: 
-        # start: (jump, dest)
-        self._palace_corner_moves = {
-            "d1": ("e2", "f3"),
-            "f1": ("e2", "d3"),
-            "d3": ("e2", "f1"),
-            "f3": ("e2", "d1"),
-            "d10": ("e9", "f8"),
-            "f10": ("e9", "d8"),
-            "d8": ("e9", "f10"),
-            "f8": ("e9", "d10")
-        }
-
-        self._palace_center_moves = {
-            "e2": ["d3", "f3", "d1", "f1"],
-            "e9": ["d8", "f8", "d10", "f10"]
-        }
-
-        super().__init__(player, number, "C", location, board)
-
-    def get_step(self, start:JanggiPosition, direction:tuple) -> JanggiPosition:
-        """
-        Generator function that finds the next position
-        on the board in the given direction. Starts at the 
-        start position. Returns the next position 
-        while the next position is on the board.
-        """
+        for leg1, leg2, dest in ELEPHANT_MOVES[self.get_sq()]:
+            if codes[dest] != EMPTY and codes[dest] & BLUE != color:
+                if codes[leg1] == EMPTY and codes[leg2] == EMPTY:
+                    captures.append(dest)
 
-        step = start.shift(direction)
+        return captures
 
-        while self.pos_on_board(step):
-            yield step
-            step = step.shift(direction)
-
-    def get_move(self, direction:tuple) -> str:
-        """
-        Generator function that finds the next valid move 
-        in the given direction. 
-        """
+class General(Piece):
+    " A class to represent the General piece."
 
-        start = self._pos
+    __slots__ = ()
 
-        for step in self.get_step(start, direction):
-            # if we reach our own piece, stop here
-            if self.is_us(step):
-                return
+    def __init__(self, player, board):
+        "Initialize the general."
 
-            # if we reach the opponents piece, return the location
-            # then stop here
-            if self.is_opponent(step):
-                yield step.get_loc()
-                return
+        super().__init__(player, 1, "G", board)
 
-            yield step.get_loc()
+    def get_moves_sq(self) -> list:
+        "Returns a list of squares the General can move to."
 
-    def get_moves(self) -> list:
-        "Returns a list of valid moves for this Cannon."
+        return self.get_table_moves(GENERAL_MOVES[self.get_sq()])
 
-        valid_moves = []
+    def get_captures_sq(self) -> list:
+        "Returns a list of squares the General can capture on."
 
-        for direction in self._directions:
-            for move in self.get_move(direction):
-                valid_moves.append(move)
-
-        # add diagonal moves if appropriate
-        if self.get_loc() in self._palace_corner_moves:
-            move1, move2 = self._palace_corner_moves[self.get_loc()]
-            if self.ok_to_move_here(move1):
-                valid_moves.append(move1)
-            if self.is_open(move1) and self.ok_to_move_here(move2):
-                valid_moves.append(move2)
-        
-        # add moves from center of palace if appropriate
-        if self.get_loc() in self._palace_center_moves:
-            moves = self._palace_center_moves[self.get_loc()]
-            for move in moves:
-                if self.ok_to_move_here(move):
-                    valid_moves.append(move)
+        return self.get_table_captures(GENERAL_MOVES[self.get_sq()])
 
-        return valid_moves
+class Advisor(Piece):
+    "A class to represent the Advisor piece."
 
-class Cannon(Piece):
-    "A class to represent the Cannon piece."
+    __slots__ = ()
 
     def __init__(self, player, number, board):
-        "Initialize the Cannon."
+        "Initialize the advisor."
 
-        location = {"R": {1: "b3", 2: "h3"}, "B": {1: "b8", 2: "h8"}}
+        super().__init__(player, number, "A", board)
 
-        # movement direction vectors
-        self._directions = [(1,0), (-1,0), (0,1), (0,-1)]
+    def get_moves_sq(self) -> list:
+        "Returns a list of squares the Advisor can move to."
 
-        # palace movement dictionary
-        # format: 
-        # start: (jump, dest)
-        self._palace_moves = {
-            "d1": ("e2", "f3"),
-            "f1": ("e2", "d3"),
-            "d3": ("e2", "f1"),
-            "f3": ("e2", "d1"),
-            "d10": ("e9", "f8"),
-            "f10": ("e9", "d8"),
-            "d8": ("e9", "f10"),
-            "f8": ("e9", "d10")
-        }
+        return self.get_table_moves(ADVISOR_MOVES[self.get_sq()])
 
-        super().__init__(player, number, "O", location, board)
+    def get_captures_sq(self) -> list:
+        "Returns a list of squares the Advisor can capture on."
 
-    def is_cannon(self, pos:JanggiPosition) -> bool:
-        """
-        Returns True if there is a Cannon at the given 
-        position. Returns False otherwise.
-        """
-        
-        piece = self._board.get_piece(pos.get_loc())
+        return self.get_table_captures(ADVISOR_MOVES[self.get_sq()])
 
-        if piece is None:
-            return False
+class Chariot(Piece):
+    "A class to represent a Chariot piece."
 
-        if piece.get_name()[1] == 'O':
-            return True
-        
-        return False
+    __slots__ = ()
 
-    def get_step(self, start:JanggiPosition, direction:tuple) -> JanggiPosition:
-        """
-        Generator function that finds the next position
-        on the board in the given direction. Starts at the 
-        start position. Returns the next position 
-        while the next position is on the board.
-        """
+    def __init__(self, player, number, board):
+        "Initialize the Chariot."
 
-        step = start.shift(direction)
+        super().__init__(player, number, "C", board)
 
-        while self.pos_on_board(step):
-            yield step
-            step = step.shift(direction)
+    def get_moves_sq(self) -> list:
+        "Returns a list of squares this Chariot can move to."
 
-    def get_jump_pos(self, direction:tuple):
-        """
-        Returns the position of the next piece in the given direction 
-        (starting at the Cannon's current position). This is the position
-        the Cannon will jump over.
-        Returns False if no piece is found.
-        """
+        codes = self._board.get_codes()
+        color = self._code & BLUE
+        valid_moves = []
+        sq = self.get_sq()
+
+        # slide along each line and palace diagonal until reaching a piece,
+        # which can be captured if it is the opponent's
+        for line in RAYS[sq] + PALACE_LINES[sq]:
+            for step in line:
+                code = codes[step]
+                if code == EMPTY:
+                    valid_moves.append(step)
+                    continue
+                if code & BLUE != color:
+                    valid_moves.append(step)
+                break
 
-        for step in self.get_step(self._pos, direction):
-            # if there is a cannon here, stop
-            if self.is_cannon(step):
-                return False
+        return valid_moves
 
-            # if we find a non-cannon piece, return the position
-            if self.is_piece(step):
-                return step
-        # no pieces found
-        return False
+    def get_captures_sq(self) -> list:
+        "Returns a list of squares this Chariot can capture on."
 
-    def get_move(self, direction:tuple) -> str:
-        """
-        Generator function that finds the next valid move 
-        in the given direction. 
-        """
+        codes = self._board.get_codes()
+        color = self._code & BLUE
+        captures = []
+        sq = self.get_sq()
 
-        start = self.get_jump_pos(direction)
+        # only the first piece along each line can be captured
+        for line in RAYS[sq] + PALACE_LINES[sq]:
+            for step in line:
+                code = codes[step]
+                if code != EMPTY:
+                    if code & BLUE != color:
+                        captures.append(step)
+                    break
 
-        # if there is no jump position, do nothing
-        if not start:
-            return
+        return captures
 
-        for step in self.get_step(start, direction):
-            # if we reach a cannon, stop here
-            if self.is_cannon(step):
-                return
+class Cannon(Piece):
+    "A class to represent the Cannon piece."
 
-            # if we reach our own piece, stop here
-            if self.is_us(step):
-                return
+    __slots__ = ()
 
-            # if we reach the opponents piece, return the location
-            # then stop here
-            if self.is_opponent(step):
-                yield step.get_loc()
-                return
+    def __init__(self, player, number, board):
+        "Initialize the Cannon."
 
-            yield step.get_loc()
+        super().__init__(player, number, "O", board)
 
-    def get_moves(self) -> list:
-        "Returns a list of valid moves for this Cannon."
+    def get_moves_sq(self) -> list:
+        "Returns a list of squares this Cannon can move to."
 
+        codes = self._board.get_codes()
+        color = self._code & BLUE
         valid_moves = []
-
-        for direction in self._directions:
-            for move in self.get_move(direction):
-                valid_moves.append(move)
-
-        # add diagonal moves if appropriate
-        if self.get_loc() in self._palace_moves:
-            jump, dest = self._palace_moves[self.get_loc()]
-            if self.is_piece(jump) and self.ok_to_move_here(dest):
-                valid_moves.append(dest)
+        sq = self.get_sq()
+
+        for ray in RAYS[sq]:
+            jumped = False
+            for step in ray:
+                code = codes[step]
+                # look for a piece to jump over, which can't be a cannon
+                if not jumped:
+                    if code == EMPTY:
+                        continue
+                    if code & TYPE_MASK == CANNON:
+                        break
+                    jumped = True
+                    continue
+                # after the jump, move until reaching a piece,
+                # which can be captured if it is the opponent's and not a cannon
+                if code == EMPTY:
+                    valid_moves.append(step)
+                    continue
+                if code & TYPE_MASK != CANNON and code & BLUE != color:
+                    valid_moves.append(step)
+                break
+
+        # add diagonal moves if appropriate (jumping over the palace center)
+        for line in PALACE_LINES[sq]:
+            if len(line) > 1 and codes[line[0]] != EMPTY:
+                if codes[line[1]] == EMPTY or codes[line[1]] & BLUE != color:
+                    valid_moves.append(line[1])
 
         return valid_moves
 
+    def get_captures_sq(self) -> list:
+        "Returns a list of squares this Cannon can capture on."
+
+        codes = self._board.get_codes()
+        color = self._code & BLUE
+        captures = []
+        sq = self.get_sq()
+
+        for ray in RAYS[sq]:
+            jumped = False
+            for step in ray:
+                code = codes[step]
+                if code == EMPTY:
+                    continue
+                # the first piece is the screen, which can't be a cannon,
+                # and the second piece is the target, which can't be a cannon
+                if code & TYPE_MASK == CANNON:
+                    break
+                if jumped:
+                    if code & BLUE != color:
+                        captures.append(step)
+                    break
+                jumped = True
+
+        # diagonal captures jump over the palace center
+        for line in PALACE_LINES[sq]:
+            if len(line) > 1 and codes[line[0]] != EMPTY:
+                if codes[line[1]] != EMPTY and codes[line[1]] & BLUE != color:
+                    captures.append(line[1])
+
+        return captures
+
 class Horse(Piece):
     "A class to represent the Horse piece."
 
+    __slots__ = ()
+
     def __init__(self, player, number, board):
         "Initialize the horse."
 
-        location = {"R": {1: "c1", 2: "h1"}, "B": {1: "c10", 2: "h10"}}
-
-        self._movement = {
-            (0,1): [(1,1), (-1,1)], 
-            (0,-1): [(1,-1), (-1,-1)], 
-            (1,0): [(1,1), (1,-1)],
-            (-1,0): [(-1,1), (-1,-1)]
-        }
+        super().__init__(player, number, "H", board)
 
-        super().__init__(player, number, "H", location, board)
-
-    def get_moves(self) -> list:
-        "Returns a list of valid moves for this Horse"
+    def get_moves_sq(self) -> list:
+        "Returns a list of squares this Horse can move to."
 
+        codes = self._board.get_codes()
+        color = self._code & BLUE
         valid_moves = []
 
-        # try moving in each direction
-        for first_move in self._movement:
-            first_pos = self._pos.shift(first_move)
-            # if the first move is clear, move on to second move
-            if self.is_open(first_pos):
-                # there are two possible second moves: diagonal right or diagonal left
-                for second_move in self._movement[first_move]:
-                    second_pos = first_pos.shift(second_move)
-                    # add the move if it is valid
-                    if self.ok_to_move_here(second_pos):
-                        valid_moves.append(second_pos.get_loc())
+        # the horse is blocked if its first step is occupied
+        for leg, dest in HORSE_MOVES[self.get_sq()]:
+            if codes[leg] == EMPTY:
+                if codes[dest] == EMPTY or codes[dest] & BLUE != color:
+                    valid_moves.append(dest)
 
         return valid_moves
 
-class Soldier(Piece):
-    "A class to represent the Soldier piece."
+    def get_captures_sq(self) -> list:
+        "Returns a list of squares this Horse can capture on."
 
-    def __init__(self, player, number, board):
-        "Initialize the soldier."
+        codes = self._board.get_codes()
+        color = self._code & BLUE
+        captures = []
 
-        location = {
-            "R": {1: "a4", 2: "c4", 3: "e4", 4: "g4", 5: "i4"},
-            "B": {1: "a7", 2: "c7", 3: "e7", 4: "g7", 5: "i7"}
-        }
+        for leg, dest in HORSE_MOVES[self.get_sq()]:
+            if codes[dest] != EMPTY and codes[dest] & BLUE != color and codes[leg] == EMPTY:
+                captures.append(dest)
 
-        if player == "R":
-            direction = 1
-        else:
-            direction = -1
+        return captures
 
-        # normal movement
-        self._movement = [(1, 0), (-1, 0), (0, direction)]
+class Soldier(Piece):
+    "A class to represent the Soldier piece."
 
-        # extra moves when in the palace
-        self._palace_moves = {
-            "d8": ["e9"],
-            "f8": ["e9"],
-            "e9": ["d10", "f10"],
-            "d3": ["e2"],
-            "f3": ["e2"],
-            "e2": ["d1", "f1"]
-        }
+    __slots__ = ()
 
-        super().__init__(player, number, "S", location, board)
+    def __init__(self, player, number, board):
+        "Initialize the soldier."
 
-    def get_moves(self):
-        "Returns a list of valid moves for this Soldier."
+        super().__init__(player, number, "S", board)
 
-        valid_moves = []
+    def get_moves_sq(self) -> list:
+        "Returns a list of squares this Soldier can move to."
 
-        for movement in self._movement:
-            move = self._pos.shift(movement)
-            # add the move if valid
-            if self.ok_to_move_here(move):
-                valid_moves.append(move.get_loc())
+        # Red soldiers move up the board, Blue soldiers move down
+        return self.get_table_moves(SOLDIER_MOVES[self._code & BLUE][self.get_sq()])
 
-        if self.get_loc() in self._palace_moves:
-            for palace_move in self._palace_moves[self.get_loc()]:
-                # add the move if valid
-                if self.ok_to_move_here(palace_move):
-                    valid_moves.append(palace_move)
+    def get_captures_sq(self) -> list:
+        "Returns a list of squares this Soldier can capture on."
 
-        return valid_moves
+        return self.get_table_captures(SOLDIER_MOVES[self._code & BLUE][self.get_sq()])
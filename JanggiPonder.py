@@ -0,0 +1,141 @@
+# pondering (thinking on the opponent's time) for the Janggi game
+
+import threading
+
+from JanggiGame import JanggiGame
+from JanggiEngine import JanggiEngine, SearchControl, SearchResult, MAX_DEPTH
+
+def predicted_reply(result:SearchResult):
+    """
+    Returns the opponent's reply expected by a search result (the second
+    move of its principal variation), or None if there isn't one.
+    """
+
+    pv = result.get_pv()
+
+    return pv[1] if len(pv) > 1 else None
+
+class Ponderer:
+    """
+    A class to ponder: while the opponent is deciding on their move, the
+    engine searches the position after the move it predicts they will
+    play, in a background thread. The search runs without a time limit
+    on its own copy of the game (see JanggiGame.clone).
+
+    When the opponent moves, respond either turns the ponder search into
+    the real search (a ponder hit: the predicted move was played, and
+    the search, which has already been running, is given a deadline),
+    or cancels it and starts a new search. Either way the engine's
+    transposition table has been kept warm.
+
+    Python threads share one interpreter, so the ponder search takes
+    time from the main thread; it is meant for when the main thread is
+    waiting for the opponent.
+    """
+
+    def __init__(self, engine:JanggiEngine=None):
+        "Initialize the ponderer with the engine to search with."
+
+        self._engine = engine if engine is not None else JanggiEngine()
+        self._thread = None
+        self._control = None
+        self._move = None
+        self._key = None
+        self._result = None
+
+    def get_engine(self) -> JanggiEngine:
+        "Returns the engine."
+
+        return self._engine
+
+    def get_predicted_move(self):
+        "Returns the move being pondered on, or None if not pondering."
+
+        return self._move if self._thread is not None else None
+
+    def is_pondering(self) -> bool:
+        "Returns True if a ponder search has been started and not yet finished with."
+
+        return self._thread is not None
+
+    def start(self, game:JanggiGame, move:tuple) -> bool:
+        """
+        Starts pondering on the game's current position (with the opponent
+        to move), assuming the opponent will play (move), a (move_from,
+        move_to) location string tuple. Returns False if the move is not
+        legal, and True otherwise. Any ponder search already running is
+        cancelled first.
+        """
+
+        self.cancel()
+
+        position = game.clone()
+        if not position.make_move(move[0], move[1]):
+            return False
+
+        self._control = SearchControl()
+        self._move = tuple(move)
+        self._key = position.position_key()
+        self._result = None
+        self._thread = threading.Thread(target=self._ponder, args=(position, self._control), daemon=True)
+        self._thread.start()
+
+        return True
+
+    def _ponder(self, position:JanggiGame, control:SearchControl):
+        "Runs the ponder search (in the background thread)."
+
+        self._result = self._engine.search(position, max_depth=MAX_DEPTH, control=control)
+
+    def cancel(self):
+        "Stops the ponder search, if there is one, and discards its result."
+
+        if self._thread is not None:
+            self._control.stop()
+            self._thread.join()
+        self._thread = None
+        self._control = None
+        self._move = None
+        self._key = None
+        self._result = None
+
+    def ponder_hit(self, max_time:float) -> SearchResult:
+        """
+        Turns the ponder search into the real search, after the predicted
+        move has been played: the search is given (max_time) more seconds,
+        and its result is returned. Raises RuntimeError if no ponder search
+        has been started (see start).
+        """
+
+        if self._thread is None:
+            raise RuntimeError("ponder_hit called while not pondering")
+
+        self._control.set_time(max_time)
+        self._thread.join()
+        result = self._result
+        self._thread = None
+        self._control = None
+        self._move = None
+        self._key = None
+        self._result = None
+
+        return result
+
+    def respond(self, game:JanggiGame, move:tuple, max_time:float) -> SearchResult:
+        """
+        Called after the opponent has played (move) on the game, a
+        (move_from, move_to) location string tuple. Returns the result
+        of a search of the game's current position taking about
+        (max_time) seconds: the ponder search if the move was predicted
+        (and the game is in the position pondered on), or a new search
+        otherwise.
+        """
+
+        if self._thread is not None and tuple(move) == self._move and game.position_key() == self._key:
+            result = self.ponder_hit(max_time)
+            if result is not None:
+                return result
+
+        self.cancel()
+
+        return self._engine.search(game, max_time=max_time)
@@ -1,72 +1,62 @@
-from JanggiBoard import JanggiBoard
+from JanggiBoard import JanggiBoard, NUM_SQUARES, OFF_BOARD, SQ_TO_LOC, SQ_TO_TUPLE
 
 class JanggiPosition:
     """
     A class to represent a position on the Janggi game board. 
-    A JanggiPosition can be initialized using a location string ("b5") 
-    or a tuple ((1,4)). The purpose of this class is to have clean 
-    syntax for adding vectors (represented by tuples) to positions on the 
-    board (represented usually as location strings). The most important 
-    method is the shift method, which does this vector addition.
-
-    The JanggiPosition class uses the JanggiBoard class to do conversions 
-    between tuple and location string, and to check whether a given tuple 
-    is actually on the board. 
+    A JanggiPosition can be made from a location string ("b5"),
+    a tuple ((1,4)), or a square number (37). The purpose of this class
+    is to have clean syntax for adding vectors (represented by tuples)
+    to positions on the board (represented usually as location strings).
+    The most important method is the shift method, which does this
+    vector addition.
+
+    Positions are immutable and interned: there is exactly one
+    JanggiPosition for each of the 90 points of the board, plus one
+    off-board position (whose location, tuple and square are None,
+    None and OFF_BOARD), and JanggiPosition(pos) returns the existing
+    instance instead of creating a new one. Shifting by a single step
+    is looked up in a precomputed neighbor table.
 
     The Pieces store their location information as a JanggiPosition, 
     so that they can use the shift method to calculate potential moves. 
     """
 
-    def __init__(self, pos, board:JanggiBoard):
+    __slots__ = ("_sq", "_loc", "_tuple", "_neighbors")
+
+    def __new__(cls, pos, board:JanggiBoard=None):
         """
-        Initialize the position, setting _loc to be the 
-        current location string, and setting _tuple to be the 
-        current location tuple. pos can be either a tuple or a 
-        location string. If the position is not 
-        on the board, both _loc and _tuple are set to None.
+        Returns the position for pos, which can be a location string,
+        a tuple, a square number, or a JanggiPosition. If the position
+        is not on the board, returns the off-board position. The board
+        argument is accepted for compatibility, and is not used.
         """
 
-        self._board = board
-        self.set_pos(pos)
+        return get_position(pos)
 
-    def __repr__(self):
-        "Return the position's location string."
+    def __setattr__(self, name, value):
+        "Positions are immutable."
 
-        return self._loc
+        raise AttributeError("JanggiPosition objects are immutable")
 
-    def set_pos(self, pos):
-        """
-        Set the position. pos can be either a tuple or a 
-        location string. If the position is not 
-        on the board, both _loc and _tuple are set to None.
-        """
+    def __reduce__(self):
+        "Pickle the position as its square, so unpickling returns the interned instance."
 
-        if type(pos) == str and self._board.loc_on_board(pos):
-            self._loc = pos
-            self._tuple = self._board.loc_to_tuple(pos)
-        elif type(pos) == tuple and self._board.tuple_on_board(pos):
-            self._loc = self._board.tuple_to_loc(pos)
-            self._tuple = pos
-        else:
-            self._loc = None
-            self._tuple = None
+        return (get_position, (self._sq,))
 
+    def __copy__(self):
+        "Positions are immutable, so a copy is the position itself."
 
-    # def tuple_to_loc(self, tup:tuple):
-    #     """
-    #     Convert the tuple to a location on the board.
-    #     Returns None if the location is not valid.
-    #     """
+        return self
 
-    #     return self._board.tuple_to_loc(tup)
+    def __deepcopy__(self, memo):
+        "Positions are immutable, so a copy is the position itself."
 
-    # def loc_to_tuple(self, loc:str):
-    #     """
-    #     Converts the location string to a tuple on the board.
-    #     Returns None if the location is not valid.
-    #     """
+        return self
 
-    #     return self._board.loc_to_tuple(loc)
+    def __repr__(self):
+        "Return the position's location string."
+
+        return str(self._loc)
 
     def get_tuple(self) -> tuple:
         "Returns the position's tuple representation."
@@ -78,6 +68,11 @@ class JanggiPosition:
 
         return self._loc
 
+    def get_sq(self) -> int:
+        "Returns the position's square number (OFF_BOARD if not on the board)."
+
+        return self._sq
+
     def add_tuples(self, tup1:tuple, tup2:tuple) -> tuple:
         """
         Performs vector addition on the two tuples, and 
@@ -94,10 +89,61 @@ class JanggiPosition:
     def shift(self, movement:tuple):
         """
         Shifts the position by the movement tuple (using vector 
-        addition). Returns a new JanggiPosition with the shifted coordinates.
+        addition). Returns the JanggiPosition with the shifted coordinates.
         """
 
-        new_tuple = self.add_tuples(self._tuple, movement)
-        new_pos = JanggiPosition(new_tuple, self._board)
+        neighbor = self._neighbors.get(movement)
+
+        if neighbor is not None:
+            return neighbor
+
+        return get_position(self.add_tuples(self._tuple, movement))
+
+def _make_position(sq:int) -> JanggiPosition:
+    "Creates the position for the given square (OFF_BOARD for the off-board position)."
+
+    position = object.__new__(JanggiPosition)
+    on_board = sq != OFF_BOARD
+    object.__setattr__(position, "_sq", sq)
+    object.__setattr__(position, "_loc", SQ_TO_LOC[sq] if on_board else None)
+    object.__setattr__(position, "_tuple", SQ_TO_TUPLE[sq] if on_board else None)
+    object.__setattr__(position, "_neighbors", {})
+
+    return position
+
+POSITIONS = [_make_position(sq) for sq in range(NUM_SQUARES)]
+OFF_BOARD_POSITION = _make_position(OFF_BOARD)
+
+_TUPLE_TO_POSITION = {SQ_TO_TUPLE[sq]: POSITIONS[sq] for sq in range(NUM_SQUARES)}
+_LOC_TO_POSITION = {SQ_TO_LOC[sq]: POSITIONS[sq] for sq in range(NUM_SQUARES)}
+
+def get_position(pos) -> JanggiPosition:
+    """
+    Returns the interned JanggiPosition for pos, which can be a location
+    string, a tuple, a square number, or a JanggiPosition. Returns the
+    off-board position if pos is not on the board.
+    """
+
+    if type(pos) == str:
+        return _LOC_TO_POSITION.get(pos, OFF_BOARD_POSITION)
+    if type(pos) == tuple:
+        return _TUPLE_TO_POSITION.get(pos, OFF_BOARD_POSITION)
+    if type(pos) == int:
+        return POSITIONS[pos] if 0 <= pos < NUM_SQUARES else OFF_BOARD_POSITION
+    if type(pos) == JanggiPosition:
+        return pos
+
+    return OFF_BOARD_POSITION
+
+def _link_neighbors():
+    """
+    Fills in the neighbor table of each position, for all
+    single steps (including diagonal steps).
+    """
+
+    steps = [(dc, dr) for dc in (-1, 0, 1) for dr in (-1, 0, 1) if (dc, dr) != (0, 0)]
+    for position in POSITIONS:
+        for step in steps:
+            position._neighbors[step] = get_position(position.add_tuples(position.get_tuple(), step))
 
-        return new_pos
+_link_neighbors()
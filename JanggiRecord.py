@@ -0,0 +1,77 @@
+# game records for the Janggi game
+
+from JanggiGame import JanggiGame
+
+# A text game record holds one game per line, as its moves separated by
+# spaces, each written as "from-to" (i.e. "b10-d7"). A pass is written as
+# the general's location twice (i.e. "e9-e9"). Blank lines, and lines
+# starting with "#", are ignored.
+COMMENT = "#"
+
+def parse_move(text:str) -> tuple:
+    """
+    Converts a move string such as "b10-d7" into the location string
+    tuple ("b10", "d7"). Raises ValueError if the string is not a move.
+    """
+
+    move_from, dash, move_to = text.partition("-")
+    if not dash or not move_from or not move_to or "-" in move_to:
+        raise ValueError("not a move: " + text)
+
+    return move_from, move_to
+
+def format_move(move:tuple) -> str:
+    """
+    Converts a (move_from, move_to) location string tuple into a
+    move string such as "b10-d7".
+    """
+
+    return move[0] + "-" + move[1]
+
+def parse_record(line:str) -> list:
+    """
+    Converts a line of a text game record into a list of
+    (move_from, move_to) location string tuples.
+    """
+
+    return [parse_move(text) for text in line.split()]
+
+def format_record(moves:list) -> str:
+    "Converts a list of (move_from, move_to) tuples into a line of a text game record."
+
+    return " ".join(format_move(move) for move in moves)
+
+def read_records(path:str):
+    """
+    Generator function that yields the games of the text game record
+    file at (path), each as a list of (move_from, move_to) tuples.
+    """
+
+    with open(path) as record_file:
+        for line in record_file:
+            line = line.strip()
+            if line and not line.startswith(COMMENT):
+                yield parse_record(line)
+
+def write_records(path:str, games):
+    "Writes an iterable of games (lists of moves) to a text game record file."
+
+    with open(path, "w") as record_file:
+        for moves in games:
+            record_file.write(format_record(moves) + "\n")
+
+def replay(moves:list, game:JanggiGame=None) -> JanggiGame:
+    """
+    Plays the moves on the game (by default a new game), and returns
+    the game. Stops at the first illegal move, leaving the game in the
+    position before it.
+    """
+
+    if game is None:
+        game = JanggiGame()
+
+    for move_from, move_to in moves:
+        if not game.make_move(move_from, move_to):
+            break
+
+    return game
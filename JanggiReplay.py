@@ -0,0 +1,139 @@
+# game record replay validator for the Janggi game
+
+import argparse
+import multiprocessing
+import sys
+import time
+
+from JanggiGame import JanggiGame
+from JanggiRecord import COMMENT
+
+# number of record lines sent to a worker process at a time
+DEFAULT_CHUNK = 256
+
+# each worker process replays every game on this one game, reset in between
+_game = None
+
+def validate_game(game:JanggiGame, line:str) -> tuple:
+    """
+    Resets the game, and plays the moves of a line of a text game record
+    (see JanggiRecord) on it with make_move, so every move is checked by
+    the rules. Returns a tuple of (final game state, number of moves
+    played, index of the first illegal move or None, the illegal move's
+    text or None). A move that can't be read, or any move after the game
+    has been won, is illegal; the game stops at the first illegal move.
+    """
+
+    game.reset()
+    moves = line.split()
+
+    for index, text in enumerate(moves):
+        move_from, dash, move_to = text.partition("-")
+        if not dash or not game.make_move(move_from, move_to):
+            return game.get_game_state(), index, index, text
+
+    return game.get_game_state(), len(moves), None, None
+
+def _validate_line(item:tuple) -> tuple:
+    "Validates one (path, line number, line) record on the worker's game, and returns them with the result."
+
+    global _game
+    if _game is None:
+        _game = JanggiGame()
+
+    path, number, line = item
+
+    return (path, number) + validate_game(_game, line)
+
+def read_lines(paths:list):
+    """
+    Generator function that yields the (path, line number, line) of each game
+    in the text game record files (line numbers count from 1 in each
+    file), skipping blank and comment lines. A path of "-" is standard
+    input.
+    """
+
+    for path in paths:
+        record_file = sys.stdin if path == "-" else open(path)
+        try:
+            for number, line in enumerate(record_file, 1):
+                line = line.strip()
+                if line and not line.startswith(COMMENT):
+                    yield path, number, line
+        finally:
+            if record_file is not sys.stdin:
+                record_file.close()
+
+def validate_records(paths:list, processes:int=None, chunk:int=DEFAULT_CHUNK):
+    """
+    Generator function that validates every game in the text game record
+    files with validate_game, on a pool of (processes) worker processes
+    (by default one per CPU), and yields a tuple of (path, line number,
+    final game state, moves played, first illegal move index or None, illegal
+    move text or None) for each game, in file order. The files are read
+    as they are validated, so they can be larger than memory.
+    """
+
+    lines = read_lines(paths)
+
+    if processes == 1:
+        yield from map(_validate_line, lines)
+        return
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        yield from pool.imap(_validate_line, lines, chunksize=chunk)
+    finally:
+        pool.terminate()
+        pool.join()
+
+def main(argv=None):
+    "Validates text game record files from the command line."
+
+    parser = argparse.ArgumentParser(description="Check every move of Janggi game records against the rules.")
+    parser.add_argument("records", nargs="+", help="text game record files (- for standard input)")
+    parser.add_argument("-p", "--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="games sent to a worker at a time")
+    parser.add_argument("-o", "--output", metavar="FILE", help="write the report to a file instead of standard output")
+    parser.add_argument("--invalid-only", action="store_true", help="only report games with an illegal move")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    start = time.monotonic()
+    counts = {"games": 0, "invalid": 0, "moves": 0}
+    states = {}
+
+    report = None
+    if not args.quiet:
+        report = open(args.output, "w") if args.output else sys.stdout
+
+    try:
+        if report is not None:
+            report.write("file\tline\tstate\tmoves\tillegal_index\tillegal_move\n")
+        for path, number, state, played, index, text in validate_records(args.records, args.processes, args.chunk):
+            counts["games"] += 1
+            counts["moves"] += played
+            states[state] = states.get(state, 0) + 1
+            if index is not None:
+                counts["invalid"] += 1
+            elif args.invalid_only:
+                continue
+            if report is not None:
+                report.write("%s\t%d\t%s\t%d\t%s\t%s\n" % (path, number, state, played,
+                                                           "" if index is None else index, text or ""))
+    finally:
+        if report is not None and report is not sys.stdout:
+            report.close()
+
+    elapsed = time.monotonic() - start
+    summary = sys.stderr if report is sys.stdout else sys.stdout
+    print("games: %d (%d with an illegal move)" % (counts["games"], counts["invalid"]), file=summary)
+    for state, count in sorted(states.items()):
+        print("%s: %d" % (state, count), file=summary)
+    print("time: %.2f s (%.0f games/s, %.0f moves/s)" % (elapsed, counts["games"] / elapsed if elapsed > 0 else 0,
+                                                         counts["moves"] / elapsed if elapsed > 0 else 0), file=summary)
+
+    return 1 if counts["invalid"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,299 @@
+# batch self-play simulator for the Janggi game
+
+import argparse
+import multiprocessing
+import random
+import time
+
+from JanggiGame import JanggiGame
+from JanggiEngine import JanggiEngine
+from JanggiBoard import SQ_TO_LOC, LOC_TO_SQ
+from JanggiRecord import read_records, write_records
+from JanggiTablebase import Tablebase
+
+DEFAULT_GAMES = 100
+DEFAULT_MAX_MOVES = 300
+DEFAULT_PLAYER = "random"
+
+# the player specifications understood by make_player
+PLAYER_HELP = ("random (uniformly random legal moves), greedy (best static evaluation "
+               "after one move), engine[:DEPTH] (JanggiEngine search, depth 2 by default), "
+               "script:FILE (the moves of a text game record, then random)")
+
+class RandomPlayer:
+    """
+    A class to represent a player that picks uniformly random legal moves.
+    The other players are built on it. A player's choose method is given
+    the game, the legal moves, and the number of moves played so far.
+    """
+
+    def __init__(self, rng:random.Random):
+        "Initialize the player with its random number generator."
+
+        self._rng = rng
+
+    def choose(self, game:JanggiGame, moves:list, ply:int) -> tuple:
+        "Returns the (from square, to square) move to play, out of the legal moves."
+
+        return self._rng.choice(moves)
+
+class GreedyPlayer(RandomPlayer):
+    """
+    A class to represent a player that picks the move with the best
+    static evaluation after it is played (breaking ties at random).
+    """
+
+    def choose(self, game:JanggiGame, moves:list, ply:int) -> tuple:
+        "Returns the (from square, to square) move to play, out of the legal moves."
+
+        best_score = None
+        best_moves = []
+        for move in moves:
+            game.push_move(move)
+            score = -game.evaluate()
+            game.pop_move()
+            if best_score is None or score > best_score:
+                best_score = score
+                best_moves = [move]
+            elif score == best_score:
+                best_moves.append(move)
+
+        return self._rng.choice(best_moves)
+
+class EnginePlayer(RandomPlayer):
+    "A class to represent a player that searches with JanggiEngine to a fixed depth."
+
+    def __init__(self, rng:random.Random, depth:int, engine:JanggiEngine):
+        "Initialize the player with its random number generator, search depth and engine."
+
+        super().__init__(rng)
+        self._engine = engine
+        self._depth = depth
+
+    def choose(self, game:JanggiGame, moves:list, ply:int) -> tuple:
+        "Returns the (from square, to square) move to play, out of the legal moves."
+
+        move_from, move_to = self._engine.search(game, max_depth=self._depth).get_best_move()
+
+        return (LOC_TO_SQ[move_from], LOC_TO_SQ[move_to])
+
+class ScriptedPlayer(RandomPlayer):
+    """
+    A class to represent a player that plays the moves of a scripted game
+    for as long as the game follows it, and then random moves.
+    """
+
+    def __init__(self, rng:random.Random, script:list):
+        "Initialize the player with its random number generator and a list of location string moves."
+
+        super().__init__(rng)
+        self._script = [(LOC_TO_SQ[move_from], LOC_TO_SQ[move_to]) for move_from, move_to in script]
+
+    def choose(self, game:JanggiGame, moves:list, ply:int) -> tuple:
+        "Returns the (from square, to square) move to play, out of the legal moves."
+
+        if ply < len(self._script) and self._script[ply] in moves:
+            return self._script[ply]
+
+        return self._rng.choice(moves)
+
+def make_player(spec:str, rng:random.Random, game_index:int, player:str="B"):
+    """
+    Returns a player for the specification (see PLAYER_HELP), to play as
+    (player), 'B' or 'R'. Scripted players take the line of their record
+    file given by the game index (wrapping around).
+    """
+
+    kind, _, argument = spec.partition(":")
+    if kind == "random":
+        return RandomPlayer(rng)
+    if kind == "greedy":
+        return GreedyPlayer(rng)
+    if kind == "engine":
+        return EnginePlayer(rng, int(argument) if argument else 2, _get_engine(player))
+    if kind == "script":
+        games = _load_script(argument)
+        return ScriptedPlayer(rng, games[game_index % len(games)] if games else [])
+
+    raise ValueError("unknown player: " + spec)
+
+_scripts = {}
+
+def _load_script(path:str) -> list:
+    "Returns the games of a text game record file, reading each file once per process."
+
+    if path not in _scripts:
+        _scripts[path] = list(read_records(path))
+
+    return _scripts[path]
+
+_engines = {}
+
+def _get_engine(player:str) -> JanggiEngine:
+    """
+    Returns the engine of (player)'s engine player, made once per process
+    and cleared for each game, so that a game's moves don't depend on the
+    games played before it in the same process.
+    """
+
+    if player not in _engines:
+        _engines[player] = JanggiEngine()
+    engine = _engines[player]
+    engine.clear()
+
+    return engine
+
+_tablebases = {}
+
+def play_game(task:tuple) -> tuple:
+    """
+    Plays one game, and returns a tuple of (game index, result, number of
+    moves, moves), where result is 'RED_WON', 'BLUE_WON' or 'MOVE_CAP', and
+    moves is a list of (move_from, move_to) tuples if they were asked for
+    (otherwise None). The task is a tuple of (game index, seed, Blue's
+    player, Red's player, move cap, whether to return the moves, a
+    tablebase directory or None, and a position string to start from or
+    None for the starting position).
+
+    Moves are chosen from JanggiGame.legal_moves_sq and played with
+    push_move; a player with no legal moves is checkmated. If a tablebase
+    directory is given, a position found in it with a forced win ends the
+    game (the tablebase's result is taken as the result).
+    """
+
+    index, seed, blue, red, max_moves, keep_moves, tablebase_dir, position = task
+
+    rng = random.Random(seed)
+    game = JanggiGame.from_position(position) if position is not None else JanggiGame()
+    players = {"B": make_player(blue, rng, index, "B"), "R": make_player(red, rng, index, "R")}
+    tablebase = None
+    if tablebase_dir is not None:
+        if tablebase_dir not in _tablebases:
+            _tablebases[tablebase_dir] = Tablebase(tablebase_dir)
+        tablebase = _tablebases[tablebase_dir]
+
+    played = []
+    result = "MOVE_CAP"
+    while len(played) < max_moves:
+        player = game.get_player()
+        moves = game.legal_moves_sq()
+        if not moves:
+            result = "RED_WON" if player == "B" else "BLUE_WON"
+            break
+
+        if tablebase is not None:
+            probe = tablebase.probe(game)
+            if probe is not None and probe[0] != "DRAW":
+                winner = player if probe[0] == "WIN" else game.get_opponent(player)
+                result = "RED_WON" if winner == "R" else "BLUE_WON"
+                break
+
+        move = players[player].choose(game, moves, len(played))
+        game.push_move(move)
+        played.append(move)
+
+    moves = [(SQ_TO_LOC[from_sq], SQ_TO_LOC[to_sq]) for from_sq, to_sq in played] if keep_moves else None
+
+    return index, result, len(played), moves
+
+def simulate(games:int=DEFAULT_GAMES, blue:str=DEFAULT_PLAYER, red:str=DEFAULT_PLAYER, processes:int=None,
+             seed:int=0, max_moves:int=DEFAULT_MAX_MOVES, keep_moves:bool=False, tablebase_dir:str=None,
+             position:str=None) -> dict:
+    """
+    Plays (games) games between the Blue and Red players on a pool of
+    (processes) worker processes (by default one per CPU), and returns a
+    dictionary of aggregated results. Game i is played with the random
+    seed (seed + i), so the results don't depend on the number of
+    processes. If keep_moves is True, the dictionary's "records" holds
+    the moves of each game, in game order. The games start from the
+    position string (position), or from the starting position if it is
+    None.
+    """
+
+    start = time.monotonic()
+    tasks = [(index, seed + index, blue, red, max_moves, keep_moves, tablebase_dir, position) for index in range(games)]
+    results = {"RED_WON": 0, "BLUE_WON": 0, "MOVE_CAP": 0}
+    lengths = []
+    records = [None] * games
+
+    if processes == 1:
+        outcomes = map(play_game, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes)
+        outcomes = pool.imap_unordered(play_game, tasks, chunksize=max(1, games // (8 * (processes or multiprocessing.cpu_count()))))
+
+    try:
+        for index, result, length, moves in outcomes:
+            results[result] += 1
+            lengths.append(length)
+            records[index] = moves
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    elapsed = time.monotonic() - start
+    summary = {
+        "games": games,
+        "results": results,
+        "blue_win_rate": results["BLUE_WON"] / games if games else 0.0,
+        "red_win_rate": results["RED_WON"] / games if games else 0.0,
+        "mean_length": sum(lengths) / games if games else 0.0,
+        "min_length": min(lengths, default=0),
+        "max_length": max(lengths, default=0),
+        "moves": sum(lengths),
+        "time": elapsed,
+        "games_per_second": games / elapsed if elapsed > 0 else 0.0,
+    }
+    if keep_moves:
+        summary["records"] = records
+
+    return summary
+
+def main(argv=None):
+    "Runs the simulator from the command line."
+
+    parser = argparse.ArgumentParser(description="Play many Janggi games between two players.")
+    parser.add_argument("-n", "--games", type=int, default=DEFAULT_GAMES, help="number of games")
+    parser.add_argument("--blue", default=DEFAULT_PLAYER, help="Blue's player: " + PLAYER_HELP)
+    parser.add_argument("--red", default=DEFAULT_PLAYER, help="Red's player (see --blue)")
+    parser.add_argument("-p", "--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the first game")
+    parser.add_argument("--max-moves", type=int, default=DEFAULT_MAX_MOVES, help="moves before a game is stopped")
+    parser.add_argument("--records", metavar="FILE", help="write the games to a text game record file")
+    parser.add_argument("--tablebase", metavar="DIR", help="end games won in the tablebase files of DIR")
+    parser.add_argument("--position", help="position string to start each game from (default: the starting position)")
+    args = parser.parse_args(argv)
+
+    if args.position is not None:
+        try:
+            JanggiGame.from_position(args.position)
+        except ValueError as error:
+            parser.error(str(error))
+
+    for spec in (args.blue, args.red):
+        try:
+            make_player(spec, random.Random(), 0)
+        except (ValueError, OSError) as error:
+            parser.error(str(error))
+
+    summary = simulate(args.games, args.blue, args.red, args.processes, args.seed, args.max_moves,
+                       args.records is not None, args.tablebase, args.position)
+
+    results = summary["results"]
+    print("games: %d" % summary["games"])
+    print("blue won: %d (%.1f%%)" % (results["BLUE_WON"], 100 * summary["blue_win_rate"]))
+    print("red won: %d (%.1f%%)" % (results["RED_WON"], 100 * summary["red_win_rate"]))
+    print("move cap: %d" % results["MOVE_CAP"])
+    print("length: mean %.1f, min %d, max %d" % (summary["mean_length"], summary["min_length"], summary["max_length"]))
+    print("time: %.2f s (%.1f games/s, %.0f moves/s)" % (summary["time"], summary["games_per_second"],
+                                                          summary["moves"] / summary["time"] if summary["time"] > 0 else 0))
+
+    if args.records is not None:
+        write_records(args.records, summary["records"])
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
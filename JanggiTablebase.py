@@ -0,0 +1,571 @@
+# endgame tablebases for the Janggi game
+
+import argparse
+import mmap
+import os
+import time
+from array import array
+
+from JanggiGame import JanggiGame
+from JanggiBoard import (NUM_SQUARES, NUM_COLUMNS, NUM_ROWS, EMPTY, TYPE_MASK, BLUE, RED,
+    GENERAL, PALACE_SQUARES, CHARACTER_TYPES, TYPE_CHARACTERS, PLAYER_COLORS, code_player)
+
+# A tablebase holds the result of every position of one material set
+# (i.e. "GC-GA": Red has a general and a chariot, Blue a general and an
+# advisor) with perfect play, from the point of view of the player to
+# move. Each position is one byte:
+#   DRAW (0)                the game is a draw (or goes on forever)
+#   1 to MAX_MOVES          a win, giving checkmate on move (byte)
+#   LOSS_BASE to 254        a loss, being checkmated after (byte - LOSS_BASE) moves,
+#                           up to MAX_LOSS_MOVES
+#   INVALID (255)           not a legal position
+# A table file is MAGIC, the material signature padded to SIGNATURE_SIZE
+# bytes, and then the position bytes in index order.
+DRAW = 0
+LOSS_BASE = 128
+MAX_MOVES = 127
+INVALID = 255
+MAX_LOSS_MOVES = INVALID - 1 - LOSS_BASE
+
+MAGIC = b"JANGGITB"
+SIGNATURE_SIZE = 16
+HEADER_SIZE = len(MAGIC) + SIGNATURE_SIZE
+EXTENSION = ".jtb"
+
+# order of the pieces (after the general) in a material signature
+SIGNATURE_ORDER = "AEHCOS"
+
+PLAYERS = ("R", "B")
+
+def encode_value(result:str, plies:int) -> int:
+    """
+    Returns the byte for a position which is a "WIN", "LOSS" or "DRAW"
+    for the player to move, with checkmate after (plies) half-moves.
+    """
+
+    if result == "DRAW":
+        return DRAW
+    moves = (plies + 1) // 2
+    if moves > (MAX_MOVES if result == "WIN" else MAX_LOSS_MOVES):
+        raise ValueError("mate in %d plies is too long to store" % plies)
+    if result == "WIN":
+        return moves
+
+    return LOSS_BASE + moves
+
+def decode_value(value:int):
+    """
+    Returns a (result, plies) tuple for a position byte, where result
+    is "WIN", "LOSS" or "DRAW" for the player to move, and plies is
+    the number of half-moves until checkmate (0 for a draw). Returns
+    None for an invalid position.
+    """
+
+    if value == INVALID:
+        return None
+    if value == DRAW:
+        return ("DRAW", 0)
+    if value < LOSS_BASE:
+        return ("WIN", 2 * value - 1)
+
+    return ("LOSS", 2 * (value - LOSS_BASE))
+
+def make_signature(red:str, blue:str) -> str:
+    """
+    Returns the material signature for Red's and Blue's pieces, given
+    as strings of piece characters (not including the generals).
+    """
+
+    def side(pieces):
+        return "G" + "".join(sorted(pieces, key=SIGNATURE_ORDER.index))
+
+    return side(red) + "-" + side(blue)
+
+def parse_signature(signature:str) -> tuple:
+    """
+    Returns Red's and Blue's piece characters (not including the
+    generals) from a material signature such as "GC-GA".
+    """
+
+    red, blue = signature.upper().split("-")
+    if not red.startswith("G") or not blue.startswith("G"):
+        raise ValueError("each side of a signature starts with its general: " + signature)
+    for character in red[1:] + blue[1:]:
+        if character not in SIGNATURE_ORDER:
+            raise ValueError("unknown piece in signature: " + character)
+
+    return red[1:], blue[1:]
+
+def piece_domain(player:str, character:str) -> list:
+    """
+    Returns the squares a piece can ever stand on: generals and advisors
+    stay in their own palace, and soldiers never move backward.
+    """
+
+    color = PLAYER_COLORS[player]
+    squares = []
+    for sq in range(NUM_SQUARES):
+        row = sq // NUM_COLUMNS
+        own_half = row < NUM_ROWS // 2 if color == RED else row >= NUM_ROWS // 2
+        if character in "GA" and not (sq in PALACE_SQUARES and own_half):
+            continue
+        if character == "S" and (row < 3 if color == RED else row > NUM_ROWS - 4):
+            continue
+        squares.append(sq)
+
+    return squares
+
+def mirror_sq(sq:int) -> int:
+    "Returns the square in the same column and the opposite row."
+
+    row, col = divmod(sq, NUM_COLUMNS)
+
+    return (NUM_ROWS - 1 - row) * NUM_COLUMNS + col
+
+class TableLayout:
+    """
+    A class to describe how the positions of a material set are numbered.
+    The pieces are put in slots: Red's general, Blue's general, then
+    Red's and Blue's other pieces in signature order. Each slot has a
+    domain (the squares its piece can stand on), and a position's index
+    counts through the domains of the slots, with the player to move
+    ("R" = 0, "B" = 1) as the lowest digit.
+    """
+
+    def __init__(self, signature:str):
+        "Initialize the layout of the material set with the given signature."
+
+        red, blue = parse_signature(signature)
+        self._signature = make_signature(red, blue)
+        self._slots = [("R", "G"), ("B", "G")] + [("R", c) for c in sorted(red, key=SIGNATURE_ORDER.index)] \
+                      + [("B", c) for c in sorted(blue, key=SIGNATURE_ORDER.index)]
+        self._codes = [PLAYER_COLORS[player] | CHARACTER_TYPES[character] for player, character in self._slots]
+        self._domains = [piece_domain(player, character) for player, character in self._slots]
+
+        # the domain index of each square, per slot (-1 if not in the domain)
+        self._domain_index = []
+        for domain in self._domains:
+            index = [-1] * NUM_SQUARES
+            for number, sq in enumerate(domain):
+                index[sq] = number
+            self._domain_index.append(index)
+
+        self._size = 2
+        for domain in self._domains:
+            self._size *= len(domain)
+
+    def get_signature(self) -> str:
+        "Returns the material signature."
+
+        return self._signature
+
+    def get_slots(self) -> list:
+        "Returns a list of the (player, character) of each slot."
+
+        return self._slots
+
+    def get_codes(self) -> list:
+        "Returns a list of the piece code of each slot."
+
+        return self._codes
+
+    def get_domains(self) -> list:
+        "Returns a list of the squares each slot's piece can stand on."
+
+        return self._domains
+
+    def get_size(self) -> int:
+        "Returns the number of position indexes."
+
+        return self._size
+
+    def index(self, squares:list, player:str) -> int:
+        """
+        Returns the index of the position with the slots' pieces on the
+        given squares, and (player) to move, or -1 if a piece is off its domain.
+        """
+
+        index = 0
+        for slot, sq in enumerate(squares):
+            number = self._domain_index[slot][sq]
+            if number < 0:
+                return -1
+            index = index * len(self._domains[slot]) + number
+
+        return index * 2 + PLAYERS.index(player)
+
+    def squares(self, index:int) -> tuple:
+        "Returns the (squares, player to move) of the position with the given index."
+
+        player = PLAYERS[index % 2]
+        index //= 2
+        squares = []
+        for domain in reversed(self._domains):
+            index, number = divmod(index, len(domain))
+            squares.append(domain[number])
+        squares.reverse()
+
+        return squares, player
+
+    def without_slot(self, slot:int) -> str:
+        "Returns the signature of the material set with the piece in (slot) captured."
+
+        red = [character for number, (player, character) in enumerate(self._slots)
+               if player == "R" and character != "G" and number != slot]
+        blue = [character for number, (player, character) in enumerate(self._slots)
+                if player == "B" and character != "G" and number != slot]
+
+        return make_signature("".join(red), "".join(blue))
+
+def position_squares(codes:list, layout:TableLayout, mirrored:bool=False):
+    """
+    Returns the squares for the layout's slots of the pieces in codes (a
+    board's list of piece codes), or None if the pieces don't match the
+    layout. If mirrored is True, the colors are swapped and the board
+    is turned around, so that Blue's pieces fill Red's slots.
+    """
+
+    squares = [None] * len(layout.get_codes())
+    for sq, code in enumerate(codes):
+        if code == EMPTY:
+            continue
+        if mirrored:
+            code ^= BLUE
+            sq = mirror_sq(sq)
+        for slot, slot_code in enumerate(layout.get_codes()):
+            if slot_code == code and squares[slot] is None:
+                squares[slot] = sq
+                break
+        else:
+            return None
+
+    if None in squares:
+        return None
+
+    return squares
+
+class TablebaseGenerator:
+    """
+    A class to generate tablebases by retrograde analysis.
+
+    For each material set, every index is set up on a board and checked
+    (the player who just moved must not be left in check), and its legal
+    moves are generated with JanggiGame. Moves within the material set
+    are recorded as edges from the position to its successor; captures
+    lead into a smaller material set, which is generated first and looked
+    up. Checkmates (no legal moves, not even a pass) are losses in 0.
+    The results are then propagated backward along the edges, in order of
+    distance to mate (using a queue of buckets, one per ply), so that each
+    position gets the fastest win or the slowest loss. Positions which are
+    never resolved are draws.
+    """
+
+    def __init__(self, directory:str=None, verbose:bool=False):
+        """
+        Initialize the generator. Generated tables are kept in memory,
+        and written to (directory) if one is given.
+        """
+
+        self._directory = directory
+        self._verbose = verbose
+        self._tables = {}
+
+    def get_table(self, signature:str) -> bytes:
+        "Returns the table for the material signature, generating it if needed."
+
+        red, blue = parse_signature(signature)
+        signature = make_signature(red, blue)
+        if signature not in self._tables:
+            self._tables[signature] = self.generate(signature)
+            if self._directory is not None:
+                write_table(os.path.join(self._directory, signature + EXTENSION), signature, self._tables[signature])
+
+        return self._tables[signature]
+
+    def generate(self, signature:str) -> bytes:
+        "Generates and returns the table for the material signature."
+
+        start = time.monotonic()
+        layout = TableLayout(signature)
+        size = layout.get_size()
+        slots = layout.get_slots()
+
+        # the tables of the material sets reached by captures
+        subtables = {}
+        for slot, (player, character) in enumerate(slots):
+            if character != "G":
+                sub_signature = layout.without_slot(slot)
+                subtables[slot] = (TableLayout(sub_signature), self.get_table(sub_signature))
+
+        # a game with one piece object per slot, which is moved around the board
+        first = []
+        for domain in layout.get_domains():
+            first.append(next(sq for sq in domain if sq not in first))
+        codes = [EMPTY] * NUM_SQUARES
+        for slot, sq in enumerate(first):
+            codes[sq] = layout.get_codes()[slot]
+        game = JanggiGame.from_state((bytes(codes), "R", "UNFINISHED", "", ""))
+        board = game.get_board()
+        pieces = [board.get_piece_sq(sq) for sq in first]
+        placed = first
+
+        values = bytearray([INVALID]) * size
+        remaining = array('H', bytes(2 * size))
+        longest_win = array('H', bytes(2 * size))
+        # the longest win that can be stored is 2 * MAX_MOVES - 1 plies,
+        # and the longest loss 2 * MAX_LOSS_MOVES plies
+        buckets = [[] for plies in range(2 * MAX_MOVES)]
+        edge_from = array('I')
+        edge_to = array('I')
+
+        def push(position, plies):
+            if plies >= len(buckets):
+                raise ValueError("mate in %d plies is too long to store" % plies)
+            buckets[plies].append(position)
+
+        # forward pass: set up each position and look at its moves
+        for index in range(size):
+            squares, player = layout.squares(index)
+            if len(set(squares)) != len(squares):
+                continue
+
+            for sq in placed:
+                board.clear_sq(sq)
+            for piece, sq in zip(pieces, squares):
+                board.set_piece_sq(piece, sq)
+                piece.set_sq(sq)
+            placed = squares
+
+            opponent = game.get_opponent(player)
+            if game.is_in_check(opponent):
+                continue
+
+            values[index] = DRAW
+            slot_at = {sq: slot for slot, sq in enumerate(squares)}
+            moves = 0
+            unresolved = 0
+            win_plies = 0
+            for from_sq, to_sq in game.generate_legal_moves(player):
+                moves += 1
+                child = list(squares)
+                child[slot_at[from_sq]] = to_sq
+                captured = slot_at.get(to_sq) if from_sq != to_sq else None
+                if captured is None:
+                    edge_from.append(index)
+                    edge_to.append(layout.index(child, opponent))
+                    unresolved += 1
+                    continue
+
+                # look up the capture in the smaller material set's table
+                sub_layout, subtable = subtables[captured]
+                del child[captured]
+                result = decode_value(subtable[sub_layout.index(child, opponent)])
+                if result[0] == "LOSS":
+                    push(index, result[1] + 1)
+                elif result[0] == "WIN":
+                    win_plies = max(win_plies, result[1])
+                else:
+                    unresolved += 1
+
+            if moves == 0:
+                push(index, 0)
+            elif unresolved == 0:
+                push(index, win_plies + 1)
+            remaining[index] = unresolved
+            longest_win[index] = win_plies
+
+        # index the edges by successor
+        offsets = array('I', bytes(4 * (size + 1)))
+        for child in edge_to:
+            offsets[child + 1] += 1
+        for index in range(size):
+            offsets[index + 1] += offsets[index]
+        predecessors = array('I', bytes(4 * len(edge_to)))
+        fill = array('I', offsets)
+        for parent, child in zip(edge_from, edge_to):
+            predecessors[fill[child]] = parent
+            fill[child] += 1
+        del edge_from, edge_to, fill
+
+        # backward pass: resolve positions in order of distance to mate
+        # (odd distances are wins for the player to move, even ones losses)
+        resolved = bytearray(size)
+        for plies in range(len(buckets)):
+            for index in buckets[plies]:
+                if resolved[index]:
+                    continue
+                resolved[index] = 1
+                win = plies % 2 == 1
+                values[index] = encode_value("WIN" if win else "LOSS", plies)
+                for parent in predecessors[offsets[index]:offsets[index + 1]]:
+                    if resolved[parent]:
+                        continue
+                    if not win:
+                        push(parent, plies + 1)
+                        continue
+                    remaining[parent] -= 1
+                    if plies > longest_win[parent]:
+                        longest_win[parent] = plies
+                    if remaining[parent] == 0:
+                        push(parent, longest_win[parent] + 1)
+            buckets[plies] = None
+
+        if self._verbose:
+            counts = table_counts(values)
+            print("%s: %d positions, %d wins, %d losses, %d draws, %.1fs" % (
+                layout.get_signature(), size - counts["INVALID"], counts["WIN"], counts["LOSS"],
+                counts["DRAW"], time.monotonic() - start))
+
+        return bytes(values)
+
+def table_counts(table) -> dict:
+    "Returns the number of WIN, LOSS, DRAW and INVALID positions in a table."
+
+    counts = {"WIN": 0, "LOSS": 0, "DRAW": 0, "INVALID": 0}
+    table = bytes(table)
+    for value in range(256):
+        number = table.count(bytes([value]))
+        if number:
+            result = decode_value(value)
+            counts["INVALID" if result is None else result[0]] += number
+
+    return counts
+
+def table_header(signature:str) -> bytes:
+    "Returns the header of the table file for a signature."
+
+    return MAGIC + signature.encode().ljust(SIGNATURE_SIZE, b"\0")
+
+def write_table(path:str, signature:str, table:bytes):
+    "Writes a table to a file."
+
+    with open(path, "wb") as table_file:
+        table_file.write(table_header(signature))
+        table_file.write(table)
+
+class Tablebase:
+    """
+    A class to look up positions in the tablebase files of a directory.
+    The files are memory-mapped when first needed. A position whose
+    material is only in the tablebase with the colors swapped (i.e. a
+    Blue chariot against a Red advisor, with only "GC-GA" generated) is
+    looked up with the board turned around.
+    """
+
+    def __init__(self, directory:str):
+        "Initialize the tablebase with the directory of table files."
+
+        self._directory = directory
+        self._tables = {}
+
+    def __enter__(self):
+        "Use the tablebase in a with block."
+
+        return self
+
+    def __exit__(self, *args):
+        "Close the table files at the end of the with block."
+
+        self.close()
+
+    def close(self):
+        "Closes the table files."
+
+        for table in self._tables.values():
+            if table is not None:
+                table[1].close()
+                table[2].close()
+        self._tables = {}
+
+    def get_table(self, signature:str):
+        """
+        Returns the (layout, memory map, file) of the table for the
+        signature, or None if there is no table file. Raises ValueError
+        if the file's header is not the signature's, or the file is not
+        the size of the signature's table.
+        """
+
+        if signature not in self._tables:
+            path = os.path.join(self._directory, signature + EXTENSION)
+            if not os.path.exists(path):
+                self._tables[signature] = None
+            else:
+                layout = TableLayout(signature)
+                header = table_header(signature)
+                if os.path.getsize(path) != HEADER_SIZE + layout.get_size():
+                    raise ValueError(path + " is not the size of a " + signature + " table")
+                table_file = open(path, "rb")
+                table_map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+                if table_map[:HEADER_SIZE] != header:
+                    table_map.close()
+                    table_file.close()
+                    raise ValueError(path + " is not a Janggi tablebase file for " + signature)
+                self._tables[signature] = (layout, table_map, table_file)
+
+        return self._tables[signature]
+
+    def probe(self, game:JanggiGame):
+        """
+        Returns a (result, plies) tuple for the game's current position:
+        result is "WIN", "LOSS" or "DRAW" for the player to move, and plies
+        is the number of half-moves until checkmate with perfect play.
+        Returns None if the position is not in the tablebase.
+        """
+
+        if game.get_game_state() != "UNFINISHED":
+            return None
+
+        codes = game.get_board().get_codes()
+        pieces = {"R": "", "B": ""}
+        for code in codes:
+            if code != EMPTY and code & TYPE_MASK != GENERAL:
+                pieces[code_player(code)] += TYPE_CHARACTERS[code & TYPE_MASK]
+
+        for mirrored in (False, True):
+            if mirrored:
+                signature = make_signature(pieces["B"], pieces["R"])
+                player = game.get_opponent(game.get_player())
+            else:
+                signature = make_signature(pieces["R"], pieces["B"])
+                player = game.get_player()
+            table = self.get_table(signature)
+            if table is None:
+                continue
+            layout, table_map = table[0], table[1]
+            squares = position_squares(codes, layout, mirrored)
+            if squares is None:
+                continue
+            index = layout.index(squares, player)
+            if index < 0:
+                continue
+            return decode_value(table_map[HEADER_SIZE + index])
+
+        return None
+
+def probe(game:JanggiGame, directory:str):
+    "Looks up the game's current position in the tablebase files of (directory). See Tablebase.probe."
+
+    with Tablebase(directory) as tablebase:
+        return tablebase.probe(game)
+
+def main(argv=None):
+    "Generates tablebases from the command line."
+
+    parser = argparse.ArgumentParser(description="Generate Janggi endgame tablebases by retrograde analysis.")
+    parser.add_argument("signatures", nargs="+", help="material signatures (i.e. GC-GA)")
+    parser.add_argument("-d", "--directory", default=".", help="directory for the table files")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.directory, exist_ok=True)
+    generator = TablebaseGenerator(args.directory, verbose=True)
+    for signature in args.signatures:
+        table = generator.get_table(signature)
+        longest = max((value for value in table if value != INVALID and value != DRAW),
+                      key=lambda value: decode_value(value)[1], default=None)
+        if longest is not None:
+            print("%s: longest mate %d plies" % (make_signature(*parse_signature(signature)), decode_value(longest)[1]))
+
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,409 @@
+# precomputed movement tables for the Janggi pieces
+
+import random
+
+from JanggiBoard import (NUM_COLUMNS, NUM_ROWS, NUM_SQUARES, OFF_BOARD, LOC_TO_SQ, RED, BLUE,
+    GENERAL, ADVISOR, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER)
+
+# Every table in this module is a list indexed by square number, with one
+# extra (empty) entry at the end. Indexing a table with OFF_BOARD (-1)
+# lands on that entry, so pieces which are off the board have no moves.
+# The tables are built once, when the module is imported, and must not
+# be modified.
+
+def shift_sq(sq:int, movement:tuple) -> int:
+    """
+    Shifts the square by the movement tuple (column, row).
+    Returns the new square, or OFF_BOARD if it is not on the board.
+    """
+
+    if sq == OFF_BOARD:
+        return OFF_BOARD
+
+    col = sq % NUM_COLUMNS + movement[0]
+    row = sq // NUM_COLUMNS + movement[1]
+
+    if not (0 <= col < NUM_COLUMNS and 0 <= row < NUM_ROWS):
+        return OFF_BOARD
+
+    return row * NUM_COLUMNS + col
+
+def _loc_table(moves:dict) -> list:
+    """
+    Converts a dictionary of location strings to lists of location
+    strings into a table of tuples of squares.
+    """
+
+    table = [()] * (NUM_SQUARES + 1)
+    for loc, dests in moves.items():
+        table[LOC_TO_SQ[loc]] = tuple(LOC_TO_SQ[dest] for dest in dests)
+
+    return table
+
+# the orthogonal first steps of the Horse and Elephant, each
+# followed by the two diagonal steps leading away from the start
+_LEAPER_STEPS = {
+    (0,1): [(1,1), (-1,1)],
+    (0,-1): [(1,-1), (-1,-1)],
+    (1,0): [(1,1), (1,-1)],
+    (-1,0): [(-1,1), (-1,-1)]
+}
+
+def _horse_moves(sq:int) -> tuple:
+    """
+    Returns the (leg, dest) pairs for a Horse on the given square.
+    The Horse can move to dest if leg is empty.
+    """
+
+    moves = []
+    for first_move, second_moves in _LEAPER_STEPS.items():
+        leg = shift_sq(sq, first_move)
+        if leg == OFF_BOARD:
+            continue
+        for second_move in second_moves:
+            dest = shift_sq(leg, second_move)
+            if dest != OFF_BOARD:
+                moves.append((leg, dest))
+
+    return tuple(moves)
+
+def _elephant_moves(sq:int) -> tuple:
+    """
+    Returns the (leg1, leg2, dest) triples for an Elephant on the
+    given square. The Elephant can move to dest if both legs are empty.
+    """
+
+    moves = []
+    for first_move, second_moves in _LEAPER_STEPS.items():
+        leg1 = shift_sq(sq, first_move)
+        if leg1 == OFF_BOARD:
+            continue
+        for second_move in second_moves:
+            leg2 = shift_sq(leg1, second_move)
+            dest = shift_sq(leg2, second_move)
+            if dest != OFF_BOARD:
+                moves.append((leg1, leg2, dest))
+
+    return tuple(moves)
+
+def _soldier_moves(sq:int, direction:int) -> tuple:
+    """
+    Returns the squares a Soldier moving in the given direction
+    (1 for Red, -1 for Blue) can reach from the given square,
+    including the diagonal moves inside the palace.
+    """
+
+    moves = []
+    for movement in [(1, 0), (-1, 0), (0, direction)]:
+        dest = shift_sq(sq, movement)
+        if dest != OFF_BOARD:
+            moves.append(dest)
+
+    return tuple(moves) + SOLDIER_PALACE_MOVES[sq]
+
+# moves of the General and the Advisor (both are confined to the palace)
+PALACE_MOVES = _loc_table({
+    "d8": ["e8", "d9", "e9"],
+    "e8": ["d8", "f8", "e9"],
+    "f8": ["e8", "e9", "f9"],
+    "d9": ["d8", "e9", "d10"],
+    "e9": ["d8", "e8", "f8", "d9", "f9", "d10", "e10", "f10"],
+    "f9": ["f8", "e9", "f10"],
+    "d10": ["d9", "e9", "e10"],
+    "e10": ["e9", "d10", "f10"],
+    "f10": ["e9", "f9", "e10"],
+    "d3": ["e3", "d2", "e2"],
+    "e3": ["d3", "f3", "e2"],
+    "f3": ["e3", "e2", "f2"],
+    "d2": ["d3", "e2", "d1"],
+    "e2": ["d3", "e3", "f3", "d2", "f2", "d1", "e1", "f1"],
+    "f2": ["f3", "e2", "f1"],
+    "d1": ["d2", "e2", "e1"],
+    "e1": ["e2", "d1", "f1"],
+    "f1": ["e2", "f2", "e1"],
+})
+
+# extra diagonal moves of the Soldier when in the palace
+SOLDIER_PALACE_MOVES = _loc_table({
+    "d8": ["e9"],
+    "f8": ["e9"],
+    "e9": ["d10", "f10"],
+    "d3": ["e2"],
+    "f3": ["e2"],
+    "e2": ["d1", "f1"]
+})
+
+HORSE_MOVES = [_horse_moves(sq) for sq in range(NUM_SQUARES)] + [()]
+ELEPHANT_MOVES = [_elephant_moves(sq) for sq in range(NUM_SQUARES)] + [()]
+GENERAL_MOVES = PALACE_MOVES
+ADVISOR_MOVES = PALACE_MOVES
+SOLDIER_MOVES = {
+    RED: [_soldier_moves(sq, 1) for sq in range(NUM_SQUARES)] + [()],
+    BLUE: [_soldier_moves(sq, -1) for sq in range(NUM_SQUARES)] + [()]
+}
+
+def _ray(sq:int, direction:tuple) -> tuple:
+    """
+    Returns the squares from the given square (not included) to the
+    edge of the board, in the given direction.
+    """
+
+    squares = []
+    step = shift_sq(sq, direction)
+    while step != OFF_BOARD:
+        squares.append(step)
+        step = shift_sq(step, direction)
+
+    return tuple(squares)
+
+def _palace_lines(sq:int) -> tuple:
+    """
+    Returns the palace diagonal lines leaving the given square, each as
+    a tuple of squares in order of distance. A corner of the palace has
+    one line (through the center to the opposite corner), the center has
+    four lines of one square each, and any other square has none.
+    """
+
+    lines = []
+    for corner, center, opposite in _PALACE_DIAGONALS:
+        if sq == corner:
+            lines.append((center, opposite))
+        elif sq == center:
+            lines.append((corner,))
+
+    return tuple(lines)
+
+# the directions a Chariot or Cannon can slide along
+DIRECTIONS = [(1,0), (-1,0), (0,1), (0,-1)]
+
+# (corner, center, opposite corner) for each palace diagonal,
+# in both directions
+_PALACE_DIAGONALS = [
+    tuple(LOC_TO_SQ[loc] for loc in diagonal) for diagonal in [
+        ("d1", "e2", "f3"), ("f1", "e2", "d3"), ("d3", "e2", "f1"), ("f3", "e2", "d1"),
+        ("d10", "e9", "f8"), ("f10", "e9", "d8"), ("d8", "e9", "f10"), ("f8", "e9", "d10")
+    ]
+]
+
+# the four rays (one per direction) from each square
+RAYS = [tuple(_ray(sq, direction) for direction in DIRECTIONS) for sq in range(NUM_SQUARES)] + [()]
+
+# the palace diagonal lines from each square
+PALACE_LINES = [_palace_lines(sq) for sq in range(NUM_SQUARES)] + [()]
+
+def _reverse(table:list, dest_index:int) -> list:
+    """
+    Inverts a move table: for each square, collects the entries of
+    (table) whose destination (entry[dest_index], or the entry itself
+    if dest_index is None) is that square, replacing the destination
+    with the starting square.
+    """
+
+    reverse = [[] for sq in range(NUM_SQUARES + 1)]
+    for sq in range(NUM_SQUARES):
+        for entry in table[sq]:
+            if dest_index is None:
+                reverse[entry].append(sq)
+            else:
+                reverse[entry[dest_index]].append((sq,) + tuple(entry[:dest_index]))
+
+    return [tuple(entries) for entries in reverse]
+
+# Reverse ("attacker") tables, used to find out whether a square can
+# be reached by the opponent by looking outward from the square itself.
+# HORSE_ATTACKERS[sq] holds (from, leg) pairs and ELEPHANT_ATTACKERS[sq]
+# holds (from, leg1, leg2) triples for pieces that can reach sq; the
+# other tables hold the starting squares.
+HORSE_ATTACKERS = _reverse(HORSE_MOVES, 1)
+ELEPHANT_ATTACKERS = _reverse(ELEPHANT_MOVES, 2)
+PALACE_ATTACKERS = _reverse(PALACE_MOVES, None)
+SOLDIER_ATTACKERS = {color: _reverse(SOLDIER_MOVES[color], None) for color in (RED, BLUE)}
+
+def _attack_paths(sq:int) -> frozenset:
+    """
+    Returns the squares whose contents decide whether a piece on another
+    square can reach (sq) along a line, palace diagonal, or Horse or
+    Elephant path: the lines and palace diagonals through (sq), and the
+    legs of every Horse and Elephant move onto (sq).
+    """
+
+    paths = set()
+    for line in RAYS[sq] + PALACE_LINES[sq]:
+        paths.update(line)
+    for from_sq, leg in HORSE_ATTACKERS[sq]:
+        paths.add(leg)
+    for from_sq, leg1, leg2 in ELEPHANT_ATTACKERS[sq]:
+        paths.update((leg1, leg2))
+
+    return frozenset(paths)
+
+# While a general is not in check, a move by another piece can only put
+# it in check if the move starts or ends on one of its ATTACK_PATHS.
+ATTACK_PATHS = [_attack_paths(sq) for sq in range(NUM_SQUARES)] + [frozenset()]
+
+def _check_squares(sq:int) -> frozenset:
+    """
+    Returns the set of squares where a move must start or end to give
+    check to a general on (sq): its ATTACK_PATHS, and the squares a
+    Horse, Elephant or Soldier could attack it from.
+    """
+
+    squares = set(ATTACK_PATHS[sq])
+    squares.update(from_sq for from_sq, leg in HORSE_ATTACKERS[sq])
+    squares.update(from_sq for from_sq, leg1, leg2 in ELEPHANT_ATTACKERS[sq])
+    for color in (RED, BLUE):
+        squares.update(SOLDIER_ATTACKERS[color][sq])
+
+    return frozenset(squares)
+
+# A move can only give check to a general on (sq) if it starts or ends
+# on one of its CHECK_SQUARES (a discovered check, or a cannon's new
+# screen, starts or ends on a line; a direct check ends on a square the
+# piece attacks the general from).
+CHECK_SQUARES = [_check_squares(sq) for sq in range(NUM_SQUARES)] + [frozenset()]
+
+def _zobrist_keys() -> tuple:
+    """
+    Returns the Zobrist keys: a table of random 64-bit keys indexed by
+    [piece code][square], and the key for Red to move. A fixed seed is
+    used, so that position keys are the same in every process and run.
+    """
+
+    rng = random.Random(0x4A414E474749)
+    pieces = [[rng.getrandbits(64) for sq in range(NUM_SQUARES)] for code in range(16)]
+
+    return pieces, rng.getrandbits(64)
+
+# Zobrist hashing: the key of a position is the XOR of ZOBRIST_PIECES
+# for every piece on the board, and ZOBRIST_RED_TO_MOVE if it is Red's turn.
+ZOBRIST_PIECES, ZOBRIST_RED_TO_MOVE = _zobrist_keys()
+
+# standard Janggi piece values, in hundredths of a point
+# (the general can't be captured, so it has no value)
+PIECE_VALUES = {
+    GENERAL: 0,
+    ADVISOR: 300,
+    ELEPHANT: 300,
+    HORSE: 500,
+    CHARIOT: 1300,
+    CANNON: 700,
+    SOLDIER: 200
+}
+
+# Piece-square tables: a bonus (in hundredths of a point) for each piece
+# type on each square, from Red's side of the board. Each table lists
+# rows 1 to 10 (Red's back rank first, as in print_board) and columns
+# a to i. Blue's pieces use the same tables with the rows reversed.
+PIECE_SQUARE_TABLES = {
+    GENERAL: [
+         0,  0,  0, -5, -5, -5,  0,  0,  0,
+         0,  0,  0,  0, 10,  0,  0,  0,  0,
+         0,  0,  0, -5, -5, -5,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0
+    ],
+    ADVISOR: [
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0, 10,  0,  0,  0,  0,
+         0,  0,  0, -5,  0, -5,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0
+    ],
+    ELEPHANT: [
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0, 10,  0, 10,  0, 10,  0,  0,
+         0,  5, 10, 15, 15, 15, 10,  5,  0,
+         0,  5, 10, 15, 15, 15, 10,  5,  0,
+         0,  5, 10, 10, 10, 10, 10,  5,  0,
+         0,  0,  5, 10, 10, 10,  5,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0
+    ],
+    HORSE: [
+       -20,-10,  0,-10,-10,-10,  0,-10,-20,
+       -10,  0,  0,  0,-10,  0,  0,  0,-10,
+       -10,  0, 10,  5, 10,  5, 10,  0,-10,
+       -10,  5, 15, 15, 15, 15, 15,  5,-10,
+        -5, 10, 20, 25, 25, 25, 20, 10, -5,
+        -5, 10, 20, 25, 25, 25, 20, 10, -5,
+        -5, 10, 20, 25, 30, 25, 20, 10, -5,
+       -10,  5, 15, 20, 20, 20, 15,  5,-10,
+       -10,  0, 10, 10, 10, 10, 10,  0,-10,
+       -20,-10,  0,  0,  0,  0,  0,-10,-20
+    ],
+    CHARIOT: [
+        -5,  0,  0,  5,  5,  5,  0,  0, -5,
+         0,  0,  0,  5,  0,  5,  0,  0,  0,
+         0,  0,  5,  5,  5,  5,  5,  0,  0,
+         0,  5,  5, 10, 10, 10,  5,  5,  0,
+         5,  5, 10, 10, 10, 10, 10,  5,  5,
+         5,  5, 10, 10, 10, 10, 10,  5,  5,
+        10, 10, 15, 15, 15, 15, 15, 10, 10,
+        10, 10, 15, 20, 20, 20, 15, 10, 10,
+        10, 15, 15, 20, 25, 20, 15, 15, 10,
+         5,  5, 10, 15, 15, 15, 10,  5,  5
+    ],
+    CANNON: [
+         0,  0,  5, 10, 10, 10,  5,  0,  0,
+         0,  0,  5,  5, 20,  5,  5,  0,  0,
+         0,  5,  5, 10, 10, 10,  5,  5,  0,
+         0,  0,  0,  5,  5,  5,  0,  0,  0,
+         0,  0,  0,  0,  5,  0,  0,  0,  0,
+         0,  0,  0,  0,  5,  0,  0,  0,  0,
+         0,  0,  0,  5,  5,  5,  0,  0,  0,
+         0,  0,  5, 10, 10, 10,  5,  0,  0,
+         0,  0,  0,  5, 10,  5,  0,  0,  0,
+         0,  0,  0,  0,  5,  0,  0,  0,  0
+    ],
+    SOLDIER: [
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  0,  0,  0,  0,  0,
+         0,  0,  0,  0,  5,  0,  0,  0,  0,
+         5,  5, 10, 10, 15, 10, 10,  5,  5,
+        10, 15, 20, 25, 25, 25, 20, 15, 10,
+        20, 25, 30, 35, 40, 35, 30, 25, 20,
+        30, 35, 40, 50, 60, 50, 40, 35, 30,
+        30, 35, 40, 55, 65, 55, 40, 35, 30,
+        10, 10, 15, 40, 40, 40, 15, 10, 10
+    ]
+}
+
+def _mirror_sq(sq:int) -> int:
+    "Returns the square in the same column and the opposite row."
+
+    row, col = divmod(sq, NUM_COLUMNS)
+
+    return (NUM_ROWS - 1 - row) * NUM_COLUMNS + col
+
+def _eval_table() -> list:
+    """
+    Returns the evaluation table, indexed by [piece code][square]: the
+    piece's value plus its piece-square bonus, positive for Red pieces
+    and negative for Blue pieces. The off-board entry is 0.
+    """
+
+    table = [[0] * (NUM_SQUARES + 1) for code in range(16)]
+    for code_type, bonus in PIECE_SQUARE_TABLES.items():
+        value = PIECE_VALUES[code_type]
+        for sq in range(NUM_SQUARES):
+            table[RED | code_type][sq] = value + bonus[sq]
+            table[BLUE | code_type][sq] = -(value + bonus[_mirror_sq(sq)])
+
+    return table
+
+# The evaluation of a position from Red's point of view is the sum of
+# EVAL_TABLE for every piece on the board (see JanggiMechanic).
+EVAL_TABLE = _eval_table()
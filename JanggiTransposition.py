@@ -0,0 +1,190 @@
+# transposition table for searching Janggi positions
+
+from array import array
+
+# bound types of a stored score (0 marks an empty entry)
+EXACT = 1
+LOWER = 2
+UPPER = 3
+
+# each entry is two unsigned 64-bit words: the position key, and the
+# packed data below; entries are grouped in buckets of two, a
+# depth-preferred slot followed by an always-replace slot
+ENTRY_BYTES = 16
+BUCKET_SIZE = 2
+
+# layout of the data word
+_MOVE_BITS = 13
+_DEPTH_SHIFT = 13
+_BOUND_SHIFT = 21
+_GENERATION_SHIFT = 23
+_SCORE_SHIFT = 31
+_SCORE_OFFSET = 1 << 20
+
+_MOVE_MASK = (1 << _MOVE_BITS) - 1
+_BYTE_MASK = 0xFF
+_BOUND_MASK = 0x3
+
+MAX_TABLE_DEPTH = 255
+MAX_GENERATION = 255
+
+def encode_move(move) -> int:
+    "Packs a (from square, to square) move (or None) into 13 bits."
+
+    if move is None:
+        return 0
+
+    return move[0] * 90 + move[1] + 1
+
+def decode_move(code:int):
+    "Unpacks a move packed by encode_move."
+
+    if code == 0:
+        return None
+
+    return divmod(code - 1, 90)
+
+class TranspositionTable:
+    """
+    A class to represent a transposition table: a fixed-size cache of
+    search results keyed by position hash (JanggiGame.position_key).
+    Each entry holds the search depth, the bound type of the score
+    (EXACT, LOWER or UPPER), the score, and the best move.
+
+    The table is preallocated as two arrays of 64-bit words, sized from
+    the given number of megabytes, so its memory use never grows. Each
+    bucket has a depth-preferred slot, which keeps the deepest result,
+    and an always-replace slot, which takes everything else. Entries
+    from earlier searches (older generations) are replaced first.
+    """
+
+    def __init__(self, megabytes:float=16):
+        "Initialize an empty table using about (megabytes) of memory."
+
+        entries = max(BUCKET_SIZE, int(megabytes * (1 << 20)) // ENTRY_BYTES)
+        self._num_buckets = entries // BUCKET_SIZE
+        self._keys = array('Q', bytes(8 * self._num_buckets * BUCKET_SIZE))
+        self._data = array('Q', bytes(8 * self._num_buckets * BUCKET_SIZE))
+        self._generation = 0
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+
+    def get_size(self) -> int:
+        "Returns the number of entries in the table."
+
+        return len(self._keys)
+
+    def get_megabytes(self) -> float:
+        "Returns the memory used by the entries, in megabytes."
+
+        return self.get_size() * ENTRY_BYTES / (1 << 20)
+
+    def get_generation(self) -> int:
+        "Returns the current generation."
+
+        return self._generation
+
+    def get_stats(self) -> dict:
+        "Returns a dictionary of probe, hit and store counts."
+
+        return {"probes": self._probes, "hits": self._hits, "stores": self._stores}
+
+    def new_search(self):
+        """
+        Starts a new generation. Entries stored during earlier searches
+        stay usable, but are the first to be replaced.
+        """
+
+        self._generation = (self._generation + 1) & MAX_GENERATION
+
+    def clear(self):
+        "Empties the table."
+
+        size = self.get_size()
+        self._keys = array('Q', bytes(8 * size))
+        self._data = array('Q', bytes(8 * size))
+        self._generation = 0
+
+    def probe(self, key:int):
+        """
+        Looks up the position with the given key. Returns a tuple of
+        (depth, bound, score, move) if it is in the table, or None.
+        """
+
+        self._probes += 1
+        index = (key % self._num_buckets) * BUCKET_SIZE
+        keys = self._keys
+
+        for slot in (index, index + 1):
+            if keys[slot] == key:
+                data = self._data[slot]
+                bound = (data >> _BOUND_SHIFT) & _BOUND_MASK
+                if bound:
+                    self._hits += 1
+                    return ((data >> _DEPTH_SHIFT) & _BYTE_MASK,
+                            bound,
+                            (data >> _SCORE_SHIFT) - _SCORE_OFFSET,
+                            decode_move(data & _MOVE_MASK))
+
+        return None
+
+    def store(self, key:int, depth:int, bound:int, score:int, move):
+        """
+        Stores a search result for the position with the given key.
+        If move is None and the position is already stored, the stored
+        best move is kept.
+        """
+
+        self._stores += 1
+        index = (key % self._num_buckets) * BUCKET_SIZE
+        keys = self._keys
+        data = self._data
+        depth = min(max(depth, 0), MAX_TABLE_DEPTH)
+
+        # keep the old best move if there is no new one
+        move_code = encode_move(move)
+        if move_code == 0:
+            for slot in (index, index + 1):
+                if keys[slot] == key:
+                    move_code = data[slot] & _MOVE_MASK
+
+        entry = (move_code
+                 | depth << _DEPTH_SHIFT
+                 | bound << _BOUND_SHIFT
+                 | self._generation << _GENERATION_SHIFT
+                 | (score + _SCORE_OFFSET) << _SCORE_SHIFT)
+
+        # the depth-preferred slot takes the entry if it is empty, holds
+        # the same position, is from an older search, or is shallower
+        old = data[index]
+        if (keys[index] == key
+                or not (old >> _BOUND_SHIFT) & _BOUND_MASK
+                or (old >> _GENERATION_SHIFT) & _BYTE_MASK != self._generation
+                or depth >= (old >> _DEPTH_SHIFT) & _BYTE_MASK):
+            # move the entry being replaced to the always-replace slot
+            if keys[index] != key and (old >> _BOUND_SHIFT) & _BOUND_MASK:
+                keys[index + 1] = keys[index]
+                data[index + 1] = old
+            elif keys[index + 1] == key:
+                data[index + 1] = 0
+            keys[index] = key
+            data[index] = entry
+        else:
+            keys[index + 1] = key
+            data[index + 1] = entry
+
+    def hashfull(self) -> int:
+        """
+        Returns how full the table is with entries from the current
+        search, in permille, estimated from the first 1000 entries.
+        """
+
+        sample = min(1000, self.get_size())
+        used = 0
+        for slot in range(sample):
+            data = self._data[slot]
+            if (data >> _BOUND_SHIFT) & _BOUND_MASK and (data >> _GENERATION_SHIFT) & _BYTE_MASK == self._generation:
+                used += 1
+
+        return used * 1000 // sample
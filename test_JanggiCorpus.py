@@ -0,0 +1,39 @@
+# tests for the Janggi game record corpus
+
+import os
+import tempfile
+import unittest
+
+from JanggiCorpus import write_corpus, Corpus
+
+class TestWriteCorpus(unittest.TestCase):
+    "Tests for write_corpus."
+
+    def setUp(self):
+        "Make a directory for the corpus file."
+
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, "games.jgc")
+
+    def tearDown(self):
+        "Remove the directory."
+
+        self._directory.cleanup()
+
+    def test_round_trip(self):
+        "The games written are read back."
+
+        games = [[("c7", "c6"), ("c4", "c5")], [], [("e9", "e9")]]
+        self.assertEqual(write_corpus(self._path, games), 3)
+        with Corpus(self._path) as corpus:
+            self.assertEqual([corpus.get_game(number) for number in range(len(corpus))], games)
+
+    def test_bad_game_leaves_no_file(self):
+        "A game that can't be written removes the unfinished corpus file."
+
+        games = [[("c7", "c6")], [("c7", "z1")]]
+        self.assertRaises(ValueError, write_corpus, self._path, games)
+        self.assertFalse(os.path.exists(self._path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# tests for the Janggi engine
+
+import unittest
+
+from JanggiGame import JanggiGame
+from JanggiEngine import search, MATE_SCORE
+
+class TestSearch(unittest.TestCase):
+    "Tests for JanggiEngine.search."
+
+    def test_finds_shortest_mate(self):
+        """
+        Iterative deepening doesn't stop at a longer mate found by
+        quiescence before the shortest mate's depth is searched.
+        """
+
+        game = JanggiGame.from_position("9/5G3/9/9/2c6/9/9/9/9/2cg5 R -")
+        result = search(game, max_depth=6)
+
+        self.assertEqual(result.get_score(), MATE_SCORE - 5)
+        self.assertEqual(len(result.get_pv()), 5)
+
+    def test_mate_searched_to_its_depth(self):
+        """
+        A mate found by quiescence beyond the searched depth doesn't end
+        iterative deepening until the depth reaches the mate's length.
+        """
+
+        game = JanggiGame.from_position("9/2h2O1H1/5G3/1s7/9/1H7/9/4g4/6c2/9 R -")
+        result = search(game, max_depth=6)
+
+        self.assertEqual(result.get_score(), MATE_SCORE - 5)
+        self.assertEqual(result.get_depth(), 5)
+
+    def test_single_move_searched(self):
+        "A position with one legal move is searched deeper than depth 1."
+
+        game = JanggiGame.from_position("9/9/3G5/9/9/9/4CC3/4g4/9/9 R -")
+        self.assertEqual(len(game.legal_moves_sq()), 1)
+        result = search(game, max_depth=6)
+
+        self.assertEqual(result.get_score(), -(MATE_SCORE - 4))
+        self.assertEqual(result.get_depth(), 4)
+
+if __name__ == "__main__":
+    unittest.main()
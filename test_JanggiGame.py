@@ -0,0 +1,76 @@
+# tests for the Janggi game
+
+import pickle
+import random
+import unittest
+
+from JanggiGame import JanggiGame
+
+class TestMakeMove(unittest.TestCase):
+    "Tests for moves made with JanggiGame.make_move."
+
+    def test_undo_stack_empty_after_make_move(self):
+        "A committed move leaves nothing on the mechanic's undo stack."
+
+        game = JanggiGame()
+        for move_from, move_to in [("c7", "c6"), ("c4", "c5"), ("c6", "c5"), ("e2", "e2")]:
+            self.assertTrue(game.make_move(move_from, move_to))
+            self.assertEqual(game._mechanic.get_undo_depth(), 0)
+
+    def test_illegal_move_leaves_undo_stack_empty(self):
+        "A move refused by make_move leaves nothing on the undo stack."
+
+        game = JanggiGame()
+        self.assertFalse(game.make_move("a10", "a1"))
+        self.assertEqual(game._mechanic.get_undo_depth(), 0)
+
+class TestClone(unittest.TestCase):
+    "Tests for JanggiGame.clone."
+
+    def test_clone_after_push_move_capture(self):
+        """
+        A clone made after captures with push_move (not yet popped) has 
+        the same position, hash and evaluation as the position set up 
+        with from_position.
+        """
+
+        rng = random.Random(0)
+        game = JanggiGame()
+        captures = 0
+        while captures < 3:
+            moves = game.legal_captures_sq()
+            if moves:
+                captures += 1
+            game.push_move(rng.choice(moves or game.legal_moves_sq()))
+
+        clone = game.clone()
+        position = JanggiGame.from_position(game.to_position())
+        self.assertEqual(clone.to_position(), game.to_position())
+        self.assertEqual(clone.position_key(), position.position_key())
+        self.assertEqual(clone.evaluate(), position.evaluate())
+        self.assertEqual(sorted(clone.legal_moves_sq()), sorted(position.legal_moves_sq()))
+
+class TestPickle(unittest.TestCase):
+    "Tests for pickling a JanggiGame."
+
+    def test_pickle_keeps_pieces(self):
+        """
+        An unpickled game has the same pieces, in the same order, and the 
+        same legal moves in the same order, even after pieces have moved 
+        out of square order and been captured.
+        """
+
+        rng = random.Random(1)
+        game = JanggiGame()
+        for ply in range(40):
+            game.push_move(rng.choice(game.legal_captures_sq() or game.legal_moves_sq()))
+
+        copy = pickle.loads(pickle.dumps(game))
+        for player in ["R", "B"]:
+            self.assertEqual([(piece.get_name(), piece.get_sq()) for piece in copy._pieces[player]],
+                             [(piece.get_name(), piece.get_sq()) for piece in game.clone()._pieces[player]])
+        self.assertEqual(copy.legal_moves_sq(), game.legal_moves_sq())
+        self.assertEqual(copy.position_key(), game.position_key())
+
+if __name__ == "__main__":
+    unittest.main()
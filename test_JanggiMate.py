@@ -0,0 +1,24 @@
+# tests for the Janggi mate solver
+
+import unittest
+
+from JanggiGame import JanggiGame
+from JanggiMate import find_mate
+
+class TestFindMate(unittest.TestCase):
+    "Tests for find_mate."
+
+    def test_quiet_mate_not_found(self):
+        """
+        A mate that needs a quiet move isn't found: the status only says
+        there is no mate by checks.
+        """
+
+        game = JanggiGame.from_position("9/5G3/9/9/2c6/9/9/9/9/2cg5 R -")
+        result = find_mate(game, 3)
+
+        self.assertEqual(result.get_status(), "NO_CHECKING_MATE")
+        self.assertFalse(result.is_mate())
+
+if __name__ == "__main__":
+    unittest.main()
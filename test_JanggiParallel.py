@@ -0,0 +1,27 @@
+# tests for the Janggi parallel search
+
+import unittest
+
+from JanggiParallel import merge_results
+
+class TestMergeResults(unittest.TestCase):
+    "Tests for merge_results."
+
+    def test_compares_scores_at_common_depth(self):
+        "A deeper search's score doesn't beat a shallower one's; both are compared at the common depth."
+
+        shallow = [(depth, 50, [("a7", "a6")]) for depth in range(1, 4)]
+        deep = [(depth, 40, [("c7", "c6")]) for depth in range(1, 4)] + [(6, 100, [("c7", "c6")])]
+        move, score, pv, depth = merge_results([(deep, [("c7", "c6")]), (shallow, [("a7", "a6")])])
+
+        self.assertEqual((move, score, depth), (("a7", "a6"), 50, 3))
+
+    def test_no_completed_depth(self):
+        "If a search didn't finish any depth, the first share's first move is taken."
+
+        move, score, pv, depth = merge_results([([], [("c7", "c6")]), ([(1, 30, [("a7", "a6")])], [("a7", "a6")])])
+
+        self.assertEqual((move, score, depth), (("c7", "c6"), 0, 0))
+
+if __name__ == "__main__":
+    unittest.main()
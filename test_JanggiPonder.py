@@ -0,0 +1,25 @@
+# tests for pondering
+
+import unittest
+
+from JanggiGame import JanggiGame
+from JanggiPonder import Ponderer
+
+class TestPonderHit(unittest.TestCase):
+    "Tests for Ponderer.ponder_hit."
+
+    def test_not_pondering(self):
+        "A ponder hit without a ponder search is refused."
+
+        self.assertRaises(RuntimeError, Ponderer().ponder_hit, 0.1)
+
+    def test_after_start(self):
+        "A ponder hit after start returns the ponder search's result."
+
+        ponderer = Ponderer()
+        self.assertTrue(ponderer.start(JanggiGame(), ("c7", "c6")))
+        self.assertIsNotNone(ponderer.ponder_hit(0.05))
+        self.assertFalse(ponderer.is_pondering())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# tests for the Janggi endgame tablebases
+
+import os
+import tempfile
+import unittest
+
+from JanggiTablebase import (encode_value, decode_value, write_table, Tablebase, TableLayout,
+    INVALID, MAX_MOVES, MAX_LOSS_MOVES, DRAW, EXTENSION)
+
+class TestValues(unittest.TestCase):
+    "Tests for the position bytes of a table."
+
+    def test_round_trip(self):
+        "Every storable win, loss and draw decodes to what was encoded."
+
+        for plies in range(1, 2 * MAX_MOVES, 2):
+            self.assertEqual(decode_value(encode_value("WIN", plies)), ("WIN", plies))
+        for plies in range(0, 2 * MAX_LOSS_MOVES + 1, 2):
+            self.assertEqual(decode_value(encode_value("LOSS", plies)), ("LOSS", plies))
+        self.assertEqual(decode_value(encode_value("DRAW", 0)), ("DRAW", 0))
+
+    def test_limits(self):
+        "The longest storable results aren't INVALID, and longer ones are refused."
+
+        self.assertNotEqual(encode_value("WIN", 2 * MAX_MOVES - 1), INVALID)
+        self.assertNotEqual(encode_value("LOSS", 2 * MAX_LOSS_MOVES), INVALID)
+        self.assertRaises(ValueError, encode_value, "WIN", 2 * MAX_MOVES + 1)
+        self.assertRaises(ValueError, encode_value, "LOSS", 2 * MAX_LOSS_MOVES + 2)
+        self.assertIsNone(decode_value(INVALID))
+
+class TestTableFiles(unittest.TestCase):
+    "Tests for opening table files."
+
+    def setUp(self):
+        "Make a directory for the table files."
+
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, "G-G" + EXTENSION)
+        self._size = TableLayout("G-G").get_size()
+
+    def tearDown(self):
+        "Remove the directory."
+
+        self._directory.cleanup()
+
+    def test_valid_table(self):
+        "A table with the right header and size is opened."
+
+        write_table(self._path, "G-G", bytes([DRAW]) * self._size)
+        with Tablebase(self._directory.name) as tablebase:
+            self.assertIsNotNone(tablebase.get_table("G-G"))
+
+    def test_truncated_table(self):
+        "A table that is too short is refused."
+
+        write_table(self._path, "G-G", bytes([DRAW]) * (self._size - 1))
+        with Tablebase(self._directory.name) as tablebase:
+            self.assertRaises(ValueError, tablebase.get_table, "G-G")
+
+    def test_mislabelled_table(self):
+        "A table whose header has another signature is refused."
+
+        write_table(self._path, "G-S", bytes([DRAW]) * self._size)
+        with Tablebase(self._directory.name) as tablebase:
+            self.assertRaises(ValueError, tablebase.get_table, "G-G")
+
+if __name__ == "__main__":
+    unittest.main()